@@ -0,0 +1,52 @@
+"""
+Import cost of each entry module, from `python -X importtime`
+
+For every module, prints its cumulative import time in a fresh
+interpreter and the heaviest packages it pulls in. Heavy dependencies
+(sympy, scipy, matplotlib) should not appear: they are imported on
+first use. tests/test_imports.py guards the same property.
+
+Usage: python -m benchmarks.bench_imports
+"""
+import re
+import subprocess
+import sys
+
+MODULES = ["parser.parser", "solver.solver", "plotter.plotter", "cli", "gui.main_window"]
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+def import_times(module):
+    """
+    (total us, {package: cumulative us} for the module's direct imports),
+    or None if the import fails
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        return None
+    # Children are listed before their parent, one nesting level = 2 spaces
+    children = {}
+    for match in LINE.finditer(result.stderr):
+        _, cumulative, indent, name = match.groups()
+        if len(indent) == 1:
+            if name == module:
+                return int(cumulative), children
+            children = {}
+        elif len(indent) == 3:
+            children[name] = int(cumulative)
+    return None
+
+def main(top=4):
+    print(f"{'module':<18} {'ms':>7}  heaviest")
+    for module in MODULES:
+        times = import_times(module)
+        if times is None:
+            print(f"{module:<18} {'unavailable':>7}")
+            continue
+        total, children = times
+        heaviest = sorted(children, key=children.get, reverse=True)[:top]
+        listing = ", ".join(f"{name} {children[name] / 1e3:.0f}" for name in heaviest)
+        print(f"{module:<18} {total / 1e3:>7.0f}  {listing}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+All-pairs intersection of N curves vs. one numeric solve per pair
+
+intersect_all samples each curve once and refines every pair's crossings
+together; the baseline runs _numeric_solve on f_i - f_j for each pair
+(on a sample of pairs, scaled up to all N(N-1)/2).
+
+Usage: python -m benchmarks.bench_intersect
+"""
+import itertools
+import time
+from cache.cache import ExpressionCache
+from solver.solver import EquationSolver
+
+SIZES = [2, 5, 10, 20, 40]
+X_RANGE = (-10, 10)
+PAIR_SAMPLE = 20  # Pairs solved one by one per size
+
+def curve(k: int) -> str:
+    return f"sin(x+{k})+{k}*x/{max(SIZES)}"
+
+def main():
+    solver = EquationSolver(cache=ExpressionCache())
+    solver.warm_up()
+    print(f"{'curves':>6} {'pairs':>6} {'all-pairs ms':>13} {'per-pair ms':>12} {'speedup':>8} {'points':>7}")
+    for size in SIZES:
+        funcs = [curve(k) for k in range(size)]
+        exprs = [solver._sympify(f) for f in funcs]
+        pairs = list(itertools.combinations(range(size), 2))
+        start = time.perf_counter()
+        found = solver.intersect_all(funcs, X_RANGE)
+        elapsed = time.perf_counter() - start
+
+        sample = pairs[::max(len(pairs) // PAIR_SAMPLE, 1)]
+        start = time.perf_counter()
+        for i, j in sample:
+            solver._numeric_solve(exprs[i] - exprs[j], X_RANGE)
+        loop = (time.perf_counter() - start) / len(sample) * len(pairs)
+        print(f"{size:>6} {len(pairs):>6} {elapsed * 1e3:>13.1f} {loop * 1e3:>12.0f} "
+              f"{loop / elapsed:>7.1f}x {len(found):>7}")
+
+if __name__ == "__main__":
+    main()
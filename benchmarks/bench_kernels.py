@@ -0,0 +1,63 @@
+"""
+Evaluation kernels vs. plain lambdify
+
+Each expression is compiled once per backend (solver.kernels) and timed
+on arrays of increasing size, then solved end to end by _numeric_solve
+with the solver's evaluator set to each backend. The expressions repeat
+subexpressions, as pasted or generated equations tend to. 'numexpr' is
+only timed when numexpr is installed.
+
+Usage: python -m benchmarks.bench_kernels
+"""
+import time
+import numpy as np
+import sympy as sp
+from cache.cache import ExpressionCache
+from solver import kernels
+from solver.solver import EquationSolver
+
+EXPRESSIONS = [
+    "x^3 - 2*x + 1",
+    "x^2*sin(x^2) + cos(x^2)/(1 + x^2) + exp(-x^2)*(x^2 + 1)",
+    "sqrt(x^2 + 1)*sin(sqrt(x^2 + 1)) - cos(sqrt(x^2 + 1))/sqrt(x^2 + 1)",
+    "(x-1)*(x-2)*(x-3)*(x-4)*(x-5)*(x-6)*(x-7)*(x-8)*(x-9)*(x-10) - 1",
+]
+SIZES = [1_000, 100_000, 1_000_000]
+X_RANGE = (-10, 10)
+
+def best_of(f, repeat: int = 5) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        f()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+def main():
+    backends = [b for b in kernels.BACKENDS if b != 'numexpr' or kernels.numexpr_available()]
+    x = sp.Symbol('x')
+    print(f"{'expression':<32} {'points':>9} " + " ".join(f"{b + ' ms':>12}" for b in backends)
+          + f" {'speedup':>8}")
+    for text in EXPRESSIONS:
+        expr = sp.sympify(text.replace("^", "**"))
+        funcs = {b: kernels.compile_kernel(expr, (x,), b) for b in backends}
+        label = text if len(text) <= 32 else text[:29] + "..."
+        with np.errstate(all='ignore'):
+            for size in SIZES:
+                values = np.linspace(*X_RANGE, size)
+                times = {b: best_of(lambda: funcs[b](values)) for b in backends}
+                fastest = min(times[b] for b in backends if b != 'lambdify')
+                print(f"{label:<32} {size:>9} " + " ".join(f"{times[b] * 1e3:>12.3f}" for b in backends)
+                      + f" {times['lambdify'] / fastest:>7.2f}x")
+        times = {}
+        for backend in backends:
+            solver = EquationSolver(cache=ExpressionCache())
+            solver.evaluator = backend
+            solver._numeric_solve(expr, X_RANGE)  # Compile outside the timing
+            times[backend] = best_of(lambda: solver._numeric_solve(expr, X_RANGE))
+        fastest = min(times[b] for b in backends if b != 'lambdify')
+        print(f"{label:<32} {'solve':>9} " + " ".join(f"{times[b] * 1e3:>12.3f}" for b in backends)
+              + f" {times['lambdify'] / fastest:>7.2f}x")
+
+if __name__ == "__main__":
+    main()
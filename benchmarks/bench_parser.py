@@ -0,0 +1,49 @@
+"""
+Parser throughput on long expressions, and the cost of getting from
+parser output to a SymPy expression via the source string vs. the AST
+
+Usage: python -m benchmarks.bench_parser
+"""
+import time
+import sympy as sp
+from cache.cache import ExpressionCache
+from parser.parser import Parser
+
+SIZES = [1_000, 10_000, 50_000]  # Approximate token counts
+FUNCTIONS = {"sqrt": sp.sqrt, "log10": lambda a: sp.log(a, 10)}
+
+def expression(tokens):
+    """Mixed expression of roughly the given number of tokens"""
+    terms = ["3.5*x^2", "sqrt(x+1)", "(x-2)/4", "log10(2*x)"]
+    # Each term is ~6 tokens plus the joining operator
+    return "+".join(terms[i % len(terms)] for i in range(tokens // 7))
+
+def best(fn, repeat=3):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+def main():
+    x = sp.Symbol("x")
+    print(f"{'tokens':>8} {'parse ms':>9} {'ast ms':>8} {'Mtok/s':>7} "
+          f"{'sympify ms':>11} {'to_sympy ms':>12}")
+    for size in SIZES:
+        text = expression(size)
+        parser = Parser(cache=ExpressionCache(max_size=0))  # No cache hits
+        n_tokens = len(parser.tokenize(text))
+        t_str, source = best(lambda: parser.parse(text)[0])
+        t_ast, node = best(lambda: parser.parse_ast(text)[0])
+        try:
+            t_sympify, _ = best(lambda: sp.sympify(source, locals=FUNCTIONS), repeat=1)
+            sympify_ms = f"{t_sympify * 1e3:.1f}"
+        except (ValueError, RecursionError, MemoryError):
+            sympify_ms = "fails"  # Python's parser gives up on very long sources
+        t_direct, _ = best(lambda: node.to_sympy(x, FUNCTIONS), repeat=1)
+        print(f"{n_tokens:>8} {t_str * 1e3:>9.1f} {t_ast * 1e3:>8.1f} "
+              f"{n_tokens / t_ast / 1e6:>7.2f} {sympify_ms:>11} {t_direct * 1e3:>12.1f}")
+
+if __name__ == "__main__":
+    main()
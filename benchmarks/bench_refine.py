@@ -0,0 +1,66 @@
+"""
+Compare vectorized bracket refinement against the per-bracket fsolve loop
+
+The fsolve baseline needs SciPy, which the solver itself no longer uses
+(pip install scipy).
+
+Usage: python -m benchmarks.bench_refine
+"""
+import time
+import numpy as np
+import sympy as sp
+from solver.refine import refine_brackets
+
+CASES = [
+    ("sin(50*x)", (-10, 10)),
+    ("sin(x) - x/2", (-5, 5)),
+    ("cos(200*x) - 0.3", (-10, 10)),
+    ("x**3 - 2*x - 5", (-10, 10)),
+]
+DENSITY = 1000  # Points per unit interval, as in EquationSolver
+
+def brackets(f, x_range):
+    x = np.linspace(x_range[0], x_range[1], int((x_range[1] - x_range[0]) * DENSITY))
+    y = f(x)
+    idx = np.where(np.diff(np.signbit(y)))[0]
+    return x, y, idx
+
+def fsolve_loop(f, x, y, idx, x_range):
+    """The refinement loop _numeric_solve used before refine_brackets"""
+    from scipy import optimize
+    roots = []
+    for i in idx:
+        sol = optimize.fsolve(f, x[i], xtol=1e-8, full_output=True)[0][0]
+        if x_range[0] <= sol <= x_range[1]:
+            roots.append(sol)
+    return np.array(roots)
+
+def vectorized(f, x, y, idx, x_range):
+    roots, converged = refine_brackets(f, x[idx], x[idx + 1], y[idx], y[idx + 1])
+    return roots[converged]
+
+def timeit(fn, *args, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def main():
+    x_sym = sp.Symbol("x")
+    print(f"{'equation':<20} {'brackets':>8} {'fsolve ms':>10} {'vector ms':>10} "
+          f"{'speedup':>8} {'fsolve out':>10} {'max |f|':>9}")
+    for expr, x_range in CASES:
+        f = sp.lambdify(x_sym, sp.sympify(expr), modules=["numpy"])
+        x, y, idx = brackets(f, x_range)
+        t_loop, loop_roots = timeit(fsolve_loop, f, x, y, idx, x_range)
+        t_vec, vec_roots = timeit(vectorized, f, x, y, idx, x_range)
+        # fsolve roots that left their bracket
+        escaped = np.sum((loop_roots < x[idx]) | (loop_roots > x[idx + 1])) \
+            if len(loop_roots) == len(idx) else len(idx) - len(loop_roots)
+        print(f"{expr:<20} {len(idx):>8} {t_loop * 1e3:>10.2f} {t_vec * 1e3:>10.2f} "
+              f"{t_loop / t_vec:>7.1f}x {escaped:>10} {np.max(np.abs(f(vec_roots))):>9.1e}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Load test for the local solve service: latency percentiles and throughput
+
+Starts `python -m service.server` on a free port, then sends --requests
+solves from --concurrency keep-alive connections. Equations are drawn
+from a pool of --unique problems, so repeats exercise the result cache
+and in-flight coalescing. 429 responses are counted, not retried.
+
+Usage: python -m benchmarks.bench_service [--requests N] [--concurrency C]
+                                          [--unique U] [--workers W]
+"""
+import argparse
+import asyncio
+import random
+import subprocess
+import sys
+import time
+import numpy as np
+from service.client import ServiceClient
+
+def problems(unique, seed=0):
+    rng = random.Random(seed)
+    shapes = ["x^2 - {a}", "sqrt(x + {a}) - x/{b}", "x^3 - {a}*x", "log10(x + {b}) + x/{a}",
+              "(x - {a})*(x + {b})"]
+    return [{"f1": rng.choice(shapes).format(a=rng.randint(1, 9), b=rng.randint(1, 9)),
+             "f2": str(rng.randint(0, 3))} for _ in range(unique)]
+
+async def load(port, requests, concurrency, unique):
+    pool = problems(unique)
+    rng = random.Random(1)
+    queue = [rng.choice(pool) for _ in range(requests)]
+    latencies, statuses = [], {}
+
+    async def worker():
+        client = ServiceClient("127.0.0.1", port)
+        while queue:
+            payload = queue.pop()
+            start = time.perf_counter()
+            status, _ = await client.request("POST", "/solve", payload)
+            latencies.append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+        await client.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - start
+    _, stats = await ServiceClient("127.0.0.1", port).request("GET", "/stats")
+    return np.array(latencies), statuses, elapsed, stats
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--unique", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    command = [sys.executable, "-m", "service.server", "--port", "0"]
+    if args.workers:
+        command += ["--workers", str(args.workers)]
+    server = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    try:
+        port = int(server.stdout.readline().rsplit(":", 1)[1])
+        latencies, statuses, elapsed, stats = asyncio.run(
+            load(port, args.requests, args.concurrency, args.unique))
+    finally:
+        server.terminate()
+        server.wait()
+
+    ms = latencies * 1e3
+    print(f"requests {len(ms)}  concurrency {args.concurrency}  unique {args.unique}")
+    print(f"throughput {len(ms) / elapsed:.1f} req/s  "
+          f"p50 {np.percentile(ms, 50):.1f} ms  p99 {np.percentile(ms, 99):.1f} ms  "
+          f"max {ms.max():.1f} ms")
+    print(f"statuses {dict(sorted(statuses.items()))}")
+    print(f"server: jobs {stats['jobs']}, coalesced {stats['coalesced']}, "
+          f"cache hits {stats['cache']['hits']}, rejected {stats['rejected']}")
+
+if __name__ == "__main__":
+    main()
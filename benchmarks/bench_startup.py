@@ -0,0 +1,41 @@
+"""
+Cold-start time of the entry points, each in a fresh interpreter
+
+The CLI row is a full run (import, parse, solve one equation, exit). The
+GUI row only imports gui.main_window, since app.py then blocks in the
+event loop, so it understates the time until the window appears.
+
+Usage: python -m benchmarks.bench_startup
+"""
+import subprocess
+import sys
+import time
+
+CASES = [
+    ("python -c pass", [sys.executable, "-c", "pass"], ""),
+    ("import cli", [sys.executable, "-c", "import cli"], ""),
+    ("cli.py, one equation", [sys.executable, "cli.py"], "x^2 = 4\n"),
+    ("import plotter.plotter", [sys.executable, "-c", "import plotter.plotter"], ""),
+    ("import gui.main_window", [sys.executable, "-c", "import gui.main_window"], ""),
+]
+
+def best(command, stdin, repeat=5):
+    """Best-of-repeat wall-clock seconds, or None if the command fails"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = subprocess.run(command, input=stdin, capture_output=True, text=True)
+        times.append(time.perf_counter() - start)
+        if result.returncode != 0:
+            return None
+    return min(times)
+
+def main():
+    print(f"{'entry point':<26} {'ms':>8}")
+    for name, command, stdin in CASES:
+        seconds = best(command, stdin)
+        ms = "unavailable" if seconds is None else f"{seconds * 1e3:.0f}"
+        print(f"{name:<26} {ms:>8}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Parameter sweep vs. one solve per parameter value
+
+Each family is solved for N values of a, once with solve_sweep and once
+by building the equation string for every value and calling solve (the
+loop is run on a sample of values and scaled up to N).
+
+Usage: python -m benchmarks.bench_sweep
+"""
+import time
+import numpy as np
+from cache.cache import ExpressionCache
+from solver.solver import EquationSolver
+
+FAMILIES = [
+    ("x**3 - x", "a", (-2, 2), (-3, 3)),
+    ("sqrt(x) + log10(x)", "a", (0, 3), (0, 100)),
+    ("sin(3*x)", "a*x", (0.01, 1), (-10, 10)),
+]
+SIZES = [100, 1_000, 10_000]
+LOOP_SAMPLE = 20  # Values solved one by one per family
+
+def main():
+    solver = EquationSolver(cache=ExpressionCache())
+    solver.warm_up()
+    print(f"{'family':<28} {'values':>7} {'sweep ms':>9} {'loop ms':>10} {'speedup':>8} {'roots':>7}")
+    for f1, f2, a_range, x_range in FAMILIES:
+        sample = np.linspace(*a_range, LOOP_SAMPLE)
+        start = time.perf_counter()
+        for a in sample:
+            solver.solve(f1, f2.replace("a", f"({a!r})"), x_range)
+        per_value = (time.perf_counter() - start) / LOOP_SAMPLE
+        for size in SIZES:
+            values = np.linspace(*a_range, size)
+            start = time.perf_counter()
+            result = solver.solve_sweep(f1, f2, "a", values, x_range)
+            elapsed = time.perf_counter() - start
+            loop = per_value * size
+            print(f"{f1 + ' = ' + f2:<28} {size:>7} {elapsed * 1e3:>9.1f} {loop * 1e3:>10.0f} "
+                  f"{loop / elapsed:>7.0f}x {len(result.points()[1]):>7}")
+
+if __name__ == "__main__":
+    main()
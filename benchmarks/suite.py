@@ -0,0 +1,267 @@
+"""
+Benchmark suite for the parser, solver and plotter hot paths
+
+Every case in a fixed corpus runs through each stage separately:
+Parser.parse, _polynomial_solve, _symbolic_solve, _numeric_solve,
+_clean_solutions and FunctionPlotter.plot. A stage's time is the best of
+up to --repeat runs (fewer once a stage has used --budget seconds), and
+its peak memory is the tracemalloc peak of one extra, untimed run.
+Inputs come from untimed setup, caches are disabled and SymPy's cache is
+cleared before each symbolic run, so repeats do not time cache hits.
+
+Results can be saved as JSON and later compared against; the run fails
+(exit status 1) when a stage is slower or uses more memory than the
+baseline by more than the given tolerance. Changes smaller than
+--min-time / --min-memory are treated as noise.
+
+Usage:
+    python -m benchmarks.suite --save baseline.json
+    python -m benchmarks.suite --compare baseline.json [--time-tolerance 0.25]
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+import numpy as np
+from cache.cache import ExpressionCache
+from parser.parser import Parser
+from solver.solver import EquationSolver
+
+class Case(NamedTuple):
+    name: str
+    category: str
+    f1: str
+    f2: str
+    x_range: Tuple[float, float]
+
+CORPUS = [
+    Case("quadratic", "polynomial", "x^2-3*x", "4", (-10, 10)),
+    Case("quintic", "polynomial", "x^5-3*x^3+x", "0.5", (-3, 3)),
+    Case("degree10", "polynomial",
+         "(x-1)*(x-2)*(x-3)*(x-4)*(x-5)*(x-6)*(x-7)*(x-8)*(x-9)*(x-10)", "1", (0, 11)),
+    Case("degree20", "polynomial", "x^20", "x+1", (-2, 2)),
+    Case("sqrt_log", "transcendental", "sqrt(x)+log10(x)", "2", (0, 10)),
+    Case("exponential", "transcendental", "2^x", "x+3", (-10, 10)),
+    Case("cos_fixed_point", "transcendental", "cos(x)", "x", (-10, 10)),
+    Case("sin50", "oscillatory", "sin(50*x)", "0.3", (-10, 10)),
+    Case("chirp", "oscillatory", "sin(x^2)", "0.5", (-5, 5)),
+    Case("pole", "asymptotic", "1/(x-1)", "x", (-10, 10)),
+    Case("decay", "asymptotic", "x/(x^2+1)", "0.1", (-100, 100)),
+    Case("wide_sqrt", "wide-range", "sqrt(x)", "50", (0, 1e4)),
+    Case("wide_log", "wide-range", "log10(x)", "x/1000", (0.001, 1e4)),
+]
+STAGES = ["parse", "polynomial", "symbolic", "numeric", "clean", "plot"]
+
+def _no_cache() -> ExpressionCache:
+    return ExpressionCache(max_size=0)
+
+def measure(run: Callable[[object], object],
+            setup: Callable[[], object] = lambda: None,
+            repeat: int = 5,
+            budget: float = 2.0) -> Dict[str, float]:
+    """
+    Best time and peak traced memory of run(setup()), setup excluded
+
+    Returns:
+        {"seconds": best time, "peak_kib": tracemalloc peak, "runs": timed runs}
+    """
+    times = []
+    while len(times) < repeat and sum(times) < budget:
+        state = setup()
+        start = time.perf_counter()
+        run(state)
+        times.append(time.perf_counter() - start)
+
+    # Separate run: tracemalloc slows allocation-heavy code several times
+    state = setup()
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        run(state)
+        peak = tracemalloc.get_traced_memory()[1] - base
+    finally:
+        tracemalloc.stop()
+    return {"seconds": min(times), "peak_kib": peak / 1024, "runs": len(times)}
+
+def _python_source(parser: Parser, func: str) -> str:
+    """What the GUI would hand the solver and plotter for func"""
+    source, errors = parser.parse(func)
+    return func.replace("^", "**") if errors else source
+
+def _qt_app():
+    """The running QApplication (an offscreen one if needed), or None without Qt"""
+    try:
+        from matplotlib.backends.qt_compat import QtWidgets
+    except ImportError:
+        return None
+    app = QtWidgets.QApplication.instance()
+    if app is None:
+        app = _qt_app.app = QtWidgets.QApplication(["bench", "-platform", "offscreen"])
+    return app
+
+def _plotter():
+    from plotter.plotter import FunctionPlotter
+    return FunctionPlotter(cache=_no_cache())
+
+def bench_case(case: Case,
+               stages: List[str],
+               repeat: int,
+               budget: float) -> Dict[str, Optional[Dict[str, float]]]:
+    """Measure each requested stage for one case; None where it does not apply"""
+    from sympy.core.cache import clear_cache
+    parser = Parser(cache=_no_cache())
+    solver = EquationSolver(cache=_no_cache())
+    source1, source2 = (_python_source(parser, f) for f in (case.f1, case.f2))
+    equation = solver._equation(source1, source2)
+    raw = solver._numeric_solve(equation, case.x_range)
+    # Cleaning sees symbolic and numeric roots together, near-duplicates included
+    raw = raw + [r + 1e-12 for r in raw]
+    roots = solver._clean_solutions(raw, case.x_range)
+
+    def parse(_):
+        parser.parse(case.f1)
+        parser.parse(case.f2)
+
+    def plot(plotter):
+        plotter.plot(source1, source2, roots)
+
+    runs = {
+        "parse": (parse, lambda: None),
+        "polynomial": (lambda _: solver._polynomial_solve(equation), clear_cache),
+        "symbolic": (lambda _: solver._symbolic_solve(equation, case.x_range), clear_cache),
+        "numeric": (lambda _: solver._numeric_solve(equation, case.x_range), lambda: None),
+        "clean": (lambda _: solver._clean_solutions(raw, case.x_range), lambda: None),
+        "plot": (plot, _plotter),
+    }
+    results = {}
+    for stage in stages:
+        if stage == "parse" and (parser.parse(case.f1)[1] or parser.parse(case.f2)[1]):
+            results[stage] = None  # Outside the input grammar
+            continue
+        if stage == "plot" and _qt_app() is None:
+            results[stage] = None
+            continue
+        run, setup = runs[stage]
+        results[stage] = measure(run, setup, repeat, budget)
+    return results
+
+def run_suite(cases: List[Case] = CORPUS,
+              stages: List[str] = STAGES,
+              repeat: int = 5,
+              budget: float = 2.0,
+              progress=None) -> dict:
+    """Measure every case; the result is what --save writes"""
+    import sympy
+    results = {}
+    for case in cases:
+        for stage, metrics in bench_case(case, stages, repeat, budget).items():
+            if metrics is not None:
+                results[f"{case.name}/{stage}"] = metrics
+        if progress is not None:
+            progress(case, results)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "sympy": sympy.__version__,
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+def compare(current: dict,
+            baseline: dict,
+            time_tolerance: float = 0.25,
+            memory_tolerance: float = 0.25,
+            min_time: float = 1e-4,
+            min_memory: float = 64.0) -> List[str]:
+    """
+    Regressions of current against baseline, as readable messages
+
+    A metric regresses when it grew by more than its tolerance (a
+    fraction of the baseline) and by more than min_time seconds or
+    min_memory KiB. Entries missing from either side are ignored.
+    """
+    regressions = []
+    for key, new in current["results"].items():
+        old = baseline["results"].get(key)
+        if old is None:
+            continue
+        for metric, tolerance, floor, unit, scale in (
+            ("seconds", time_tolerance, min_time, "ms", 1e3),
+            ("peak_kib", memory_tolerance, min_memory, "KiB", 1),
+        ):
+            if new[metric] > old[metric] * (1 + tolerance) and new[metric] - old[metric] > floor:
+                regressions.append(
+                    f"{key}: {metric} {old[metric] * scale:.2f} -> {new[metric] * scale:.2f} {unit} "
+                    f"(+{(new[metric] / old[metric] - 1) * 100 if old[metric] else float('inf'):.0f}%)"
+                )
+    return regressions
+
+def _print_case(case: Case, results: dict, baseline: Optional[dict]):
+    for stage in STAGES:
+        metrics = results.get(f"{case.name}/{stage}")
+        if metrics is None:
+            continue
+        line = (f"{case.name:<16} {case.category:<15} {stage:<11} "
+                f"{metrics['seconds'] * 1e3:>10.3f} {metrics['peak_kib']:>10.1f}")
+        old = baseline["results"].get(f"{case.name}/{stage}") if baseline else None
+        if old and old["seconds"]:
+            line += f" {metrics['seconds'] / old['seconds']:>8.2f}x"
+        print(line, flush=True)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Time and memory of the solver hot paths")
+    parser.add_argument("--save", metavar="FILE", help="Write results as a JSON baseline")
+    parser.add_argument("--compare", metavar="FILE", help="Fail on regressions against FILE")
+    parser.add_argument("--time-tolerance", type=float, default=0.25,
+                        help="Allowed slowdown as a fraction (default: 0.25)")
+    parser.add_argument("--memory-tolerance", type=float, default=0.25,
+                        help="Allowed peak memory growth as a fraction (default: 0.25)")
+    parser.add_argument("--min-time", type=float, default=1e-4,
+                        help="Slowdowns below this many seconds are noise (default: 1e-4)")
+    parser.add_argument("--min-memory", type=float, default=64.0,
+                        help="Growth below this many KiB is noise (default: 64)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per stage")
+    parser.add_argument("--budget", type=float, default=2.0,
+                        help="Seconds after which a stage stops repeating")
+    parser.add_argument("--cases", nargs="+", metavar="NAME",
+                        help="Case names or categories to run (default: all)")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES)
+    args = parser.parse_args(argv)
+
+    cases = [c for c in CORPUS if not args.cases or {c.name, c.category} & set(args.cases)]
+    if not cases:
+        parser.error(f"No cases match {args.cases}")
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    print(f"{'case':<16} {'category':<15} {'stage':<11} {'ms':>10} {'peak KiB':>10}"
+          + (f" {'vs base':>9}" if baseline else ""))
+    current = run_suite(cases, args.stages, args.repeat, args.budget,
+                        progress=lambda case, results: _print_case(case, results, baseline))
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(current, f, indent=2, sort_keys=True)
+        print(f"Saved {len(current['results'])} results to {args.save}")
+    if baseline is None:
+        return 0
+
+    if baseline.get("meta") != current["meta"]:
+        print("Note: baseline was recorded on a different machine or library versions",
+              file=sys.stderr)
+    regressions = compare(current, baseline, args.time_tolerance, args.memory_tolerance,
+                          args.min_time, args.min_memory)
+    for message in regressions:
+        print(f"REGRESSION {message}")
+    print(f"{len(regressions)} regression(s) against {args.compare}")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Dict, Hashable, Optional
+
+class CacheEntry:
+    """Everything derived from one expression text"""
+    __slots__ = ('tokens', 'sympy_expr', 'numpy_func', 'code')
+
+    def __init__(self):
+        self.tokens = None      # Parser token stream
+        self.sympy_expr = None  # SymPy expression (simplified for equations)
+        self.numpy_func = None  # Lambdified NumPy callable
+        self.code = None        # Compiled Python code object for plotting
+
+class ExpressionCache:
+    """Bounded LRU cache shared by Parser, EquationSolver and FunctionPlotter"""
+    FIELDS = CacheEntry.__slots__
+
+    def __init__(self, max_size: int = 256):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def normalize(expression: str) -> str:
+        """Cache key: surrounding whitespace stripped, inner runs collapsed"""
+        return " ".join(expression.split())
+
+    def get(self, expression: str, field: str, factory: Callable[[], Any]) -> Any:
+        """
+        Return the cached field for an expression, computing it on a miss
+        
+        Args:
+            expression: Expression text (normalized before lookup)
+            field: One of FIELDS
+            factory: Zero-argument callable producing the value on a miss
+            
+        Returns:
+            The cached or freshly computed value. Exceptions raised by
+            factory propagate and nothing is stored.
+        """
+        if field not in self.FIELDS:
+            raise KeyError(f"Unknown cache field: '{field}'")
+        key = self.normalize(expression)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                value = getattr(entry, field)
+                if value is not None:
+                    self.hits += 1
+                    return value
+            self.misses += 1
+
+        value = factory()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = CacheEntry()
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+            else:
+                self._entries.move_to_end(key)
+            setattr(entry, field, value)
+        return value
+
+    def peek(self, expression: str, field: str) -> Any:
+        """Return the cached field or None, without touching counters or order"""
+        with self._lock:
+            entry = self._entries.get(self.normalize(expression))
+            return None if entry is None else getattr(entry, field)
+
+    def stats(self) -> Dict[str, int]:
+        """Export counters as a plain dict"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._entries),
+                'max_size': self.max_size,
+            }
+
+    def clear(self):
+        """Drop all entries and reset counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def __contains__(self, expression: str) -> bool:
+        return self.normalize(expression) in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class ResultCache:
+    """Bounded LRU cache of finished results whose entries also expire after ttl seconds"""
+
+    def __init__(self,
+                 max_size: int = 1024,
+                 ttl: Optional[float] = 300.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_size = max_size
+        self.ttl = ttl  # None = entries never expire
+        self.clock = clock
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> Any:
+        """Return the cached value, or None on a miss or an expired entry"""
+        with self._lock:
+            item = self._entries.get(key)
+            if item is not None:
+                expires_at, value = item
+                if expires_at is None or expires_at > self.clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+            return None
+
+    def put(self, key: Hashable, value: Any):
+        expires_at = None if self.ttl is None else self.clock() + self.ttl
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Export counters as a plain dict"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'size': len(self._entries),
+                'max_size': self.max_size,
+            }
+
+    def clear(self):
+        """Drop all entries and reset counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Process-wide instance used by default
+expression_cache = ExpressionCache()
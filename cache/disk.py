@@ -0,0 +1,108 @@
+import json
+import os
+import sqlite3
+import time
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+class DiskCache:
+    """
+    Persistent, size-bounded store of solve results in one SQLite file
+
+    Safe to share between processes: every process opens its own
+    connection (re-opened after a fork), the database runs in WAL mode so
+    readers never block the writer, and concurrent writers wait on
+    SQLite's busy timeout. The least recently used rows are evicted once
+    max_entries is exceeded. Instances pickle as (path, max_entries), so
+    they can be handed to worker processes.
+    """
+    EVICT_EVERY = 64  # Inserts between size checks
+
+    def __init__(self, path: str, max_entries: int = 100_000):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = Lock()
+        self._conn = None
+        self._pid = None
+        self._inserts = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __getstate__(self):
+        return {'path': self.path, 'max_entries': self.max_entries}
+
+    def __setstate__(self, state):
+        self.__init__(state['path'], state['max_entries'])
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False,
+                                   isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS solutions ("
+                "key TEXT PRIMARY KEY, roots TEXT NOT NULL, sources TEXT NOT NULL, "
+                "last_used REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS solutions_last_used ON solutions (last_used)")
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    def get(self, key: str) -> Optional[Tuple[List[float], List[str]]]:
+        """(roots, sources) stored under key, or None"""
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT roots, sources FROM solutions WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            conn.execute("UPDATE solutions SET last_used = ? WHERE key = ?", (time.time(), key))
+        return json.loads(row[0]), json.loads(row[1])
+
+    def put(self, key: str, roots: List[float], sources: List[str]):
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO solutions VALUES (?, ?, ?, ?)",
+                (key, json.dumps(roots), json.dumps(sources), time.time()),
+            )
+            self._inserts += 1
+            if self._inserts % self.EVICT_EVERY == 0:
+                self._evict(conn)
+
+    def _evict(self, conn: sqlite3.Connection):
+        excess = conn.execute("SELECT COUNT(*) FROM solutions").fetchone()[0] - self.max_entries
+        if excess > 0:
+            conn.execute(
+                "DELETE FROM solutions WHERE key IN "
+                "(SELECT key FROM solutions ORDER BY last_used LIMIT ?)", (excess,)
+            )
+
+    def evict(self):
+        """Trim to max_entries now rather than at the next periodic check"""
+        with self._lock:
+            self._evict(self._connection())
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            size = self._connection().execute("SELECT COUNT(*) FROM solutions").fetchone()[0]
+        return {'hits': self.hits, 'misses': self.misses, 'size': size,
+                'max_entries': self.max_entries}
+
+    def clear(self):
+        with self._lock:
+            self._connection().execute("DELETE FROM solutions")
+            self.hits = self.misses = 0
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+
+    def __len__(self) -> int:
+        return self.stats()['size']
@@ -0,0 +1,170 @@
+"""
+Headless entry point: solve equations from stdin or a file, stream JSONL
+
+Each input line is either plain text, "f1 = f2", or a JSON object
+{"f1": ..., "f2": ..., "x_range": [min, max], "id": ...} (x_range and id
+optional). Blank lines and lines starting with '#' are skipped. One JSON
+object is written per equation, as soon as it is solved:
+
+    {"index": 0, "id": null, "f1": "x^2", "f2": "4", "roots": [-2.0, 2.0], "errors": []}
+
+Only the parser and solver are imported, never the GUI or plotter, so
+start-up cost is that of numpy and sympy alone.
+
+Usage: python cli.py [FILE] [--x-range MIN MAX] [--timeout S] [--workers N] [--cache PATH]
+                     [--trace PATH [--profile-over S]]
+"""
+import argparse
+import json
+import os
+import sys
+from typing import IO, Iterator, List, Optional
+from parser.parser import Parser
+from solver.solver import EquationSolver
+
+def read_requests(lines: IO[str], x_range) -> Iterator[dict]:
+    """Turn input lines into request dicts; malformed lines carry 'errors'"""
+    index = 0
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        request = {"index": index, "id": None, "f1": None, "f2": None,
+                   "x_range": x_range, "errors": []}
+        index += 1
+        if line.startswith("{"):
+            try:
+                data = json.loads(line)
+                request["f1"], request["f2"] = str(data["f1"]), str(data["f2"])
+                request["id"] = data.get("id")
+                if "x_range" in data:
+                    low, high = data["x_range"]
+                    request["x_range"] = (float(low), float(high))
+            except KeyError as e:
+                request["errors"].append(f"Invalid JSON request: missing {e}.")
+            except (ValueError, TypeError) as e:
+                request["errors"].append(f"Invalid JSON request: {e}")
+        elif line.count("=") == 1:
+            request["f1"], request["f2"] = (side.strip() for side in line.split("="))
+        else:
+            request["errors"].append("Expected 'f1 = f2'.")
+        yield request
+
+def record(request: dict, roots: List[float]) -> str:
+    return json.dumps({
+        "index": request["index"],
+        "id": request["id"],
+        "f1": request["f1"],
+        "f2": request["f2"],
+        "roots": roots,
+        "errors": request["errors"],
+    })
+
+def run(lines: IO[str],
+        out: IO[str],
+        x_range=(-10.0, 10.0),
+        timeout: Optional[float] = None,
+        workers: int = 0,
+        cache_path: Optional[str] = None,
+        trace_path: Optional[str] = None,
+        profile_over: Optional[float] = None) -> int:
+    """
+    Solve every request in lines, writing one JSON line each to out
+
+    With workers > 0, results are written in completion order; the
+    "index" field gives the input position, and timeout is a wall-clock
+    limit per equation (a worker that exceeds it is replaced). Inline
+    (workers=0) it bounds each equation's symbolic stage instead, after
+    which the numeric stage still runs. cache_path names an SQLite
+    file that keeps results across runs. trace_path names a JSONL file
+    that gets one solver.tracing record per solve; solves slower than
+    profile_over seconds also carry a cProfile summary.
+
+    Returns:
+        Number of requests that had errors
+    """
+    parser = Parser()
+    solver = EquationSolver()
+    if not workers:
+        # Workers cannot start the killable symbolic process; there the
+        # per-problem limit of solve_many applies instead
+        solver.symbolic_timeout = timeout
+    if cache_path:
+        from cache.disk import DiskCache
+        solver.disk_cache = DiskCache(cache_path)
+    if trace_path:
+        from solver.tracing import JsonlSink, Tracer
+        solver.tracer = Tracer(JsonlSink(trace_path), profile_over=profile_over)
+    pending = []  # Requests by problem position in the solve_many stream
+    failures = 0
+
+    def emit(request, roots):
+        out.write(record(request, roots) + "\n")
+        out.flush()
+
+    def problems():
+        nonlocal failures
+        for request in read_requests(lines, x_range):
+            if not request["errors"]:
+                parsed = []
+                for side in ("f1", "f2"):
+                    node, errors = parser.parse_ast(request[side])
+                    request["errors"].extend(f"{side}: {error}" for error in errors)
+                    parsed.append(node)
+            if request["errors"]:
+                # Reported straight away; never reaches the solver
+                failures += 1
+                emit(request, [])
+                continue
+            pending.append(request)
+            yield parsed[0].to_source(), parsed[1].to_source(), request["x_range"]
+
+    try:
+        for result in solver.solve_many(problems(), max_workers=workers, timeout=timeout):
+            request = pending[result.index]
+            if result.error:
+                failures += 1
+                request["errors"].append(result.error)
+            emit(request, result.solutions)
+    finally:
+        solver.close()
+        if solver.disk_cache is not None:
+            solver.disk_cache.close()
+        if solver.tracer is not None:
+            for sink in solver.tracer.sinks:
+                sink.close()
+    return failures
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Solve f1(x) = f2(x) equations, JSONL out")
+    parser.add_argument("file", nargs="?", help="Input file (default: stdin)")
+    parser.add_argument("--x-range", nargs=2, type=float, default=(-10.0, 10.0),
+                        metavar=("MIN", "MAX"), help="Search range (default: -10 10)")
+    parser.add_argument("--timeout", type=float, default=None,
+                        help="Seconds allowed per equation: wall-clock with --workers, "
+                             "the symbolic stage only when solving inline")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="Worker processes (default: 0, solve inline in order)")
+    parser.add_argument("--cache", metavar="PATH", default=None,
+                        help="SQLite file that keeps results across runs")
+    parser.add_argument("--trace", metavar="PATH", default=None,
+                        help="Append per-stage timings of every solve to a JSONL file")
+    parser.add_argument("--profile-over", type=float, default=None, metavar="S",
+                        help="With --trace, profile solves and keep profiles of those over S seconds")
+    args = parser.parse_args(argv)
+
+    lines = open(args.file) if args.file else sys.stdin
+    try:
+        failures = run(lines, sys.stdout, tuple(args.x_range), args.timeout, args.workers,
+                       args.cache, args.trace, args.profile_over)
+    except BrokenPipeError:
+        # Reader went away (e.g. piped into head); stop quietly
+        sys.stdout = open(os.devnull, "w")
+        return 1
+    finally:
+        if args.file:
+            lines.close()
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
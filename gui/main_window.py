@@ -1,8 +1,9 @@
-from PySide2.QtWidgets import QMainWindow, QVBoxLayout, QWidget, QLineEdit, QPushButton, QLabel, QListWidget, QHBoxLayout, QGroupBox
-from PySide2.QtCore import QSize
+from PySide2.QtWidgets import QMainWindow, QVBoxLayout, QWidget, QLineEdit, QPushButton, QLabel, QListWidget, QHBoxLayout, QGroupBox, QProgressBar, QCheckBox
+from PySide2.QtCore import QSize, QThreadPool, QTimer
 from parser.parser import Parser
 from solver.solver import EquationSolver
 from plotter.plotter import FunctionPlotter
+from gui.solve_task import SolveTask, WarmUpTask
 
 
 class MainWindow(QMainWindow):
@@ -11,8 +12,23 @@ class MainWindow(QMainWindow):
         self.setWindowTitle("Function Solver and Plotter")
         self.valid_ops = ['+', '-', '*', '/', '^', 'log10', 'sqrt']
         self.parser = Parser()  # Initialize parser
-        self.solver = EquationSolver()
-        self.plotter = FunctionPlotter()
+        self.solver = EquationSolver()  # Cheap: SymPy loads on first use
+        # Run simplify/solve in a killable process so Cancel can stop it
+        self.solver.symbolic_timeout = 30
+        # matplotlib is the slowest import; the plotter is created once the
+        # window is up (see warmUp) or on first use, whichever comes first
+        self._plotter = None
+
+        # Solving runs off the UI thread; each request gets a new generation
+        # and results from older generations are discarded
+        self.thread_pool = QThreadPool()
+        self.generation = 0
+        self.solve_task = None
+
+        # Live mode: per input, the last (text, parsed AST, errors, samples)
+        # so an edit only re-processes the function that changed
+        self.live_state = []
+        self.live_delay_ms = 40
 
         # Main layout
         main_layout = QHBoxLayout()
@@ -65,39 +81,66 @@ class MainWindow(QMainWindow):
         ops_section.setLayout(ops_section_layout)
         left_layout.addWidget(ops_section)
 
-        # Function 1 GroupBox
-        func1_group = QGroupBox("Function 1")
-        func1_layout = QVBoxLayout()
-        self.func1_input = QLineEdit()
-        func1_layout.addWidget(self.func1_input)
-        self.func1_errors = QListWidget()
-        func1_layout.addWidget(self.func1_errors)
-        func1_group.setLayout(func1_layout)
-        left_layout.addWidget(func1_group)
-
-        # Function 2 GroupBox
-        func2_group = QGroupBox("Function 2")
-        func2_layout = QVBoxLayout()
-        self.func2_input = QLineEdit()
-        func2_layout.addWidget(self.func2_input)
-        self.func2_errors = QListWidget()
-        func2_layout.addWidget(self.func2_errors)
-        func2_group.setLayout(func2_layout)
-        left_layout.addWidget(func2_group)
+        # One GroupBox per function; two to start, more with "Add function".
+        # With more than two, every pairwise intersection is solved for
+        self.func_groups = []
+        self.func_inputs = []
+        self.func_errors = []
+        self.functions_layout = QVBoxLayout()
+        left_layout.addLayout(self.functions_layout)
+        self.addFunctionInput()
+        self.addFunctionInput()
+        self.func1_input, self.func2_input = self.func_inputs
+        self.func1_errors, self.func2_errors = self.func_errors
+
+        functions_buttons = QHBoxLayout()
+        self.add_function_button = QPushButton("Add function")
+        self.add_function_button.clicked.connect(self.addFunctionInput)
+        functions_buttons.addWidget(self.add_function_button)
+        self.remove_function_button = QPushButton("Remove function")
+        self.remove_function_button.clicked.connect(self.removeFunctionInput)
+        self.remove_function_button.setEnabled(False)
+        functions_buttons.addWidget(self.remove_function_button)
+        left_layout.addLayout(functions_buttons)
 
         # Solve and Plot button
         self.solve_plot_button = QPushButton("Solve and Plot")
         self.solve_plot_button.clicked.connect(self.solveAndPlot)
         left_layout.addWidget(self.solve_plot_button)
 
+        # Live mode: solve and plot as you type, debounced
+        self.live_checkbox = QCheckBox("Live update")
+        self.live_checkbox.toggled.connect(self.onLiveToggled)
+        left_layout.addWidget(self.live_checkbox)
+        self.live_timer = QTimer(self)
+        self.live_timer.setSingleShot(True)
+        self.live_timer.setInterval(self.live_delay_ms)
+        self.live_timer.timeout.connect(self.liveUpdate)
+
+        # Progress and cancellation
+        status_layout = QHBoxLayout()
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 0)  # Busy indicator
+        self.progress_bar.setTextVisible(False)
+        self.progress_bar.hide()
+        status_layout.addWidget(self.progress_bar)
+        self.status_label = QLabel("")
+        status_layout.addWidget(self.status_label)
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.clicked.connect(self.cancelSolve)
+        self.cancel_button.setEnabled(False)
+        status_layout.addWidget(self.cancel_button)
+        left_layout.addLayout(status_layout)
+
         left_widget.setLayout(left_layout)
         main_layout.addWidget(left_widget, 1)  # Stretch factor 1
 
-        # Right side - Plot canvas
+        # Right side - Plot canvas, filled in when the plotter is created
         right_widget = QWidget()
-        right_layout = QVBoxLayout()
-        right_layout.addWidget(self.plotter.canvas)
-        right_widget.setLayout(right_layout)
+        self.plot_layout = QVBoxLayout()
+        self.plot_placeholder = QLabel("Loading plot...")
+        self.plot_layout.addWidget(self.plot_placeholder)
+        right_widget.setLayout(self.plot_layout)
         main_layout.addWidget(right_widget, 1)  # Stretch factor 1
 
         # Set main layout
@@ -108,35 +151,178 @@ class MainWindow(QMainWindow):
         self.setMinimumSize(QSize(480, 320))
         self.setMaximumSize(QSize(1280, 720))
 
+        # Give the window system time to expose and paint the window first
+        QTimer.singleShot(100, self.warmUp)
+
+    def addFunctionInput(self):
+        """Add a GroupBox with an input and error list for one more function"""
+        group = QGroupBox(f"Function {len(self.func_inputs) + 1}")
+        layout = QVBoxLayout()
+        line_edit = QLineEdit()
+        layout.addWidget(line_edit)
+        error_list = QListWidget()
+        layout.addWidget(error_list)
+        group.setLayout(layout)
+        self.functions_layout.addWidget(group)
+        self.func_groups.append(group)
+        self.func_inputs.append(line_edit)
+        self.func_errors.append(error_list)
+        self.live_state.append(None)
+        # Editing an input makes any running solve stale
+        line_edit.textChanged.connect(self.onInputEdited)
+        if len(self.func_inputs) > 2:
+            self.remove_function_button.setEnabled(True)
+            self.onInputEdited()
+
+    def removeFunctionInput(self):
+        """Remove the last function, keeping at least two"""
+        if len(self.func_inputs) <= 2:
+            return
+        group = self.func_groups.pop()
+        self.func_inputs.pop()
+        self.func_errors.pop()
+        self.live_state.pop()
+        self.functions_layout.removeWidget(group)
+        group.deleteLater()
+        self.remove_function_button.setEnabled(len(self.func_inputs) > 2)
+        self.onInputEdited()
+
+    @property
+    def plotter(self):
+        if self._plotter is None:
+            from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as NavigationToolbar
+            self._plotter = FunctionPlotter()
+            self.plot_layout.removeWidget(self.plot_placeholder)
+            self.plot_placeholder.deleteLater()
+            # Pan/zoom; the plotter resamples the curves for the new view
+            self.plot_layout.addWidget(NavigationToolbar(self._plotter.canvas, self))
+            self.plot_layout.addWidget(self._plotter.canvas)
+        return self._plotter
+
+    def warmUp(self):
+        """Load the deferred dependencies after the window first appears"""
+        self.thread_pool.start(WarmUpTask(self.solver))  # SymPy, off the UI thread
+        self.plotter  # matplotlib; creates Qt widgets, so on the UI thread
+
     def solveAndPlot(self):
-        func1 = self.func1_input.text()
-        func2 = self.func2_input.text()
-        # Clear error lists
-        self.func1_errors.clear()
-        self.func2_errors.clear()
-
-        # Parse and validate Function 1
-        parsed_func1, errors1 = self.parser.parse(func1)
-        for error in errors1:
-            self.func1_errors.addItem(error)
-
-        # Parse and validate Function 2
-        parsed_func2, errors2 = self.parser.parse(func2)
-        for error in errors2:
-            self.func2_errors.addItem(error)
+        parsed_funcs = []
+        has_errors = False
+        for line_edit, error_list in zip(self.func_inputs, self.func_errors):
+            # Clear, then parse and validate each function
+            error_list.clear()
+            parsed_func, errors = self.parser.parse_ast(line_edit.text())
+            for error in errors:
+                error_list.addItem(error)
+                has_errors = True
+            parsed_funcs.append(parsed_func)
 
         # Proceed to solve and plot if inputs are valid
-        if not errors1 and not errors2:
-            try:
-                solutions = self.solver.solve(parsed_func1, parsed_func2)
-                if solutions:
-                    self.plotter.plot(parsed_func1, parsed_func2, solutions)
-                else:
-                    self.plotter.plot(parsed_func1, parsed_func2)
-                    self.func1_errors.addItem("No intersections found")
-            except Exception as e:
-                self.func1_errors.addItem("Plotting error")
-                self.func2_errors.addItem(str(e))
+        if not has_errors:
+            self.startSolve(parsed_funcs)
+
+    def startSolve(self, parsed_funcs, curves=None):
+        """Queue a solve for the current generation on the thread pool"""
+        self.cancelSolve()
+        self.solve_task = SolveTask(
+            self.generation, self.solver, self.plotter, parsed_funcs, curves
+        )
+        signals = self.solve_task.signals
+        signals.progress.connect(self.onSolveProgress)
+        signals.finished.connect(self.onSolveFinished)
+        signals.failed.connect(self.onSolveFailed)
+        signals.cancelled.connect(self.onSolveCancelled)
+        self.setBusy(True, "Queued...")
+        self.thread_pool.start(self.solve_task)
+
+    def onInputEdited(self):
+        self.cancelSolve()
+        if self.live_checkbox.isChecked():
+            self.live_timer.start()  # Restarts the debounce window
+
+    def onLiveToggled(self, checked):
+        if checked:
+            self.live_timer.start()
+        else:
+            self.live_timer.stop()
+
+    def liveUpdate(self):
+        """Re-parse and re-sample only edited inputs, redraw, then solve"""
+        for key, line_edit in enumerate(self.func_inputs):
+            text = line_edit.text()
+            state = self.live_state[key]
+            if state is None or state[0] != text:
+                node, errors = self.parser.parse_ast(text)
+                samples = self.plotter.sample_curve(node) if not errors else None
+                self.live_state[key] = (text, node, list(errors), samples)
+
+        has_errors = False
+        for key, error_list in enumerate(self.func_errors):
+            error_list.clear()
+            for error in self.live_state[key][2]:
+                error_list.addItem(error)
+                has_errors = True
+        if has_errors:
+            return
+
+        funcs = [state[1] for state in self.live_state]
+        # The plotter extends the kept samples if the view moved since
+        curves = [state[3] for state in self.live_state]
+        # Curves first, markers once the solver is done
+        self.plotter.plot_curves(funcs, curves=curves)
+        self.startSolve(funcs, curves)
+
+    def cancelSolve(self):
+        """Abandon the running solve, if any; its results will be ignored"""
+        self.generation += 1
+        if self.solve_task is not None:
+            self.solve_task = None
+            self.solver.cancel()
+            self.setBusy(False, "Cancelled")
+
+    def setBusy(self, busy, message=""):
+        self.progress_bar.setVisible(busy)
+        self.cancel_button.setEnabled(busy)
+        self.status_label.setText(message)
+
+    def isCurrent(self, generation):
+        return self.solve_task is not None and generation == self.generation
+
+    def onSolveProgress(self, generation, message):
+        if self.isCurrent(generation):
+            self.status_label.setText(message)
+
+    def onSolveFinished(self, generation, result):
+        if not self.isCurrent(generation):
+            return
+        task, self.solve_task = self.solve_task, None
+        self.setBusy(False)
+        points, curves = result
+        try:
+            self.plotter.plot_curves(task.funcs, points, curves=curves)
+            if not points:
+                self.func1_errors.addItem("No intersections found")
+        except Exception as e:
+            self.func1_errors.addItem("Plotting error")
+            self.func2_errors.addItem(str(e))
+
+    def onSolveFailed(self, generation, message):
+        if not self.isCurrent(generation):
+            return
+        self.solve_task = None
+        self.setBusy(False)
+        self.func1_errors.addItem("Plotting error")
+        self.func2_errors.addItem(message)
+
+    def onSolveCancelled(self, generation):
+        if self.isCurrent(generation):
+            self.solve_task = None
+            self.setBusy(False, "Cancelled")
+
+    def closeEvent(self, event):
+        self.cancelSolve()
+        self.thread_pool.waitForDone()
+        self.solver.close()
+        super().closeEvent(event)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,61 @@
+from concurrent.futures import CancelledError
+from PySide2.QtCore import QObject, QRunnable, Signal
+
+
+class SolveSignals(QObject):
+    # Every signal carries the generation the task was started for, so the
+    # window can drop results for inputs that have since changed
+    progress = Signal(int, str)
+    finished = Signal(int, object)  # ([(x, y) per intersection], [CurveSamples per function])
+    failed = Signal(int, str)
+    cancelled = Signal(int)
+
+
+class SolveTask(QRunnable):
+    """Solve and sample the curves on a QThreadPool thread"""
+
+    def __init__(self, generation, solver, plotter, funcs, curves=None):
+        super().__init__()
+        self.generation = generation
+        self.solver = solver
+        self.plotter = plotter
+        self.funcs = list(funcs)  # Parsed functions, two or more
+        self.curves = curves  # CurveSamples per function if already sampled
+        # The axes and the view range belong to the UI thread: snapshot them here
+        self.view = plotter.view()
+        # Created on the UI thread, so emits from run() are queued to it
+        self.signals = SolveSignals()
+
+    def run(self):
+        generation = self.generation
+        try:
+            self.signals.progress.emit(generation, "Solving...")
+            if len(self.funcs) == 2:
+                roots = self.solver.solve_detailed(*self.funcs).roots
+                # Marked on Function 1
+                points = self.plotter.points_on(self.funcs[0], roots).tolist()
+            else:
+                # Every pair, from one shared sampling of the functions
+                points = [(p.x, p.y) for p in self.solver.intersect_all(self.funcs)]
+            curves = self.curves
+            if curves is None:
+                self.signals.progress.emit(generation, "Sampling curves...")
+                curves = self.plotter.sample(*self.funcs, view=self.view)
+        except CancelledError:
+            self.signals.cancelled.emit(generation)
+            return
+        except Exception as e:
+            self.signals.failed.emit(generation, str(e))
+            return
+        self.signals.finished.emit(generation, (points, curves))
+
+
+class WarmUpTask(QRunnable):
+    """Import the solver's deferred dependencies ahead of the first solve"""
+
+    def __init__(self, solver):
+        super().__init__()
+        self.solver = solver
+
+    def run(self):
+        self.solver.warm_up()
@@ -0,0 +1,192 @@
+"""
+Canonical form of an equation f1(x) = f2(x), for cache and dedup keys
+
+f1 - f2 is expanded into a sum of monomials with exact rational
+coefficients. Constants are folded, commutative operands are ordered and
+integer powers of sums are multiplied out. Then the whole equation is
+scaled so the leading coefficient is 1, which also makes f1 = f2 and
+f2 = f1 the same. So x^2-4 = 0, (x-2)*(x+2) = 0, x*x = 4 and 8 = 2*x^2
+share one key.
+
+Only value-preserving rewrites are made. Division by a non-constant and
+calls (sqrt, log10) stay opaque factors, so x/x is not cancelled to 1
+and sqrt(x)^2 is not turned into x. An opaque factor is named by a
+fixed-length digest of its canonical argument, so nesting does not grow
+the key, and equations that would take more than MAX_WORK term products
+to expand raise TooComplex instead.
+"""
+import hashlib
+from fractions import Fraction
+from typing import Dict, Tuple, Union
+from parser.nodes import Call, Chain, Group, Missing, Node, Number, Variable
+
+# Monomial: sorted ((factor, exponent), ...); the empty tuple is the constant term
+Monomial = Tuple[Tuple[str, int], ...]
+Sum = Dict[Monomial, Fraction]
+
+MAX_POWER = 16   # Larger integer exponents stay opaque instead of being expanded
+MAX_TERMS = 256  # Products that would expand past this stay opaque
+MAX_WORK = 200_000  # Term products and serialized terms per equation
+
+class TooComplex(ValueError):
+    """The equation would take more than MAX_WORK steps to canonicalize"""
+
+class _Budget:
+    """Work left for one canonical_equation call"""
+    def __init__(self, work: int):
+        self.limit = self.work = work
+
+    def spend(self, work: int):
+        self.work -= work
+        if self.work < 0:
+            raise TooComplex(f"Canonical form needs more than {self.limit} steps")
+
+def _constant(value: Fraction) -> Sum:
+    return {(): value} if value else {}
+
+def _factor(name: str, exponent: int = 1) -> Sum:
+    return {((name, exponent),): Fraction(1)}
+
+def _opaque(kind: str, budget: _Budget, *args: Sum) -> Sum:
+    """Opaque factor kind(args...), named by a digest of the canonical arguments"""
+    budget.spend(sum(len(arg) for arg in args))
+    text = ",".join(serialize(arg) for arg in args)
+    return _factor(f"{kind}#{hashlib.blake2b(text.encode(), digest_size=12).hexdigest()}")
+
+def _as_constant(expr: Sum):
+    """The value of a constant sum, else None"""
+    if not expr:
+        return Fraction(0)
+    if len(expr) == 1 and () in expr:
+        return expr[()]
+    return None
+
+def _add(a: Sum, b: Sum, sign: int = 1) -> Sum:
+    result = dict(a)
+    for monomial, coeff in b.items():
+        value = result.get(monomial, 0) + sign * coeff
+        if value:
+            result[monomial] = value
+        else:
+            result.pop(monomial, None)
+    return result
+
+def _mul_monomials(a: Monomial, b: Monomial) -> Monomial:
+    exponents = dict(a)
+    for name, exponent in b:
+        exponents[name] = exponents.get(name, 0) + exponent
+    return tuple(sorted((name, e) for name, e in exponents.items() if e))
+
+def _mul(a: Sum, b: Sum, budget: _Budget) -> Sum:
+    if len(a) * len(b) > MAX_TERMS:
+        a, b = sorted((a, b), key=serialize)
+        return _opaque("mul", budget, a, b)
+    budget.spend(len(a) * len(b))
+    result = {}
+    for ma, ca in a.items():
+        for mb, cb in b.items():
+            monomial = _mul_monomials(ma, mb)
+            value = result.get(monomial, 0) + ca * cb
+            if value:
+                result[monomial] = value
+            else:
+                result.pop(monomial)
+    return result
+
+def _leading(expr: Sum) -> Fraction:
+    return expr[min(expr, key=_order)]
+
+def _scaled(expr: Sum, factor: Fraction) -> Sum:
+    return {monomial: coeff * factor for monomial, coeff in expr.items()}
+
+def _inverse(expr: Sum, budget: _Budget) -> Sum:
+    value = _as_constant(expr)
+    if value:
+        return _constant(1 / value)
+    if value is not None:
+        return _factor("inv(0)")
+    # 1/(k*E) = (1/k) * 1/E, so the opaque part does not depend on k
+    leading = _leading(expr)
+    return _scaled(_opaque("inv", budget, _scaled(expr, 1 / leading)), 1 / leading)
+
+def _power(base: Sum, exponent: Sum, budget: _Budget) -> Sum:
+    value = _as_constant(exponent)
+    if value is not None and value.denominator == 1 and abs(value) <= MAX_POWER:
+        n = int(value)
+        if n < 0:
+            base, n = _inverse(base, budget), -n
+        result = _constant(Fraction(1))
+        for _ in range(n):
+            result = _mul(result, base, budget)
+        return result
+    return _opaque("pow", budget, base, exponent)
+
+def _canonical(node: Node, budget: _Budget) -> Sum:
+    if isinstance(node, Number):
+        return _constant(Fraction(node.text))
+    if isinstance(node, Variable):
+        return _factor(node.name)
+    if isinstance(node, Group):
+        return _canonical(node.expr, budget)
+    if isinstance(node, Call):
+        return _opaque(node.func, budget, _canonical(node.arg, budget))
+    if isinstance(node, Chain):
+        values = [_canonical(operand, budget) for operand in node.operands]
+        if node.operators[0] == '**':
+            result = values[-1]
+            for value in reversed(values[:-1]):
+                result = _power(value, result, budget)
+            return result
+        result = values[0]
+        for op, value in zip(node.operators, values[1:]):
+            if op in '+-':
+                budget.spend(len(value))
+                result = _add(result, value, 1 if op == '+' else -1)
+            else:
+                result = _mul(result, value if op == '*' else _inverse(value, budget), budget)
+        return result
+    if isinstance(node, Missing):
+        raise ValueError("Cannot canonicalize an expression with parse errors")
+    raise TypeError(f"Unknown node type: {type(node).__name__}")
+
+def _order(monomial: Monomial):
+    """Higher total degree first, then by factor names"""
+    return (-sum(e for _, e in monomial), monomial)
+
+def serialize(expr: Sum) -> str:
+    """Deterministic text for a sum, e.g. '1*x^2 + -4'"""
+    if not expr:
+        return "0"
+    terms = []
+    for monomial in sorted(expr, key=_order):
+        factors = [name if e == 1 else f"{name}^{e}" for name, e in monomial]
+        terms.append("*".join([str(expr[monomial])] + factors))
+    return " + ".join(terms)
+
+def _to_node(func: Union[str, Node]) -> Node:
+    if isinstance(func, Node):
+        return func
+    from parser.parser import Parser
+    # Also accepts Parser output, which spells '^' as '**'
+    node, errors = Parser().parse_ast(func.replace("**", "^"))
+    if errors:
+        raise ValueError("; ".join(errors))
+    return node
+
+def canonical_equation(func1: Union[str, Node], func2: Union[str, Node]) -> str:
+    """
+    Canonical text of f1 = f2, identical for equivalent equations
+
+    Raises:
+        ValueError: If either side does not parse
+        TooComplex: If expanding would take more than MAX_WORK steps
+    """
+    budget = _Budget(MAX_WORK)
+    difference = _add(_canonical(_to_node(func1), budget), _canonical(_to_node(func2), budget), -1)
+    if difference:
+        difference = _scaled(difference, 1 / _leading(difference))
+    return serialize(difference) + " = 0"
+
+def equation_hash(func1: Union[str, Node], func2: Union[str, Node]) -> str:
+    """Stable structural hash of f1 = f2 (hex SHA-256 of the canonical form)"""
+    return hashlib.sha256(canonical_equation(func1, func2).encode()).hexdigest()
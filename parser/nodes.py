@@ -0,0 +1,181 @@
+import operator
+from typing import Callable, Dict, List
+import numpy as np
+
+_BINARY = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '/': operator.truediv,
+    '**': operator.pow,
+}
+
+# Vectorized counterparts of the functions the parser can emit, for evaluate()
+NUMPY_FUNCTIONS = {
+    'sqrt': np.sqrt,
+    'log10': np.log10,
+    'sin': np.sin,
+    'cos': np.cos,
+    'tan': np.tan,
+}
+
+class Node:
+    """Base class of the compact AST produced by Parser.parse_ast"""
+    __slots__ = ()
+
+    def to_source(self) -> str:
+        """Python/SymPy source text, identical to Parser.parse output"""
+        raise NotImplementedError
+
+    def to_sympy(self, symbol, functions: Dict[str, Callable]):
+        """Build the SymPy expression directly, without sympify"""
+        raise NotImplementedError
+
+    def evaluate(self, x, functions: Dict[str, Callable]):
+        """Evaluate with NumPy over an array of x values"""
+        raise NotImplementedError
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_source()!r})"
+
+    def __eq__(self, other) -> bool:
+        return type(self) is type(other) and self.to_source() == other.to_source()
+
+    def __hash__(self) -> int:
+        return hash((type(self).__name__, self.to_source()))
+
+class Number(Node):
+    __slots__ = ('text',)
+
+    def __init__(self, text: str):
+        self.text = text
+
+    def to_source(self) -> str:
+        return self.text
+
+    def to_sympy(self, symbol, functions):
+        import sympy as sp
+        return sp.Float(self.text) if '.' in self.text else sp.Integer(self.text)
+
+    def evaluate(self, x, functions):
+        return float(self.text)
+
+class Variable(Node):
+    __slots__ = ('name',)
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def to_source(self) -> str:
+        return self.name
+
+    # Parameters (any name but x) are looked up alongside the functions
+    def to_sympy(self, symbol, functions):
+        return symbol if self.name == 'x' else self._parameter(functions)
+
+    def evaluate(self, x, functions):
+        return x if self.name == 'x' else self._parameter(functions)
+
+    def _parameter(self, functions):
+        try:
+            return functions[self.name]
+        except KeyError:
+            raise ValueError(f"Parameter '{self.name}' has no value here; "
+                             f"solve it with solve_sweep.") from None
+
+class Group(Node):
+    """Parenthesized expression, kept so the source text round-trips"""
+    __slots__ = ('expr',)
+
+    def __init__(self, expr: Node):
+        self.expr = expr
+
+    def to_source(self) -> str:
+        return f"({self.expr.to_source()})"
+
+    def to_sympy(self, symbol, functions):
+        return self.expr.to_sympy(symbol, functions)
+
+    def evaluate(self, x, functions):
+        return self.expr.evaluate(x, functions)
+
+class Call(Node):
+    __slots__ = ('func', 'arg')
+
+    def __init__(self, func: str, arg: Node):
+        self.func = func
+        self.arg = arg
+
+    def to_source(self) -> str:
+        return f"{self.func}({self.arg.to_source()})"
+
+    def to_sympy(self, symbol, functions):
+        return functions[self.func](self.arg.to_sympy(symbol, functions))
+
+    def evaluate(self, x, functions):
+        return functions[self.func](self.arg.evaluate(x, functions))
+
+class Chain(Node):
+    """
+    Flat run of operators of one precedence level: a op b op c ...
+
+    Keeping runs flat (rather than one binary node per operator) keeps
+    long sums shallow. '+'/'-' and '*'/'/' chains fold left; '**' chains
+    fold right, as Python and SymPy read the emitted source.
+    """
+    __slots__ = ('operands', 'operators')
+
+    def __init__(self, operands: List[Node], operators: List[str]):
+        self.operands = operands
+        self.operators = operators
+
+    def to_source(self) -> str:
+        parts = [self.operands[0].to_source()]
+        for op, operand in zip(self.operators, self.operands[1:]):
+            parts.append(op)
+            parts.append(operand.to_source())
+        return "".join(parts)
+
+    def to_sympy(self, symbol, functions):
+        import sympy as sp
+        values = [operand.to_sympy(symbol, functions) for operand in self.operands]
+        if self.operators[0] == '**':
+            result = values[-1]
+            for value in reversed(values[:-1]):
+                result = value ** result
+            return result
+        # One n-ary Add/Mul instead of n nested binary operations
+        if self.operators[0] in '+-':
+            return sp.Add(values[0], *[
+                -value if op == '-' else value
+                for op, value in zip(self.operators, values[1:])
+            ])
+        return sp.Mul(values[0], *[
+            1 / value if op == '/' else value
+            for op, value in zip(self.operators, values[1:])
+        ])
+
+    def evaluate(self, x, functions):
+        values = [operand.evaluate(x, functions) for operand in self.operands]
+        if self.operators[0] == '**':
+            result = values[-1]
+            for value in reversed(values[:-1]):
+                result = value ** result
+            return result
+        result = values[0]
+        for op, value in zip(self.operators, values[1:]):
+            result = _BINARY[op](result, value)
+        return result
+
+class Missing(Node):
+    """Placeholder left by error recovery for an unparseable token"""
+    __slots__ = ()
+
+    def to_source(self) -> str:
+        return ""
+
+    def to_sympy(self, symbol, functions):
+        raise ValueError("Cannot convert an expression with parse errors")
+
+    def evaluate(self, x, functions):
+        raise ValueError("Cannot evaluate an expression with parse errors")
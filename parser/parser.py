@@ -1,8 +1,27 @@
+import keyword
 import re
-from typing import List, Tuple
+from typing import Iterable, List, Optional, Tuple
+from cache.cache import ExpressionCache, expression_cache
+from parser.nodes import Call, Chain, Group, Missing, Node, Number, Variable
+
+# Compiled once at import instead of on every parse
+VALID_CHARACTERS = re.compile(r"^[0-9a-zA-Z\s\.\*\-\+\^\/\(\)]+$")
+TOKEN_PATTERN = re.compile(r"\s*(\d+\.\d+|\d+|\w+|\*\*|\^|[()+\-*/])\s*")
+FUNCTIONS = frozenset({"sqrt", "log10"})
+
+def check_parameter(name: str, reserved: Iterable[str] = ()) -> str:
+    """name if it can be a parameter: an identifier other than x, keywords and function names"""
+    if (not isinstance(name, str) or not name.isidentifier() or keyword.iskeyword(name)
+            or name == "x" or name in FUNCTIONS or name in reserved):
+        raise ValueError(f"Invalid parameter name: '{name}'.")
+    return name
 
 class Parser:
-    def __init__(self):
+    def __init__(self, cache: ExpressionCache = expression_cache, parameters: Iterable[str] = ()):
+        self.cache = cache
+        # Names accepted as variables besides x, e.g. ("a",) for the
+        # families f(x; a) solved by EquationSolver.solve_sweep
+        self.parameters = frozenset(check_parameter(name) for name in parameters)
         self.tokens = []  # Tokens from the input expression
         self.errors = []  # List of errors encountered during parsing
         self.current_token = None
@@ -13,7 +32,7 @@ class Parser:
         if not expression:
             self.errors.append("Empty expression.")
             return False
-        if not re.match(r"^[0-9a-zA-Z\s\.\*\-\+\^\/\(\)]+$", expression):
+        if not VALID_CHARACTERS.match(expression):
             # special characters not allowed
             self.errors.append("Invalid characters in expression.")
             return False
@@ -21,19 +40,24 @@ class Parser:
 
     def tokenize(self, expression: str) -> List[str]:
         """Tokenizes the input expression."""
-        token_pattern = re.compile(r"\s*(\d+\.\d+|\d+|\w+|\*\*|\^|[()+\-*/])\s*")
-        tokens = token_pattern.findall(expression)
-        return tokens
+        return TOKEN_PATTERN.findall(expression)
 
     def parse(self, expression: str) -> Tuple[str, List[str]]:
         """Parses the given mathematical expression."""
+        node, errors = self.parse_ast(expression)
+        return ("" if node is None else node.to_source()), errors
+
+    def parse_ast(self, expression: str) -> Tuple[Optional[Node], List[str]]:
+        """Parses the given expression into an AST (None on fatal errors)."""
         expression = expression.replace(" ", "")
         self.errors = []
         # basic initial validation
         self.basic_validation(expression)
         if self.errors:
-            return "", self.errors
-        self.tokens = self.tokenize(expression)
+            return None, self.errors
+        self.tokens = self.cache.get(
+            expression, 'tokens', lambda: tuple(self.tokenize(expression))
+        )
         self.pos = 0
         self.current_token = self.tokens[self.pos] if self.tokens else None
 
@@ -41,11 +65,11 @@ class Parser:
             result = self.expression()
             if self.current_token is not None:
                 self.errors.append("Unexpected token at the end.")
-                return "", self.errors
+                return None, self.errors
             return result, self.errors
         except SyntaxError as e:
             self.errors.append(str(e))
-            return "", self.errors
+            return None, self.errors
 
     def advance(self):
         """Advances to the next token."""
@@ -59,64 +83,68 @@ class Parser:
         else:
             raise SyntaxError(f"Expected '{expected_token}' but got '{self.current_token}'.")
 
-    def expression(self) -> str:
+    def expression(self) -> Node:
         """Parses an expression."""
-        term_value = self.term()
-        while self.current_token in {"+", "-"}:
-            operator = self.current_token
-            self.advance()
-            right_term = self.term()
-            term_value += operator + right_term
-        return term_value
+        return self._chain(self.term, {"+", "-"})
 
-    def term(self) -> str:
+    def term(self) -> Node:
         """Parses a term."""
-        factor_value = self.factor()
-        while self.current_token in {"*", "/"}:
-            operator = self.current_token
-            self.advance()
-            right_factor = self.factor()
-            factor_value += operator + right_factor
-        return factor_value
+        return self._chain(self.factor, {"*", "/"})
 
-    def factor(self) -> str:
+    def factor(self) -> Node:
         """Parses a factor."""
         base_value = self.base()
+        if self.current_token != "^":
+            return base_value
+        operands = [base_value]
         while self.current_token == "^":
             self.advance()
-            exponent = self.base()
-            #base_value = f"pow({base_value}, {exponent})"
-            base_value = f"{base_value}**{exponent}"
-        return base_value
+            operands.append(self.base())
+        return Chain(operands, ["**"] * (len(operands) - 1))
+
+    def _chain(self, operand, operators: set) -> Node:
+        """Parses operand (op operand)* into one flat Chain node."""
+        first = operand()
+        if self.current_token not in operators:
+            return first
+        operands, ops = [first], []
+        while self.current_token in operators:
+            ops.append(self.current_token)
+            self.advance()
+            operands.append(operand())
+        return Chain(operands, ops)
 
-    def base(self) -> str:
+    def base(self) -> Node:
         """Parses a base."""
+        if self.current_token is None:
+            # e.g. a trailing operator, common while typing in live mode
+            raise SyntaxError("Unexpected end of expression.")
         if self.current_token == "(":
             self.match("(")
             expr = self.expression()
             self.match(")")
-            return f"({expr})"
+            return Group(expr)
         elif self.current_token.isdigit() or self.is_float(self.current_token):
             num = self.current_token
             self.advance()
-            return num
+            return Number(num)
         elif self.current_token.isidentifier():
             identifier = self.current_token
             self.advance()
-            if identifier == "sqrt" or identifier == "log10":
+            if identifier in FUNCTIONS:
                 self.match("(")
                 arg = self.expression()
                 self.match(")")
-                return f"{identifier}({arg})"
-            elif identifier == "x":
-                return identifier
+                return Call(identifier, arg)
+            elif identifier == "x" or identifier in self.parameters:
+                return Variable(identifier)
             else:
                 raise SyntaxError(f"Unsupported function or variable: '{identifier}'.")
         else:
             error_message = f"Unexpected token: '{self.current_token}'."
             self.errors.append(error_message)
             self.advance()
-            return ""
+            return Missing()
         
     def is_float(self, token: str) -> bool:
         """Checks if a token is a valid floating-point number."""
@@ -1,18 +1,38 @@
 import numpy as np
-import math
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from cache.cache import expression_cache
+from parser.nodes import NUMPY_FUNCTIONS, Node
+from plotter.viewport import CurveSamples, break_discontinuities, decimate
+
+# Colours of the curves after Function 1 (blue) and Function 2 (green), cycled
+EXTRA_COLORS = ['orange', 'purple', 'brown', 'magenta', 'olive', 'cyan', 'gray']
 
 class FunctionPlotter:
-    def __init__(self):
+    def __init__(self, cache=expression_cache):
+        # matplotlib and its Qt backend load with the first plotter, not this module
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+        self.cache = cache
         self.fig = Figure(figsize=(6, 4))
         self.canvas = FigureCanvas(self.fig)
         self.ax = self.fig.add_subplot(111)
+        self.num_points = 400  # Uniform samples used to autoscale the y-axis
+        self.samples_per_pixel = 2  # Base density before curvature refinement
+        self.max_points = 1_000_000  # Per-curve sample ceiling
+        # Curves are sampled for the visible x-range and resampled when the
+        # view is panned or zoomed
+        self.x_range = (-10.0, 10.0)
+        self.functions = []  # Plotted function strings or ASTs, one per line
+        self.curves = []  # CurveSamples per function
+        self._updating = False
+        # Everything but the curves and markers is static, so it is cached as
+        # a pixel background after each full draw and replots only blit the
+        # animated artists over it
+        self._background = None
+        self.canvas.mpl_connect('draw_event', self._on_draw)
         self._init_plot()
-        
+
     def _init_plot(self):
-        """Initialize plot without creating extra Line2D objects"""
-        self.ax.clear()
+        """Set up the axes and the persistent artists that plot() updates"""
         self.ax.set_title("Function Plot")
         self.ax.set_xlabel("x")
         self.ax.set_ylabel("y")
@@ -24,63 +44,209 @@ class FunctionPlotter:
         self.ax.spines['right'].set_color('none')
         self.ax.spines['top'].set_color('none')
 
+        self.line1, = self.ax.plot([], [], label='Function 1', color='blue', animated=True)
+        self.line2, = self.ax.plot([], [], label='Function 2', color='green', animated=True)
+        self.lines = [self.line1, self.line2]  # One per function, at least two
+        self.markers = None  # Scatter of solutions, only while there are any
+        self.annotations = []
+        self.ax.legend()
+        # plot() sets the limits; artists must not autoscale them
+        self.ax.set_autoscale_on(False)
+        self.ax.set_xlim(*self.x_range)
+        self.ax.callbacks.connect('xlim_changed', self._on_view_changed)
+        self.ax.callbacks.connect('ylim_changed', self._on_view_changed)
+
+    def _animated_artists(self):
+        artists = list(self.lines)
+        if self.markers is not None:
+            artists.append(self.markers)
+        return artists + self.annotations
+
+    def _on_draw(self, event):
+        """After a full draw, cache the static background and draw the curves on it"""
+        self._background = self.canvas.copy_from_bbox(self.fig.bbox)
+        for artist in self._animated_artists():
+            self.ax.draw_artist(artist)
+
+    def _redraw(self, full):
+        """Full draw when the background changed (limits, size), blit otherwise"""
+        if full or self._background is None:
+            self.canvas.draw()
+            return
+        self.canvas.restore_region(self._background)
+        for artist in self._animated_artists():
+            self.ax.draw_artist(artist)
+        self.canvas.blit(self.fig.bbox)
+
+    def _compile(self, func_str):
+        """Compile a parsed function string once, reusing the code object"""
+        return self.cache.get(
+            func_str, 'code', lambda: compile(func_str, '<function>', 'eval')
+        )
+
     def _safe_eval(self, func_str, x_values):
-        """Return NaN for invalid evaluations"""
-        y = np.full_like(x_values, np.nan, dtype=float)
-        for i, x in enumerate(x_values):
-            try:
-                y[i] = eval(func_str, {"__builtins__": None}, {
-                    'x': x,
-                    'sqrt': math.sqrt,
-                    'log10': math.log10,
-                    'sin': math.sin,
-                    'cos': math.cos,
-                    'tan': math.tan
-                })
-            except:
-                pass
+        """Evaluate a function string or AST over the whole array, NaN where undefined"""
+        x_values = np.asarray(x_values, dtype=float)
+        try:
+            with np.errstate(all='ignore'):
+                if isinstance(func_str, Node):
+                    y = func_str.evaluate(x_values, NUMPY_FUNCTIONS)
+                else:
+                    code = self._compile(func_str)
+                    y = eval(code, {"__builtins__": {}}, {**NUMPY_FUNCTIONS, 'x': x_values})
+                y = np.broadcast_to(np.asarray(y, dtype=float), x_values.shape).copy()
+        except Exception:
+            return np.full_like(x_values, np.nan, dtype=float)
+        # Domain errors (sqrt/log10 of negatives, division by zero, overflow)
+        # come back from numpy as nan/inf instead of raising
+        y[~np.isfinite(y)] = np.nan
         return y
 
-    def plot(self, func1_str, func2_str, solutions=[]):
-        """Plot with proper error handling and solution markers"""
-        self._init_plot()
-        x = np.linspace(-10, 10, 400)
-        
-        # Plot functions
-        y1 = self._safe_eval(func_str=func1_str, x_values=x)
-        y2 = self._safe_eval(func_str=func2_str, x_values=x)
-        self.ax.plot(x, y1, label='Function 1', color='blue')
-        self.ax.plot(x, y2, label='Function 2', color='green')
-
-        # Plot solutions as scatter points
-        if solutions:
-            sol_x = []
-            sol_y = []
-            for s in solutions:
-                try:
-                    y_val = self._safe_eval(func1_str, np.array([s]))[0]
-                    if not np.isnan(y_val):
-                        sol_x.append(s)
-                        sol_y.append(y_val)
-                except:
-                    continue
-            if sol_x:
-                self.ax.scatter(sol_x, sol_y, color='red', s=60, zorder=5)
-                for x_val, y_val in zip(sol_x, sol_y):
-                    self.ax.annotate(
-                        f"({x_val:.2f}, {y_val:.2f})",
-                        (x_val, y_val),
-                        textcoords="offset points",
-                        xytext=(10, -10),
-                        ha='center'
-                    )
-
-        # Set dynamic axis limits
-        y_combined = np.concatenate([y1[~np.isnan(y1)], y2[~np.isnan(y2)]])
-        if len(y_combined) > 0:
-            y_pad = 0.1 * (np.nanmax(y_combined) - np.nanmin(y_combined))
-            self.ax.set_ylim(np.nanmin(y_combined) - y_pad, 
-                            np.nanmax(y_combined) + y_pad)
-        
+    def _pixel_width(self):
+        return max(int(self.ax.bbox.width), 1)
+
+    def sample_step(self):
+        """Nominal sample spacing for the current view and canvas size"""
+        lo, hi = self.x_range
+        return (hi - lo) / (self._pixel_width() * self.samples_per_pixel)
+
+    def view(self):
+        """(x_range, sample_step()) of the current view; read on the UI thread"""
+        return self.x_range, self.sample_step()
+
+    def sample_curve(self, func_str, samples=None, view=None):
+        """
+        Sample one curve over the visible x-range
+
+        samples: CurveSamples of the same function to extend in place
+        view: (x_range, step) from view(). Without it the axes and x_range
+            are read, which is only safe on the UI thread; with it nothing
+            of the plotter's view state is touched.
+        """
+        x_range, step = view if view is not None else self.view()
+        samples = samples if samples is not None else CurveSamples()
+        samples.update(lambda x: self._safe_eval(func_str, x),
+                       x_range, step, self.max_points)
+        return samples
+
+    def sample(self, *func_strs, view=None):
+        """Sample each curve; safe off the UI thread when given a view() taken on it"""
+        return [self.sample_curve(func_str, view=view) for func_str in func_strs]
+
+    def _set_line_count(self, count):
+        """Add or remove lines past the first two to match count; True if any changed"""
+        count = max(count, 2)
+        if count == len(self.lines):
+            return False
+        while len(self.lines) > count:
+            self.lines.pop().remove()
+        while len(self.lines) < count:
+            color = EXTRA_COLORS[(len(self.lines) - 2) % len(EXTRA_COLORS)]
+            line, = self.ax.plot([], [], label=f'Function {len(self.lines) + 1}',
+                                 color=color, animated=True)
+            self.lines.append(line)
         self.ax.legend()
-        self.canvas.draw()
\ No newline at end of file
+        return True
+
+    def _render_curves(self):
+        """Hand the lines pole-broken, per-pixel decimated copies of the samples"""
+        y_lo, y_hi = self.ax.get_ylim()
+        for line, func_str, samples in zip(self.lines, self.functions, self.curves):
+            x, y = break_discontinuities(
+                lambda t: self._safe_eval(func_str, t), samples.x, samples.y, abs(y_hi - y_lo)
+            )
+            line.set_data(*decimate(x, y, self.x_range, self._pixel_width()))
+        for line in self.lines[len(self.functions):]:
+            line.set_data([], [])
+
+    def _on_view_changed(self, ax):
+        """Pan/zoom: evaluate only what the new view needs, then redraw"""
+        if self._updating or not self.functions:
+            return
+        self.x_range = tuple(ax.get_xlim())
+        for func_str, samples in zip(self.functions, self.curves):
+            self.sample_curve(func_str, samples)
+        self._render_curves()
+        self.canvas.draw_idle()
+
+    def plot(self, func1_str, func2_str, solutions=[], curves=None):
+        """Plot with proper error handling and solution markers
+        
+        curves: CurveSamples pair from sample(), when already computed elsewhere
+        """
+        # Marked on Function 1
+        self.plot_curves([func1_str, func2_str], self.points_on(func1_str, solutions), curves)
+
+    def points_on(self, func_str, x_values):
+        """(x, y) rows on a curve, dropping x where it is undefined; no matplotlib state"""
+        x_values = np.asarray(x_values, dtype=float).ravel()
+        points = np.column_stack([x_values, self._safe_eval(func_str, x_values)])
+        return points[~np.isnan(points[:, 1])]
+
+    def plot_curves(self, func_strs, points=(), curves=None):
+        """Plot any number of functions, with markers at the given (x, y) points
+
+        curves: CurveSamples per function from sample(), when already computed elsewhere
+        """
+        lines_changed = self._set_line_count(len(func_strs))
+        self.functions = list(func_strs)
+        if curves is None:
+            curves = self.sample(*self.functions)
+        else:
+            # Sampled for an earlier view, perhaps; extend to the current one
+            curves = [self.sample_curve(f, c) for f, c in zip(self.functions, curves)]
+        self.curves = list(curves)
+
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        self._update_markers(points[~np.isnan(points).any(axis=1)])
+
+        # Set dynamic axis limits; changing them invalidates the background.
+        # Autoscale from a uniform grid: adaptive samples crowd around poles
+        xlim, ylim = self.ax.get_xlim(), self.ax.get_ylim()
+        grid = np.linspace(*self.x_range, self.num_points)
+        y_combined = np.concatenate([self._safe_eval(f, grid) for f in self.functions] or [grid[:0]])
+        y_combined = y_combined[~np.isnan(y_combined)]
+        self._updating = True
+        try:
+            self.ax.set_xlim(*self.x_range)
+            if len(y_combined) > 0:
+                y_pad = 0.1 * (np.nanmax(y_combined) - np.nanmin(y_combined))
+                self.ax.set_ylim(np.nanmin(y_combined) - y_pad, 
+                                np.nanmax(y_combined) + y_pad)
+        finally:
+            self._updating = False
+        self._render_curves()
+        # New or removed lines change the legend, part of the background
+        limits_changed = xlim != self.ax.get_xlim() or ylim != self.ax.get_ylim()
+        self._redraw(full=limits_changed or lines_changed)
+
+    def _update_markers(self, points):
+        """Move the solution scatter and annotations, reusing existing artists"""
+        if not len(points):
+            if self.markers is not None:
+                self.markers.remove()
+                self.markers = None
+        elif self.markers is None:
+            self.markers = self.ax.scatter(
+                points[:, 0], points[:, 1], color='red', s=60, zorder=5, animated=True
+            )
+        else:
+            self.markers.set_offsets(points)
+
+        while len(self.annotations) > len(points):
+            self.annotations.pop().remove()
+        for i, (x_val, y_val) in enumerate(points):
+            label = f"({x_val:.2f}, {y_val:.2f})"
+            if i < len(self.annotations):
+                annotation = self.annotations[i]
+                annotation.set_text(label)
+                annotation.xy = (x_val, y_val)
+            else:
+                self.annotations.append(self.ax.annotate(
+                    label,
+                    (x_val, y_val),
+                    textcoords="offset points",
+                    xytext=(10, -10),
+                    ha='center',
+                    animated=True
+                ))
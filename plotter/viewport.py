@@ -0,0 +1,125 @@
+import numpy as np
+from typing import Callable, Tuple
+from solver.sampling import adaptive_sample
+
+class CurveSamples:
+    """
+    Samples of one curve, grown as the view pans instead of re-evaluated
+
+    step is the coarsest nominal sample spacing held, so a zoom-in that
+    needs finer samples resamples the view while pans and zoom-outs only
+    evaluate the newly exposed x-intervals.
+    """
+    __slots__ = ('x', 'y', 'step')
+
+    def __init__(self):
+        self.x = np.empty(0)
+        self.y = np.empty(0)
+        self.step = np.inf
+
+    def covers(self, x_range: Tuple[float, float], step: float) -> bool:
+        return bool(len(self.x)) and self.x[0] <= x_range[0] and self.x[-1] >= x_range[1] \
+            and self.step <= 1.5 * step
+
+    def update(self,
+               f: Callable,
+               x_range: Tuple[float, float],
+               step: float,
+               max_points: int = 1_000_000) -> bool:
+        """
+        Make the samples cover x_range at (at least) the given spacing
+
+        Returns:
+            Whether anything was evaluated
+        """
+        lo, hi = x_range
+        if self.covers(x_range, step):
+            return False
+        if not len(self.x) or self.step > 1.5 * step or hi <= self.x[0] or lo >= self.x[-1] \
+                or len(self.x) > max_points:
+            self.x, self.y = _sample(f, lo, hi, step, max_points)
+            self.step = step
+            return True
+
+        xs, ys = [self.x], [self.y]
+        if lo < self.x[0]:
+            x, y = _sample(f, lo, self.x[0], step, max_points)
+            xs.insert(0, x[:-1])
+            ys.insert(0, y[:-1])
+        if hi > self.x[-1]:
+            x, y = _sample(f, self.x[-1], hi, step, max_points)
+            xs.append(x[1:])
+            ys.append(y[1:])
+        x, y = np.concatenate(xs), np.concatenate(ys)
+        # Keep a margin of one view width around the view, not the whole pan history
+        margin = hi - lo
+        keep = (x >= lo - margin) & (x <= hi + margin)
+        self.x, self.y = x[keep], y[keep]
+        self.step = max(self.step, step)
+        return True
+
+def _sample(f: Callable, lo: float, hi: float, step: float, max_points: int):
+    initial_points = int(np.ceil((hi - lo) / step)) + 1
+    return adaptive_sample(f, (lo, hi), initial_points,
+                           max_points=min(16 * initial_points, max_points))
+
+def break_discontinuities(f: Callable,
+                          x: np.ndarray,
+                          y: np.ndarray,
+                          jump: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Insert NaN between samples straddling a pole so the line is not joined
+
+    A step is a pole when y jumps by more than `jump` (the visible y-span)
+    and f at the midpoint is undefined or outside the two endpoint values;
+    steep but continuous curves pass through the midpoint and stay joined.
+    """
+    with np.errstate(invalid='ignore'):
+        candidates = np.flatnonzero(np.abs(np.diff(y)) > jump)
+    if not candidates.size:
+        return x, y
+    ya, yb = y[candidates], y[candidates + 1]
+    mids = 0.5 * (x[candidates] + x[candidates + 1])
+    with np.errstate(all='ignore'):
+        ym = np.asarray(f(mids), dtype=float)
+    poles = ~np.isfinite(ym) | (ym < np.minimum(ya, yb)) | (ym > np.maximum(ya, yb))
+    at = candidates[poles] + 1
+    return np.insert(x, at, mids[poles]), np.insert(y, at, np.nan)
+
+def decimate(x: np.ndarray,
+             y: np.ndarray,
+             x_range: Tuple[float, float],
+             pixels: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Reduce samples to first/min/max/last per pixel column
+
+    The drawn polyline is the same at screen resolution, but at most four
+    points per column (plus NaN gaps, which are kept) reach matplotlib.
+    Samples outside x_range collapse into one column on each side.
+    """
+    pixels = max(int(pixels), 1)
+    if len(x) <= 4 * pixels:
+        return x, y
+    lo, hi = x_range
+    finite = ~np.isnan(y)
+    run = np.cumsum(~finite)  # Finite runs, separated by NaN gaps
+    column = np.clip(np.floor((x - lo) / (hi - lo) * pixels), -1, pixels)
+    x, y, run, column = x[finite], y[finite], run[finite], column[finite]
+    if not len(x):
+        return x, y
+
+    start = np.flatnonzero(np.r_[True, (run[1:] != run[:-1]) | (column[1:] != column[:-1])])
+    end = np.r_[start[1:], len(x)] - 1
+    x_first, x_last = x[start], x[end]
+    x_mid = 0.5 * (x_first + x_last)
+    out_x = np.column_stack([x_first, x_mid, x_mid, x_last, x_last])
+    out_y = np.column_stack([
+        y[start],
+        np.minimum.reduceat(y, start),
+        np.maximum.reduceat(y, start),
+        y[end],
+        np.full(len(start), np.nan),
+    ])
+    keep = np.ones(out_x.shape, dtype=bool)
+    keep[:, 4] = np.r_[run[start][1:] != run[start][:-1], False]
+    return out_x[keep], out_y[keep]
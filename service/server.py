@@ -0,0 +1,286 @@
+"""
+Local JSON-over-HTTP solve service
+
+Endpoints (JSON request and response bodies):
+    POST /parse   {"expression": "x^2"}
+                  -> {"source": "x**2", "errors": []}
+    POST /solve   {"f1": "x^2", "f2": "4", "x_range": [-10, 10]}
+                  -> {"roots": [-2.0, 2.0], "cached": false}
+    POST /sample  {"f": "sqrt(x)", "x_range": [0, 4], "points": 5}
+                  -> {"x": [...], "y": [...]}  (null where undefined)
+    GET  /stats   -> counters for the pool, coalescing and result cache
+
+Solves run on a bounded process pool. Identical solves already in flight
+share one job, finished results are kept in a TTL/LRU cache, and once
+max_pending distinct jobs are queued new ones get 429 + Retry-After.
+
+Usage: python -m service.server [--host H] [--port P] [--workers N]
+"""
+import argparse
+import asyncio
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from cache.cache import ResultCache
+from parser.nodes import NUMPY_FUNCTIONS, Node
+from parser.parser import Parser
+from solver.batch import problem_key
+
+MAX_BODY = 1 << 20  # Bytes
+MAX_SAMPLE_POINTS = 100_000
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 422: "Unprocessable Entity",
+           429: "Too Many Requests", 500: "Internal Server Error",
+           503: "Service Unavailable"}
+
+_solver = None  # Per pool process
+
+def _init_worker(settings: Dict[str, object]):
+    from solver.solver import EquationSolver
+    global _solver
+    _solver = EquationSolver()
+    for name, value in settings.items():
+        setattr(_solver, name, value)
+    _solver.warm_up()
+
+def _solve_job(func1_str: str, func2_str: str, x_range: Tuple[float, float]) -> List[float]:
+    return [float(root) for root in _solver.solve(func1_str, func2_str, x_range)]
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str, headers: Optional[Dict[str, str]] = None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+class SolveService:
+    """Request handling and shared state; one instance per server"""
+
+    def __init__(self,
+                 workers: Optional[int] = None,
+                 max_pending: int = 64,
+                 cache_size: int = 4096,
+                 cache_ttl: Optional[float] = 300.0,
+                 symbolic_timeout: Optional[float] = 10.0,
+                 disk_cache: Optional[str] = None,
+                 trace: Optional[str] = None):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending  # Distinct solves queued or running
+        self.settings = {'symbolic_timeout': symbolic_timeout}
+        if disk_cache:
+            from cache.disk import DiskCache
+            self.settings['disk_cache'] = DiskCache(disk_cache)
+        if trace:
+            from solver.tracing import JsonlSink, Tracer
+            self.settings['tracer'] = Tracer(JsonlSink(trace))
+        self.results = ResultCache(max_size=cache_size, ttl=cache_ttl)
+        self.parser = Parser()
+        self.in_flight = {}  # problem key -> asyncio.Task producing the roots
+        self.counters = {'requests': 0, 'jobs': 0, 'coalesced': 0, 'rejected': 0}
+        self.pool = self._new_pool()
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(self.workers, initializer=_init_worker,
+                                   initargs=(self.settings,))
+
+    def close(self):
+        self.pool.shutdown(wait=True, cancel_futures=True)
+
+    def _parse(self, text) -> Node:
+        if not isinstance(text, str):
+            raise HTTPError(400, "Expected an expression string")
+        node, errors = self.parser.parse_ast(text)
+        if errors:
+            raise HTTPError(422, "; ".join(errors))
+        return node
+
+    @staticmethod
+    def _x_range(body: dict) -> Tuple[float, float]:
+        try:
+            low, high = body.get("x_range", (-10, 10))
+            low, high = float(low), float(high)
+        except (TypeError, ValueError):
+            raise HTTPError(400, "x_range must be [min, max]") from None
+        if not low < high:
+            raise HTTPError(400, "x_range must be [min, max] with min < max")
+        return low, high
+
+    def parse(self, body: dict) -> dict:
+        text = body.get("expression", "")
+        if not isinstance(text, str):
+            raise HTTPError(400, "Expected an expression string")
+        node, errors = self.parser.parse_ast(text)
+        return {"source": None if node is None or errors else node.to_source(),
+                "errors": list(errors)}
+
+    async def solve(self, body: dict) -> dict:
+        problem = (self._parse(body.get("f1")).to_source(),
+                   self._parse(body.get("f2")).to_source(),
+                   self._x_range(body))
+        key = problem_key(problem)
+        roots = self.results.get(key)
+        if roots is not None:
+            return {"roots": roots, "cached": True}
+
+        job = self.in_flight.get(key)
+        if job is not None:
+            self.counters['coalesced'] += 1
+        elif len(self.in_flight) >= self.max_pending:
+            self.counters['rejected'] += 1
+            raise HTTPError(429, "Too many pending solves", {"Retry-After": "1"})
+        else:
+            self.counters['jobs'] += 1
+            job = self.in_flight[key] = asyncio.ensure_future(self._run(key, problem))
+            # Retrieve the outcome even if every requester has disconnected
+            job.add_done_callback(lambda done: done.cancelled() or done.exception())
+        # A requester going away must not cancel the job others wait on
+        return {"roots": await asyncio.shield(job), "cached": False}
+
+    async def _run(self, key: tuple, problem: tuple) -> List[float]:
+        pool = self.pool
+        try:
+            roots = await asyncio.get_running_loop().run_in_executor(pool, _solve_job, *problem)
+        except BrokenProcessPool:
+            if self.pool is pool:
+                self.pool = self._new_pool()
+                pool.shutdown(wait=False)
+            raise HTTPError(503, "Solver process died") from None
+        except Exception as e:
+            raise HTTPError(422, f"{type(e).__name__}: {e}") from None
+        finally:
+            del self.in_flight[key]
+        self.results.put(key, roots)
+        return roots
+
+    def sample(self, body: dict) -> dict:
+        node = self._parse(body.get("f"))
+        low, high = self._x_range(body)
+        points = body.get("points", 200)
+        if not isinstance(points, int) or not 2 <= points <= MAX_SAMPLE_POINTS:
+            raise HTTPError(400, f"points must be an integer in [2, {MAX_SAMPLE_POINTS}]")
+        x = np.linspace(low, high, points)
+        try:
+            with np.errstate(all='ignore'):
+                y = np.broadcast_to(np.asarray(node.evaluate(x, NUMPY_FUNCTIONS), dtype=float),
+                                    x.shape)
+        except (ArithmeticError, ValueError):
+            # Constant subexpressions are Python floats, which raise instead
+            # of giving inf/nan (1/0, 2^2^2^2^2): undefined everywhere
+            y = np.full(x.shape, np.nan)
+        return {"x": x.tolist(),
+                "y": [float(v) if np.isfinite(v) else None for v in y]}
+
+    def stats(self) -> dict:
+        return {**self.counters, "in_flight": len(self.in_flight),
+                "workers": self.workers, "cache": self.results.stats()}
+
+    async def dispatch(self, method: str, path: str, body: bytes) -> dict:
+        routes = {"/parse": "POST", "/solve": "POST", "/sample": "POST", "/stats": "GET"}
+        if path not in routes:
+            raise HTTPError(404, f"No such endpoint: {path}")
+        if method != routes[path]:
+            raise HTTPError(405, f"{path} expects {routes[path]}")
+        if path == "/stats":
+            return self.stats()
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError:
+            raise HTTPError(400, "Body is not valid JSON") from None
+        if not isinstance(payload, dict):
+            raise HTTPError(400, "Body must be a JSON object")
+        if path == "/solve":
+            return await self.solve(payload)
+        return self.parse(payload) if path == "/parse" else self.sample(payload)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """One HTTP/1.1 connection; requests are served in order, keep-alive"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                try:
+                    method, path, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+
+                self.counters['requests'] += 1
+                extra = {}
+                try:
+                    try:
+                        length = int(headers.get("content-length", 0))
+                    except ValueError:
+                        keep_alive = False
+                        raise HTTPError(400, "Bad Content-Length") from None
+                    if length > MAX_BODY:
+                        keep_alive = False  # Body left unread
+                        raise HTTPError(413, f"Body exceeds {MAX_BODY} bytes")
+                    body = await reader.readexactly(length) if length else b""
+                    status, payload = 200, await self.dispatch(method, path.split("?")[0], body)
+                except HTTPError as e:
+                    status, payload, extra = e.status, {"error": str(e)}, e.headers
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    raise
+                except Exception as e:
+                    status, payload = 500, {"error": f"{type(e).__name__}: {e}"}
+
+                data = json.dumps(payload).encode()
+                head = [f"HTTP/1.1 {status} {REASONS[status]}",
+                        "Content-Type: application/json",
+                        f"Content-Length: {len(data)}",
+                        f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+                head += [f"{name}: {value}" for name, value in extra.items()]
+                writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+async def serve(host: str = "127.0.0.1", port: int = 8000, **options):
+    service = SolveService(**options)
+    server = await asyncio.start_server(service.handle, host, port)
+    address = server.sockets[0].getsockname()
+    print(f"Serving on http://{address[0]}:{address[1]}", flush=True)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Local JSON-over-HTTP solve service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=None, help="Solver processes (default: CPU count)")
+    parser.add_argument("--max-pending", type=int, default=64, help="Distinct solves queued before 429s")
+    parser.add_argument("--cache-size", type=int, default=4096)
+    parser.add_argument("--cache-ttl", type=float, default=300.0, help="Seconds a result stays cached")
+    parser.add_argument("--timeout", type=float, default=10.0, help="Seconds for the symbolic stage")
+    parser.add_argument("--disk-cache", metavar="PATH", default=None,
+                        help="SQLite file shared by the workers, kept across restarts")
+    parser.add_argument("--trace", metavar="PATH", default=None,
+                        help="Append per-stage timings of every solve to a JSONL file")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, workers=args.workers,
+                          max_pending=args.max_pending, cache_size=args.cache_size,
+                          cache_ttl=args.cache_ttl, symbolic_timeout=args.timeout,
+                          disk_cache=args.disk_cache, trace=args.trace))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
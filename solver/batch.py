@@ -0,0 +1,209 @@
+import os
+import time
+import multiprocessing as mp
+from collections import deque
+from multiprocessing.connection import wait
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+from cache.cache import ExpressionCache
+from parser.canonical import canonical_equation
+
+Problem = Tuple[str, str, Tuple[float, float]]
+
+class BatchResult(NamedTuple):
+    index: int                # Position of the problem in the input stream
+    problem: Problem
+    solutions: List[float]
+    error: Optional[str]      # "ExceptionType: message", or None on success
+
+def problem_key(problem: Problem) -> tuple:
+    """
+    Key under which equivalent problems are deduplicated
+
+    Uses the canonical form of f1 = f2, so x^2 = 4 and (x-2)*(x+2) = 0
+    share a key; sources the parser rejects fall back to their normalized
+    text.
+    """
+    func1_str, func2_str, x_range = problem
+    x_range = (float(x_range[0]), float(x_range[1]))
+    try:
+        return (canonical_equation(func1_str, func2_str), x_range)
+    except (ValueError, TypeError):
+        return (
+            ExpressionCache.normalize(func1_str),
+            ExpressionCache.normalize(func2_str),
+            x_range,
+        )
+
+def _solve_one(solver, problem: Problem) -> Tuple[List[float], Optional[str]]:
+    """Solve one problem, turning exceptions into an error string"""
+    try:
+        return [float(s) for s in solver.solve(*problem)], None
+    except Exception as e:
+        return [], f"{type(e).__name__}: {e}"
+
+def _worker_main(conn, settings: Dict[str, object]):
+    """Worker process loop: receive chunks, send back one result per problem"""
+    from solver.solver import EquationSolver
+    solver = EquationSolver()
+    for name, value in settings.items():
+        setattr(solver, name, value)
+    while True:
+        chunk = conn.recv()
+        if chunk is None:
+            break
+        for key, problem in chunk:
+            conn.send((key, *_solve_one(solver, problem)))
+
+class _Worker:
+    """One killable worker process and the chunk it is working through"""
+    def __init__(self, ctx, settings: Dict[str, object]):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_worker_main, args=(child_conn, settings), daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.tasks = deque()  # (key, problem) sent but not answered yet
+        self.started = 0.0    # When the current task started
+
+    def assign(self, chunk: List[tuple]):
+        self.conn.send(chunk)
+        self.tasks.extend(chunk)
+        self.started = time.monotonic()
+
+    def kill(self):
+        self.process.terminate()
+        self.process.join()
+        self.conn.close()
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join()
+        self.conn.close()
+
+def solve_many(solver,
+               problems: Iterable[Problem],
+               max_workers: Optional[int] = None,
+               chunksize: int = 16,
+               timeout: Optional[float] = None
+               ) -> Iterator[BatchResult]:
+    """
+    Solve a stream of problems on a pool of worker processes
+
+    Args:
+        solver: EquationSolver whose settings are copied into each worker
+        problems: Iterable of (func1_str, func2_str, x_range) triples
+        max_workers: Worker process count (default: CPU count); 0 solves
+            inline in this process, without timeouts
+        chunksize: Problems sent to a worker per round trip
+        timeout: Per-problem wall-clock limit in seconds; a worker that
+            exceeds it is killed and replaced
+
+    Yields:
+        BatchResult for every input problem, in completion order.
+        Identical problems are solved once and share the result.
+    """
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if max_workers == 0:
+        yield from _solve_inline(solver, problems)
+        return
+
+    ctx = mp.get_context()
+    settings = solver._settings()
+    workers = [_Worker(ctx, settings) for _ in range(max_workers)]
+    lookahead = max_workers * chunksize * 2
+    pending = iter(enumerate(problems))
+    exhausted = False
+    queue = deque()  # Unique (key, problem) tasks not yet dispatched
+    waiting = {}     # key -> [(index, problem)] awaiting that task
+    done = {}        # key -> (solutions, error)
+
+    def resolve(key, solutions, error):
+        done[key] = (solutions, error)
+        for index, problem in waiting.pop(key, []):
+            yield BatchResult(index, problem, solutions, error)
+
+    try:
+        while True:
+            # Read ahead, deduplicating against finished and in-flight work
+            while not exhausted and len(queue) < lookahead:
+                try:
+                    index, (func1_str, func2_str, x_range) = next(pending)
+                except StopIteration:
+                    exhausted = True
+                    break
+                problem = (func1_str, func2_str, tuple(x_range))
+                key = problem_key(problem)
+                if key in done:
+                    yield BatchResult(index, problem, *done[key])
+                elif key in waiting:
+                    waiting[key].append((index, problem))
+                else:
+                    waiting[key] = [(index, problem)]
+                    queue.append((key, problem))
+
+            for worker in workers:
+                if queue and not worker.tasks:
+                    size = min(chunksize, len(queue))
+                    worker.assign([queue.popleft() for _ in range(size)])
+
+            busy = [worker for worker in workers if worker.tasks]
+            if not busy:
+                if exhausted and not queue:
+                    break
+                continue
+
+            wait_for = None
+            if timeout is not None:
+                deadline = min(worker.started for worker in busy) + timeout
+                wait_for = max(0.0, deadline - time.monotonic())
+            ready = wait([worker.conn for worker in busy], wait_for)
+            now = time.monotonic()
+
+            for i, worker in enumerate(workers):
+                if not worker.tasks:
+                    continue
+                if worker.conn in ready:
+                    try:
+                        key, solutions, error = worker.conn.recv()
+                    except EOFError:
+                        key, _ = worker.tasks[0]
+                        yield from resolve(key, [], "RuntimeError: worker process died")
+                    else:
+                        worker.tasks.popleft()
+                        worker.started = now
+                        yield from resolve(key, solutions, error)
+                        continue
+                elif timeout is None or now - worker.started <= timeout:
+                    continue
+                else:
+                    key, _ = worker.tasks[0]
+                    yield from resolve(
+                        key, [], f"TimeoutError: exceeded {timeout} s"
+                    )
+                # Replace the dead or stalled worker, requeueing its backlog
+                worker.tasks.popleft()
+                queue.extendleft(reversed(worker.tasks))
+                worker.tasks.clear()
+                worker.kill()
+                workers[i] = _Worker(ctx, settings)
+    finally:
+        for worker in workers:
+            worker.stop()
+
+def _solve_inline(solver, problems: Iterable[Problem]) -> Iterator[BatchResult]:
+    """Sequential fallback used when max_workers is 0"""
+    done = {}
+    for index, (func1_str, func2_str, x_range) in enumerate(problems):
+        problem = (func1_str, func2_str, tuple(x_range))
+        key = problem_key(problem)
+        if key not in done:
+            done[key] = _solve_one(solver, problem)
+        yield BatchResult(index, problem, *done[key])
@@ -0,0 +1,186 @@
+"""
+All pairwise intersections of N curves from one shared sampling
+
+Every curve is evaluated once on a common grid, giving an (N, points)
+matrix. Sign changes of the N(N-1)/2 row differences are found with
+array operations, a chunk of pairs at a time to bound memory, and all
+brackets of all pairs are refined together by refine_brackets. During
+refinement each curve's callable is invoked at most once per iteration,
+on just the points where it is needed, so the number of function calls
+grows with N rather than with the number of pairs.
+
+With derivatives, crossings are refined by safeguarded Newton, and as in
+the two-curve solver, sign changes of each pair's derivative difference
+are refined to critical points. Those where the curves meet are the
+points where they touch without crossing (x^2 and 0 at x = 0).
+"""
+from typing import Callable, NamedTuple, Optional, Sequence, Tuple
+import numpy as np
+from solver.refine import NOISE_ULPS, refine_brackets
+from solver.sweep import merge_roots, unexplained
+
+MAX_PAIR_ELEMENTS = 4_000_000  # Differences held at once (32 MB of float64)
+
+class Intersection(NamedTuple):
+    x: float
+    y: float
+    curves: Tuple[int, int]   # Indices (i < j) of the two curves that meet here
+
+class CurveSet:
+    """
+    Vectorized evaluation of curve k at x for mixed arrays of (x, k)
+
+    derivatives: d/dx of each curve, None for curves without one; methods
+        with derivative=True evaluate these instead of the curves
+    """
+
+    def __init__(self,
+                 funcs: Sequence[Callable],
+                 derivatives: Optional[Sequence[Optional[Callable]]] = None):
+        self.funcs = list(funcs)
+        self.derivatives = list(derivatives) if derivatives is not None else [None] * len(self.funcs)
+        self.calls = 0  # Callable invocations, for benchmarks and tests
+
+    def _call(self, k: int, x: np.ndarray, derivative: bool = False) -> np.ndarray:
+        func = self.derivatives[k] if derivative else self.funcs[k]
+        if func is None:
+            return np.full(x.shape, np.nan)
+        self.calls += 1
+        with np.errstate(all='ignore'):
+            y = np.asarray(func(x), dtype=float)
+        return np.broadcast_to(y, x.shape)
+
+    def sample(self, x: np.ndarray, derivative: bool = False) -> np.ndarray:
+        """(N, len(x)) matrix of every curve on a shared grid; NaN where undefined"""
+        y = np.empty((len(self.funcs), len(x)))
+        for k in range(len(self.funcs)):
+            y[k] = self._call(k, x, derivative)
+        y[~np.isfinite(y)] = np.nan
+        return y
+
+    def evaluate(self, x: np.ndarray, k: np.ndarray, derivative: bool = False) -> np.ndarray:
+        """y[m] = curve k[m] at x[m], one call per distinct curve"""
+        y = np.empty(x.shape)
+        order = np.argsort(k, kind='stable')
+        bounds = np.flatnonzero(np.diff(k[order])) + 1
+        for group in np.split(order, bounds):
+            if group.size:
+                y[group] = self._call(int(k[group[0]]), x[group], derivative)
+        return y
+
+    def difference(self,
+                   x: np.ndarray,
+                   i: np.ndarray,
+                   j: np.ndarray,
+                   derivative: bool = False) -> np.ndarray:
+        """Curve i minus curve j at x, with both sides in one evaluate()"""
+        y = self.evaluate(np.concatenate([x, x]), np.concatenate([i, j]), derivative)
+        return y[:len(x)] - y[len(x):]
+
+    def derivative_difference(self, x: np.ndarray, i: np.ndarray, j: np.ndarray) -> np.ndarray:
+        return self.difference(x, i, j, derivative=True)
+
+def _sign_changes(y: np.ndarray,
+                  pair_i: np.ndarray,
+                  pair_j: np.ndarray,
+                  check: Callable[[], None]
+                  ) -> Tuple[np.ndarray, np.ndarray]:
+    """(pair, column) of every sign change of the row differences y[i] - y[j]"""
+    chunk = max(MAX_PAIR_ELEMENTS // y.shape[1], 1)
+    b_pairs, b_cols = [], []
+    for start in range(0, len(pair_i), chunk):
+        check()
+        i, j = pair_i[start:start + chunk], pair_j[start:start + chunk]
+        d = y[i] - y[j]
+        # Sign changes, skipping samples where either curve is undefined
+        change = (np.signbit(d[:, 1:]) != np.signbit(d[:, :-1])) \
+            & ~np.isnan(d[:, 1:]) & ~np.isnan(d[:, :-1])
+        pairs, cols = np.nonzero(change)
+        b_pairs.append(pairs + start)
+        b_cols.append(cols)
+    return np.concatenate(b_pairs), np.concatenate(b_cols)
+
+def intersect_curves(curves: CurveSet,
+                     x_range: Tuple[float, float],
+                     points: int,
+                     atol: float = 1e-6,
+                     rtol: float = 1e-5,
+                     tangency_atol: float = 1e-9,
+                     check: Callable[[], None] = lambda: None
+                     ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Every intersection of every pair of curves in x_range
+
+    Args:
+        curves: The curves, with their derivatives for Newton refinement
+            and for touching points
+        atol, rtol: Intersections closer than atol + rtol * |x| are merged
+        tangency_atol: A critical point of the difference where it is at
+            most this, and within rounding error of 0, is an intersection
+        check: Called between passes; raise from it to abandon the search
+
+    Returns:
+        (i, j, x): pair indices (i < j) and intersection, sorted by pair then x
+    """
+    x = np.linspace(x_range[0], x_range[1], max(int(points), 2))
+    y = curves.sample(x)
+    pair_i, pair_j = np.triu_indices(len(y), 1)
+    # Newton needs both derivatives of every pair refined together
+    fprime = curves.derivative_difference if all(d is not None for d in curves.derivatives) \
+        else None
+
+    pairs, cols = _sign_changes(y, pair_i, pair_j, check)
+    i, j = pair_i[pairs], pair_j[pairs]
+    flo = y[i, cols] - y[j, cols]
+    fhi = y[i, cols + 1] - y[j, cols + 1]
+
+    check()
+    roots, converged = refine_brackets(curves.difference, x[cols], x[cols + 1], flo, fhi,
+                                       args=(i, j), fprime=fprime)
+    # A sign change across a pole converges onto the pole, where the
+    # difference grows instead of vanishing
+    residual = np.abs(curves.difference(roots, i, j))
+    keep = converged & (residual <= np.maximum(np.abs(flo), np.abs(fhi)))
+    pairs, roots = pairs[keep], roots[keep]
+
+    if any(d is not None for d in curves.derivatives):
+        check()
+        t_pairs, t_roots = _touching(curves, x, y, pair_i, pair_j, tangency_atol, check)
+        # Near a touching point the difference is rounding noise, so sign
+        # changes there refine poorly; the critical point is the accurate estimate
+        tol = atol + rtol * np.abs(roots)
+        keep = unexplained(t_pairs, t_roots, pairs, roots - tol, roots + tol)
+        pairs = np.concatenate([pairs[keep], t_pairs])
+        roots = np.concatenate([roots[keep], t_roots])
+    pairs, roots = merge_roots(pairs, roots, atol, rtol)
+    return pair_i[pairs], pair_j[pairs], roots
+
+def _touching(curves: CurveSet,
+              x: np.ndarray,
+              y: np.ndarray,
+              pair_i: np.ndarray,
+              pair_j: np.ndarray,
+              atol: float,
+              check: Callable[[], None]
+              ) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (pair, x) where a pair's difference has a critical point at which it is 0
+
+    As in tangent_roots, 0 means at most atol and within rounding error
+    of the curves' values, so near misses such as sin(x)^2 + 1e-10 against
+    0 are not touching points.
+    """
+    dy = curves.sample(x, derivative=True)
+    pairs, cols = _sign_changes(dy, pair_i, pair_j, check)
+    i, j = pair_i[pairs], pair_j[pairs]
+    critical, converged = refine_brackets(
+        curves.derivative_difference, x[cols], x[cols + 1],
+        dy[i, cols] - dy[j, cols], dy[i, cols + 1] - dy[j, cols + 1], args=(i, j)
+    )
+    # A sign change of the derivative across a pole converges onto the
+    # pole, where the difference is large
+    residual = np.abs(curves.difference(critical, i, j))
+    scale = np.fmax.reduce(np.abs(y), axis=1)  # NaN for a curve undefined everywhere
+    noise = NOISE_ULPS * np.finfo(float).eps * np.maximum(scale[i], scale[j])
+    keep = converged & (residual <= np.minimum(atol, noise))
+    return pairs[keep], critical[keep]
@@ -0,0 +1,296 @@
+"""
+Evaluation kernels for SymPy expressions over NumPy arrays
+
+sp.lambdify(..., modules=['numpy']) prints the expression as a single
+NumPy expression: a subexpression that appears twice is computed twice,
+and every intermediate result is a new temporary array. A kernel compiles
+the expression once, after common-subexpression elimination (CSE), into
+straight-line code. Backends:
+
+- 'lambdify': plain sp.lambdify, the reference
+- 'cse': one ufunc call per operation, each writing (out=) into a
+  reusable buffer that is recycled as soon as its value is dead; inputs
+  are processed in chunks of CHUNK elements so the buffers stay in cache
+- 'numexpr': each CSE step is evaluated by numexpr, which fuses it into
+  one blocked, multithreaded loop; without numexpr installed this is 'cse'
+
+Kernels take and return arrays like the lambdified function would
+(broadcasting their arguments; a scalar for scalar input), and the
+returned array is always new. Expressions a backend cannot compile
+(complex constants, functions it does not know) fall back to lambdify
+wholesale ('numexpr') or for just the unknown subexpression ('cse').
+
+    f = compile_kernel(x**2 * sin(x**2), (x,), 'cse')
+    y = f(np.linspace(-10, 10, 100_000))
+"""
+import threading
+from typing import TYPE_CHECKING, Callable, Dict, List, Sequence, Tuple
+import numpy as np
+
+if TYPE_CHECKING:
+    import sympy as sp
+
+BACKENDS = ('lambdify', 'cse', 'numexpr')
+CHUNK = 32768  # Elements per chunk: 256 KiB per buffer, so a few stay in cache
+POOL_LIMIT = 1 << 22  # Buffer elements kept per thread between calls (32 MB)
+
+_pool = threading.local()
+
+def numexpr_available() -> bool:
+    try:
+        import numexpr  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+def _ufuncs() -> Dict[object, str]:
+    """SymPy function classes with a NumPy ufunc of the same meaning"""
+    import sympy as sp
+    return {
+        sp.sin: 'sin', sp.cos: 'cos', sp.tan: 'tan',
+        sp.asin: 'arcsin', sp.acos: 'arccos', sp.atan: 'arctan',
+        sp.sinh: 'sinh', sp.cosh: 'cosh', sp.tanh: 'tanh',
+        sp.exp: 'exp', sp.log: 'log', sp.Abs: 'absolute', sp.sign: 'sign',
+        sp.floor: 'floor', sp.ceiling: 'ceil',
+    }
+
+class _Unsupported(Exception):
+    """The expression cannot be compiled by this backend"""
+
+class _Program:
+    """
+    An expression as a list of ufunc operations over numbered temporaries
+
+    ops[k] = (name, operands) computes temporary k; an operand is
+    ('arg', i), ('const', value) or ('tmp', j) with j < k. name is a NumPy
+    ufunc, or 'call' with operands (('fn', f), *arguments) for a
+    subexpression handed to lambdify.
+    """
+
+    def __init__(self, expr: "sp.Expr", args: Sequence["sp.Symbol"]):
+        import sympy as sp
+        self.args = tuple(args)
+        self.ops = []
+        self._ufuncs = _ufuncs()
+        self._memo = {arg: ('arg', i) for i, arg in enumerate(self.args)}
+        replacements, (reduced,) = sp.cse(expr)
+        for symbol, subexpr in replacements:
+            self._memo[symbol] = self._emit(subexpr)
+        self.result = self._emit(reduced)
+
+    def _op(self, name: str, *operands) -> tuple:
+        self.ops.append((name, operands))
+        return ('tmp', len(self.ops) - 1)
+
+    def _chain(self, name: str, operands: List[tuple]) -> tuple:
+        result = operands[0]
+        for operand in operands[1:]:
+            result = self._op(name, result, operand)
+        return result
+
+    def _emit(self, node: "sp.Expr") -> tuple:
+        ref = self._memo.get(node)
+        if ref is None:
+            ref = self._memo[node] = self._emit_new(node)
+        return ref
+
+    def _emit_new(self, node: "sp.Expr") -> tuple:
+        import sympy as sp
+        if not node.free_symbols:
+            try:
+                value = complex(node.evalf())
+            except TypeError:  # zoo, nan and other non-numbers
+                raise _Unsupported(node) from None
+            if value.imag:
+                raise _Unsupported(node)
+            return ('const', value.real)
+        if node.is_Symbol:
+            raise _Unsupported(node)  # Not an argument
+        if node.is_Add:
+            plus, minus = [], []
+            for term in node.args:
+                coeff, rest = term.as_coeff_Mul()
+                (minus if coeff < 0 else plus).append(-term if coeff < 0 else term)
+            if not plus:
+                return self._op('negative', self._chain('add', [self._emit(t) for t in minus]))
+            result = self._chain('add', [self._emit(t) for t in plus])
+            for term in minus:
+                result = self._op('subtract', result, self._emit(term))
+            return result
+        if node.is_Mul:
+            coeff, factors = node.as_coeff_mul()
+            numerator, denominator = [], []
+            for factor in factors:
+                base, exponent = factor.as_base_exp()
+                if exponent.is_number and exponent.is_negative:
+                    denominator.append(self._emit(base ** -exponent))
+                else:
+                    numerator.append(self._emit(factor))
+            result = self._chain('multiply', numerator) if numerator else ('const', 1.0)
+            for factor in denominator:
+                result = self._op('divide', result, factor)
+            if coeff == -1:
+                return self._op('negative', result)
+            return result if coeff == 1 else self._op('multiply', ('const', float(coeff)), result)
+        if node.is_Pow:
+            base, exponent = node.args
+            if exponent == 2:
+                return self._op('square', self._emit(base))
+            if exponent == 3:  # power() is several times slower than multiply()
+                b = self._emit(base)
+                return self._op('multiply', self._op('square', b), b)
+            if exponent == 4:
+                return self._op('square', self._op('square', self._emit(base)))
+            if exponent == sp.S.Half:
+                return self._op('sqrt', self._emit(base))
+            if exponent.is_number and exponent.is_negative:
+                return self._op('divide', ('const', 1.0), self._emit(base ** -exponent))
+            return self._op('power', self._emit(base), self._emit(exponent))
+        name = self._ufuncs.get(type(node))
+        if name is not None and len(node.args) == 1:
+            return self._op(name, self._emit(node.args[0]))
+        # Anything else (Piecewise, Max, ...) is evaluated by lambdify
+        f = sp.lambdify(self.args, node, modules=['numpy'])
+        return self._op('call', ('fn', f), *(('arg', i) for i in range(len(self.args))))
+
+    def _slots(self) -> Tuple[List[int], int]:
+        """Buffer per temporary, reusing buffers of dead temporaries; and the buffer count"""
+        last_use = {}
+        for k, (_, operands) in enumerate(self.ops):
+            for kind, value in operands:
+                if kind == 'tmp':
+                    last_use[value] = k
+        slots, free, count = [], [], 0
+        for k, (_, operands) in enumerate(self.ops):
+            # Ufuncs may write over an operand, so an operand dying here
+            # can lend its buffer to the result
+            for kind, value in operands:
+                if kind == 'tmp' and last_use[value] == k and slots[value] not in free:
+                    free.append(slots[value])
+            if free:
+                slots.append(free.pop())
+            else:
+                slots.append(count)
+                count += 1
+        return slots, count
+
+    def source(self) -> Tuple[str, Dict[str, object], int]:
+        """Python source of a function (args..., out, buffers), its globals and buffer count"""
+        slots, count = self._slots()
+        namespace = {'copyto': np.copyto}
+        names = [f"a{i}" for i in range(len(self.args))]
+
+        def operand(ref):
+            kind, value = ref
+            if kind == 'arg':
+                return names[value]
+            if kind == 'const':
+                return repr(value) if np.isfinite(value) else f"float('{value}')"
+            return f"b{slots[value]}"
+
+        lines = [f"def kernel({', '.join(names)}, out, buffers):"]
+        lines += [f"    b{i} = buffers[{i}]" for i in range(count)]
+        for k, (name, operands) in enumerate(self.ops):
+            target = "out" if self.result == ('tmp', k) else f"b{slots[k]}"
+            if name == 'call':
+                namespace[f"fn{k}"] = operands[0][1]
+                call = f"fn{k}({', '.join(operand(o) for o in operands[1:])})"
+                lines.append(f"    copyto({target}, {call})")
+            else:
+                namespace[name] = getattr(np, name)
+                args = ", ".join(operand(o) for o in operands)
+                lines.append(f"    {name}({args}, out={target})")
+        if self.result[0] != 'tmp':  # The whole expression is an argument or constant
+            lines.append(f"    copyto(out, {operand(self.result)})")
+        return "\n".join(lines), namespace, count
+
+def _buffers(count: int, shape: Tuple[int, ...]) -> List[np.ndarray]:
+    """count scratch arrays of shape, from this thread's pool when small enough"""
+    size = int(np.prod(shape))
+    needed = count * size
+    storage = getattr(_pool, 'storage', None)
+    if storage is None or storage.size < needed:
+        storage = np.empty(needed)
+        if needed <= POOL_LIMIT:
+            _pool.storage = storage
+    return [storage[i * size:(i + 1) * size].reshape(shape) for i in range(count)]
+
+class UfuncKernel:
+    """Callable running a _Program chunk by chunk with ufunc out= buffers"""
+
+    def __init__(self, program: _Program, chunk: int = CHUNK):
+        source, namespace, self.count = program.source()
+        exec(compile(source, '<kernel>', 'exec'), namespace)
+        self.source = source
+        self._kernel = namespace['kernel']
+        self.chunk = chunk
+
+    def __call__(self, *inputs):
+        arrays = [np.asarray(a, dtype=float) for a in inputs]
+        shape = np.broadcast_shapes(*(a.shape for a in arrays))
+        out = np.empty(shape)
+        size = out.size
+        if not all(a.ndim == 0 or a.shape == shape for a in arrays) or size <= self.chunk:
+            # Broadcast against each other (or small): one pass over the whole shape
+            self._kernel(*arrays, out, _buffers(self.count, shape))
+        else:
+            flat = [a.reshape(-1) if a.ndim else a for a in arrays]
+            flat_out = out.reshape(-1)
+            full = _buffers(self.count, (self.chunk,))
+            for start in range(0, size, self.chunk):
+                stop = min(start + self.chunk, size)
+                buffers = full if stop - start == self.chunk else \
+                    [b[:stop - start] for b in full]
+                self._kernel(*[a[start:stop] if a.ndim else a for a in flat],
+                             flat_out[start:stop], buffers)
+        return out if out.ndim else out[()]
+
+def _numexpr_kernel(expr: "sp.Expr", args: Sequence["sp.Symbol"]) -> Callable:
+    """numexpr evaluation of each CSE step; raises _Unsupported for unknown functions"""
+    import sympy as sp
+    replacements, (reduced,) = sp.cse(expr)
+    steps, names = [], list(args)
+    for symbol, subexpr in replacements + [(None, reduced)]:
+        try:
+            steps.append(sp.lambdify(names, subexpr, modules=['numexpr']))
+        except (TypeError, NameError) as e:  # Function numexpr does not have
+            raise _Unsupported(subexpr) from e
+        names.append(symbol)
+
+    def kernel(*inputs):
+        values = [np.asarray(a, dtype=float) for a in inputs]
+        shape = np.broadcast_shapes(*(a.shape for a in values))
+        for step in steps:
+            values.append(np.asarray(step(*values), dtype=float))
+        result = np.array(np.broadcast_to(values[-1], shape))
+        return result if result.ndim else result[()]
+    return kernel
+
+def compile_kernel(expr: "sp.Expr",
+                   args: Sequence["sp.Symbol"],
+                   backend: str = 'lambdify') -> Callable:
+    """
+    Vectorized callable evaluating expr at arrays for args
+
+    Args:
+        expr: SymPy expression
+        args: Symbols, in the order the kernel takes them
+        backend: One of BACKENDS
+
+    Returns:
+        kernel(*arrays) -> array of the broadcast shape
+    """
+    import sympy as sp
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown evaluator: '{backend}'. Choose from {', '.join(BACKENDS)}.")
+    if backend == 'numexpr' and numexpr_available():
+        try:
+            return _numexpr_kernel(expr, args)
+        except _Unsupported:
+            pass
+    if backend != 'lambdify':
+        try:
+            return UfuncKernel(_Program(expr, args))
+        except _Unsupported:
+            pass
+    return sp.lambdify(args, expr, modules=['numpy'])
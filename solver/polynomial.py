@@ -0,0 +1,42 @@
+import numpy as np
+from typing import Sequence
+
+def real_polynomial_roots(coeffs: Sequence[float],
+                          imag_tol: float = 1e-7,
+                          polish_steps: int = 2
+                          ) -> np.ndarray:
+    """
+    Real roots of a polynomial from the eigenvalues of its companion matrix
+
+    Args:
+        coeffs: Coefficients, highest degree first (as for numpy.roots)
+        imag_tol: Largest |imag| / max(1, |root|) still treated as real
+        polish_steps: Newton steps applied to the real roots
+
+    Only simple roots are accurate: the eigenvalues of a k-fold root are
+    off by about eps^(1/k) and may come back split or complex, so pass
+    the squarefree part of a polynomial with repeated roots.
+
+    Returns:
+        Sorted real roots
+    """
+    coeffs = np.trim_zeros(np.asarray(coeffs, dtype=float), 'f')
+    if coeffs.size < 2:
+        return np.empty(0)
+    roots = np.roots(coeffs)
+    real = roots[np.abs(roots.imag) <= imag_tol * np.maximum(1.0, np.abs(roots))].real
+
+    derivative = np.polyder(coeffs)
+    for _ in range(polish_steps):
+        slope = np.polyval(derivative, real)
+        with np.errstate(all='ignore'):
+            step = np.polyval(coeffs, real) / slope
+        # Leave multiple roots (zero slope) where the eigensolver put them
+        real = np.where(np.isfinite(step) & (slope != 0), real - step, real)
+    return np.sort(real)
+
+def drop_poles(roots: np.ndarray, denominator: Sequence[float], tol: float = 1e-9) -> np.ndarray:
+    """Remove candidate roots where the denominator vanishes"""
+    denominator = np.asarray(denominator, dtype=float)
+    scale = np.polyval(np.abs(denominator), np.abs(roots))
+    return roots[np.abs(np.polyval(denominator, roots)) > tol * np.maximum(scale, 1.0)]
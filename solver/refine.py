@@ -0,0 +1,175 @@
+import numpy as np
+from typing import Callable, Optional, Tuple
+
+NOISE_ULPS = 1024  # |f| within this many ulps of its largest sample is rounding error
+
+def _evaluate(f: Callable, x: np.ndarray, *args: np.ndarray) -> np.ndarray:
+    """Evaluate f on an array, always returning a float array shaped like x"""
+    with np.errstate(all='ignore'):
+        y = np.asarray(f(x, *args), dtype=float)
+    return np.broadcast_to(y, x.shape).copy()
+
+def refine_brackets(f: Callable,
+                    a: np.ndarray,
+                    b: np.ndarray,
+                    fa: Optional[np.ndarray] = None,
+                    fb: Optional[np.ndarray] = None,
+                    xtol: float = 1e-12,
+                    rtol: float = 4 * np.finfo(float).eps,
+                    maxiter: int = 200,
+                    args: Tuple[np.ndarray, ...] = (),
+                    fprime: Optional[Callable] = None
+                    ) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Refine all sign-change brackets [a, b] at once with the Illinois method
+
+    Every iterate stays inside its bracket, and whenever two consecutive
+    steps fail to halve the bracket the next step bisects, so each bracket
+    converges at no worse than half the rate of bisection. With fprime,
+    the step is a Newton step from the last iterate whenever that lands
+    inside the bracket and is at most half the previous step (as in
+    rtsafe), which converges quadratically near simple roots, and a
+    Newton step below tolerance ends the search. A bracket whose Newton
+    step left it once (as next to a pole) stops evaluating fprime and
+    carries on with Illinois steps.
+
+    Args:
+        f: Vectorized function of x
+        a, b: Bracket endpoints with f(a) and f(b) of opposite sign
+        fa, fb: f(a) and f(b) if already known
+        xtol, rtol: Stop once b - a <= 2 * (xtol + rtol * |x|)
+        maxiter: Iteration cap
+        args: Arrays aligned with the brackets, passed to f after x (so
+            f(x, p) can refine brackets of different parameter values p
+            together)
+        fprime: Vectorized derivative of f, called like f
+
+    Returns:
+        (roots, converged) arrays; roots of unconverged brackets are NaN
+    """
+    a = np.array(a, dtype=float)
+    b = np.array(b, dtype=float)
+    args = tuple(np.asarray(arg) for arg in args)
+    fa = _evaluate(f, a, *args) if fa is None else np.array(fa, dtype=float)
+    fb = _evaluate(f, b, *args) if fb is None else np.array(fb, dtype=float)
+
+    roots = np.full(a.shape, np.nan)
+    converged = np.zeros(a.shape, dtype=bool)
+    roots[fa == 0] = a[fa == 0]
+    roots[fb == 0] = b[fb == 0]
+    converged[(fa == 0) | (fb == 0)] = True
+
+    active = ~converged & (np.signbit(fa) != np.signbit(fb))
+    kept_side = np.zeros(a.shape, dtype=np.int8)  # -1 a kept last step, +1 b kept
+    force_bisect = np.zeros(a.shape, dtype=bool)
+    width = b - a  # Bracket width one step back
+    if fprime is not None:
+        newton = np.full(a.shape, np.nan)  # Newton target from the last iterate
+        use_fprime = np.ones(a.shape, dtype=bool)  # Until a Newton step is rejected
+        last = np.where(np.abs(fa) < np.abs(fb), a, b)  # Last iterate
+        step = b - a  # Size of the last step
+
+    for _ in range(maxiter):
+        idx = np.flatnonzero(active)
+        if not idx.size:
+            break
+        A, B, FA, FB = a[idx], b[idx], fa[idx], fb[idx]
+
+        tol = xtol + rtol * np.maximum(np.abs(A), np.abs(B))
+        with np.errstate(all='ignore'):
+            X = B - FB * (B - A) / (FB - FA)
+        force = force_bisect[idx]
+        if fprime is not None:
+            N = newton[idx]
+            # False for NaN, e.g. before the first derivative is known
+            inside = (N > A) & (N < B)
+            use_newton = inside & (np.abs(N - last[idx]) <= 0.5 * step[idx])
+            use_fprime[idx] &= inside | np.isnan(N)
+            X = np.where(use_newton, N, X)
+            force = force & ~use_newton
+        bisect = force | ~np.isfinite(X) | (B - A <= 2 * tol)
+        # Keep secant steps at least tol inside the bracket so that the
+        # stale endpoint gets replaced once the iterate has converged
+        X = np.where(bisect, 0.5 * (A + B), np.clip(X, A + tol, B - tol))
+        FX = _evaluate(f, X, *[arg[idx] for arg in args])
+        small_step = np.zeros(X.shape, dtype=bool)
+        best = X  # Root estimate if this bracket is done
+        if fprime is not None:
+            sub = np.flatnonzero(use_fprime[idx])
+            N = np.full(X.shape, np.nan)
+            if sub.size:
+                with np.errstate(all='ignore'):
+                    N[sub] = X[sub] - FX[sub] / _evaluate(fprime, X[sub],
+                                                          *[arg[idx[sub]] for arg in args])
+            small_step = np.abs(N - X) <= tol
+            best = np.where(small_step, N, X)
+            newton[idx] = N
+            step[idx] = np.abs(X - last[idx])
+            last[idx] = X
+
+        # Undefined inside the bracket: give up on it
+        undefined = np.isnan(FX)
+        exact = FX == 0
+        root_right = np.signbit(FX) == np.signbit(FA)  # Root lies in [X, B]
+
+        # Illinois: halve the stale endpoint's value when it is kept twice
+        side = np.where(root_right, 1, -1).astype(np.int8)
+        stale = side == kept_side[idx]
+        FB = np.where(root_right & stale, 0.5 * FB, FB)
+        FA = np.where(~root_right & stale, 0.5 * FA, FA)
+
+        newA = np.where(root_right, X, A)
+        newB = np.where(root_right, B, X)
+        a[idx] = newA
+        b[idx] = newB
+        fa[idx] = np.where(root_right, FX, FA)
+        fb[idx] = np.where(root_right, FB, FX)
+        kept_side[idx] = side
+        # Bisect when two steps together failed to halve the bracket
+        force_bisect[idx] = (newB - newA) > 0.5 * width[idx]
+        width[idx] = B - A
+
+        done = exact | ((newB - newA) <= 2 * tol) | (small_step & ~undefined)
+        roots[idx[done]] = best[done]
+        converged[idx[done]] = True
+        active[idx[done | undefined]] = False
+
+    return roots, converged
+
+def tangent_roots(f: Callable,
+                  fprime: Callable,
+                  x: np.ndarray,
+                  atol: float,
+                  y: Optional[np.ndarray] = None
+                  ) -> np.ndarray:
+    """
+    Roots where f touches zero without changing sign, from sample points x
+
+    Sign-change brackets miss even-multiplicity roots such as (x-1)^2.
+    Every sign change of f' between neighbouring samples is refined to
+    its critical point. Near such a root f itself is rounding noise, so
+    the scan looks at f' rather than at minima of |f|.
+
+    A critical point is a root when |f| there is at most atol and also
+    within rounding error of zero, taken as NOISE_ULPS ulps of the
+    largest |f| on the samples: sin(x)^2 + 1e-10 has minima of 1e-10 on
+    a scale of 1, which is a near miss, not a root.
+
+    Args:
+        y: f at x, if already known (used for the scale)
+
+    Returns:
+        Critical points that are roots, in increasing x
+    """
+    x = np.asarray(x, dtype=float)
+    d = _evaluate(fprime, x)
+    idx = np.flatnonzero((np.signbit(d[1:]) != np.signbit(d[:-1]))
+                         & ~np.isnan(d[1:]) & ~np.isnan(d[:-1]))
+    if not len(idx):
+        return x[idx]
+    critical, converged = refine_brackets(fprime, x[idx], x[idx + 1], d[idx], d[idx + 1])
+    y = _evaluate(f, x) if y is None else np.asarray(y, dtype=float)
+    scale = np.max(np.abs(y[np.isfinite(y)]), initial=0.0)
+    # A sign change of f' across a pole converges onto the pole, where |f| is large
+    residual = np.abs(_evaluate(f, critical))
+    return critical[converged & (residual <= min(atol, NOISE_ULPS * np.finfo(float).eps * scale))]
@@ -0,0 +1,130 @@
+import numpy as np
+from typing import Callable, Tuple
+from solver import tracing
+
+def _evaluate(f: Callable, x: np.ndarray) -> np.ndarray:
+    with np.errstate(all='ignore'):
+        y = np.asarray(f(x), dtype=float)
+    return np.broadcast_to(y, x.shape).copy()
+
+def _refinement_flags(x: np.ndarray,
+                      y: np.ndarray,
+                      coarse_width: float,
+                      min_width: float,
+                      curvature_tol: float
+                      ) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Decide which intervals [x[i], x[i+1]] to split
+
+    Returns:
+        (urgent, other) boolean masks over intervals. Urgent intervals
+        (non-finite edges, near-zero minima of |f|) are refined down to
+        min_width; sign changes and high curvature to coarse_width / 8.
+    """
+    width = np.diff(x)
+    finite = np.isfinite(y)
+    both_finite = finite[:-1] & finite[1:]
+
+    # Domain edges and singularities: one endpoint defined, the other not
+    urgent = finite[:-1] != finite[1:]
+    other = both_finite & (np.signbit(y[:-1]) != np.signbit(y[1:])) \
+        & (width > coarse_width / 8)
+
+    if len(x) >= 3:
+        y0, y1, y2 = y[:-2], y[1:-1], y[2:]
+        h0, h1 = width[:-1], width[1:]
+        with np.errstate(all='ignore'):
+            # Parabola through three neighbours: slope and curvature at x1
+            d1 = (h0 ** 2 * y2 - h1 ** 2 * y0 + (h1 ** 2 - h0 ** 2) * y1) \
+                / (h0 * h1 * (h0 + h1))
+            d2 = 2 * (h0 * y2 - (h0 + h1) * y1 + h1 * y0) / (h0 * h1 * (h0 + h1))
+            vertex_x = -d1 / d2
+            vertex_y = y1 - d1 ** 2 / (2 * d2)
+            linear_error = np.abs(y1 - (h1 * y0 + h0 * y2) / (h0 + h1))
+        scale = (np.abs(y0) + np.abs(y1) + np.abs(y2)) / 3
+        same_sign = (np.signbit(y0) == np.signbit(y1)) & (np.signbit(y1) == np.signbit(y2))
+        local_min = (np.abs(y1) <= np.abs(y0)) & (np.abs(y1) <= np.abs(y2)) & same_sign
+        # |f| dips towards (or through) zero between samples: possible
+        # double root or a pair of close roots
+        near_zero = local_min & (vertex_x >= -h0) & (vertex_x <= h1) & (
+            (np.signbit(vertex_y) != np.signbit(y1))
+            | (np.abs(vertex_y) <= 1e-3 * np.maximum(np.abs(y0), np.abs(y2)))
+        )
+        curved = linear_error > curvature_tol * scale
+        interior_finite = both_finite[:-1] & both_finite[1:]
+        near_zero &= interior_finite
+        curved &= interior_finite
+
+        urgent[:-1] |= near_zero
+        urgent[1:] |= near_zero
+        other[:-1] |= curved & (h0 > coarse_width / 8)
+        other[1:] |= curved & (h1 > coarse_width / 8)
+
+    urgent &= width > min_width
+    other &= ~urgent
+    return urgent, other
+
+def _spread(idx: np.ndarray, count: int) -> np.ndarray:
+    """count of the sorted indices idx, evenly spaced across them"""
+    if count >= len(idx):
+        return idx
+    return idx[np.linspace(0, len(idx) - 1, count).round().astype(int)]
+
+def adaptive_sample(f: Callable,
+                    x_range: Tuple[float, float],
+                    initial_points: int,
+                    max_points: int = 1_000_000,
+                    curvature_tol: float = 0.05,
+                    max_passes: int = 60
+                    ) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Sample f on a coarse grid, then split only the intervals that need it
+
+    Intervals are refined where f changes sign, where |f| has a local
+    minimum that approaches zero, where f becomes undefined, and where
+    linear interpolation is poor. The total number of samples never
+    exceeds max_points, so memory is bounded regardless of range width.
+    When a pass wants more splits than the budget allows, urgent
+    intervals go first and the rest of the budget is spread evenly over
+    the range (rather than spent from the left); the intervals left
+    unsplit are reported to the active trace as note(truncated=...),
+    since close root pairs inside them can be missed.
+
+    Args:
+        f: Vectorized function of x
+        x_range: (min, max) sampling range
+        initial_points: Size of the starting uniform grid
+        max_points: Hard ceiling on the number of samples
+        curvature_tol: Relative linear-interpolation error that triggers a split
+        max_passes: Refinement passes
+
+    Returns:
+        (x, y) sorted samples
+    """
+    initial_points = int(min(max(initial_points, 3), max_points))
+    x = np.linspace(x_range[0], x_range[1], initial_points)
+    y = _evaluate(f, x)
+    coarse_width = (x_range[1] - x_range[0]) / max(initial_points - 1, 1)
+    min_width = 64 * np.finfo(float).eps * max(abs(x_range[0]), abs(x_range[1]), 1.0)
+
+    truncated = 0
+    for _ in range(max_passes):
+        urgent, other = _refinement_flags(x, y, coarse_width, min_width, curvature_tol)
+        urgent, other = np.flatnonzero(urgent), np.flatnonzero(other)
+        budget = max_points - len(x)
+        if not urgent.size and not other.size:
+            break
+        if urgent.size + other.size > budget:
+            truncated += urgent.size + other.size - max(budget, 0)
+            if budget <= 0:
+                break
+            urgent = _spread(urgent, budget)
+            other = _spread(other, budget - len(urgent))
+        split = np.sort(np.concatenate([urgent, other]))
+        mids = 0.5 * (x[split] + x[split + 1])
+        x = np.insert(x, split + 1, mids)
+        y = np.insert(y, split + 1, _evaluate(f, mids))
+
+    if truncated:
+        tracing.note(truncated=truncated)
+    return x, y
@@ -1,12 +1,90 @@
-import sympy as sp
+from __future__ import annotations
+import hashlib
+import json
+import threading
+import time
 import numpy as np
-from scipy import optimize
-from typing import List, Tuple, Optional
+from concurrent.futures import CancelledError
+from contextlib import contextmanager
+from functools import cached_property
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, List, NamedTuple, Tuple, Optional, Union
+from cache.cache import ExpressionCache, expression_cache
+from parser.canonical import canonical_equation
+from parser.nodes import Node
+from parser.parser import check_parameter
+from solver import batch, intersect, kernels, sweep, tracing
+from solver.polynomial import drop_poles, real_polynomial_roots
+from solver.refine import refine_brackets, tangent_roots
+from solver.sampling import adaptive_sample
+from solver.worker import KillableWorker
+
+if TYPE_CHECKING:
+    import sympy as sp
+
+# A function string, or the AST from Parser.parse_ast
+Function = Union[str, Node]
+
+class SolveReport(NamedTuple):
+    roots: List[float]
+    sources: List[str]          # Path per root: 'polynomial', 'symbolic' or 'numeric'
+    timings: Dict[str, float]   # Stage name -> wall-clock seconds
+    timed_out: bool             # Symbolic stage hit symbolic_timeout
+
+def _symbolic_job(equation: sp.Expr,
+                  simplified: bool,
+                  x_range: Tuple[float, float]
+                  ) -> Tuple[sp.Expr, List[float]]:
+    """Symbolic stage as run inside the killable worker"""
+    import sympy as sp
+    if not simplified:
+        equation = sp.simplify(equation)
+    return equation, EquationSolver()._symbolic_solve(equation, x_range)
 
 class EquationSolver:
-    def __init__(self):
-        self.x = sp.Symbol('x')
-        self.safe_functions = {
+    # Attributes copied into batch worker processes
+    SETTINGS = (
+        'numeric_density', 'max_samples', 'chunk_samples', 'symbolic_timeout',
+        'round_decimals', 'zero_atol', 'dedup_atol', 'dedup_rtol', 'tangency_atol',
+        'evaluator', 'disk_cache', 'tracer',
+    )
+    # Settings that can change solve() results, so part of the disk cache key
+    RESULT_SETTINGS = (
+        'numeric_density', 'max_samples', 'symbolic_timeout',
+        'round_decimals', 'zero_atol', 'dedup_atol', 'dedup_rtol', 'tangency_atol',
+    )
+
+    def __init__(self, cache: ExpressionCache = expression_cache):
+        self.cache = cache
+        self.numeric_density = 1000  # Points per unit interval of the starting grid
+        self.max_samples = 1_000_000  # Ceiling on numeric samples per solve
+        self.chunk_samples = 65_536  # Starting points per chunk in iter_roots
+        self.round_decimals = 8  # Rounding applied to roots, None = keep full precision
+        self.zero_atol = 1e-12  # Roots this close to 0 are not rounded
+        self.dedup_atol = 1e-6  # Roots closer than atol + rtol * |root| are merged
+        self.dedup_rtol = 1e-5
+        self.tangency_atol = 1e-9  # A minimum of |f| this small (and within rounding of 0) is a root
+        self.symbolic_timeout = None  # Seconds for simplify + solve, None = unlimited
+        self.evaluator = 'lambdify'  # Backend from kernels.BACKENDS for numeric evaluation
+        self.disk_cache = None  # Optional cache.disk.DiskCache, persists results across runs
+        self.tracer = None  # Optional tracing.Tracer, gets a record per solve
+        self._worker = KillableWorker()
+        self._cancels = 0  # cancel() calls so far
+        self._scope = threading.local()  # _cancels when this thread's solve started
+
+    def warm_up(self):
+        """Import SymPy now rather than on the first solve"""
+        import sympy  # noqa: F401
+
+    # SymPy is imported on first use (the first solve), not with this module
+    @cached_property
+    def x(self) -> sp.Symbol:
+        import sympy as sp
+        return sp.Symbol('x')
+
+    @cached_property
+    def safe_functions(self) -> Dict[str, object]:
+        import sympy as sp
+        return {
             'log10': lambda x: sp.log(x, 10),
             'exp': sp.exp,
             'sqrt': sp.sqrt,
@@ -14,43 +92,406 @@ class EquationSolver:
             'cos': sp.cos,
             'tan': sp.tan,
         }
-        self.numeric_density = 1000  # Points per unit interval
-        
+
     def solve(self, 
-             func1_str: str, 
-             func2_str: str, 
+             func1_str: Function, 
+             func2_str: Function, 
              x_range: Tuple[float, float] = (-10, 10)
              ) -> List[float]:
         """
         Find intersection points between two functions
         
         Args:
-            func1_str: Valid function string for f1(x)
-            func2_str: Valid function string for f2(x)
+            func1_str: Valid function string (or parsed AST) for f1(x)
+            func2_str: Valid function string (or parsed AST) for f2(x)
             x_range: Search range for solutions (min, max)
             
         Returns:
             List of x-values within x_range where f1(x) = f2(x)
         """
+        return self.solve_detailed(func1_str, func2_str, x_range).roots
+
+    def solve_detailed(self, 
+                       func1_str: Function, 
+                       func2_str: Function, 
+                       x_range: Tuple[float, float] = (-10, 10)
+                       ) -> SolveReport:
+        """
+        Like solve, but also report where each root came from and stage timings
+        
+        When symbolic_timeout is set, simplify + solve run in a killable
+        worker process; if they overrun, the worker is killed and the
+        unsimplified equation goes straight to the numeric solver.
+        """
+        tracer = self.tracer
+        trace = tracing.Trace(memory=tracer is not None and tracer.memory)
+        start = time.perf_counter()
+
+        def emit(report: Optional[SolveReport], error: Optional[str]):
+            # Tracer.emit never raises, so tracing cannot change the outcome
+            if tracer is not None:
+                tracer.emit(
+                    trace, time.perf_counter() - start,
+                    f1=self._source(func1_str), f2=self._source(func2_str),
+                    x_range=[float(x_range[0]), float(x_range[1])],
+                    roots=None if report is None else len(report.roots),
+                    timed_out=report is not None and report.timed_out, error=error,
+                )
+
         try:
-            f1 = sp.sympify(func1_str, locals=self.safe_functions)
-            f2 = sp.sympify(func2_str, locals=self.safe_functions)
-        except (sp.SympifyError, TypeError) as e:
-            raise ValueError(f"Invalid function string: {str(e)}") from None
+            with trace.activate(profile=tracer is not None and tracer.profile_over is not None), \
+                    self._cancellable():
+                report = self._solve_traced(func1_str, func2_str, x_range)
+        except Exception as e:
+            emit(None, f"{type(e).__name__}: {e}")
+            raise
+        emit(report, None)
+        return report._replace(timings=trace.timings())
+
+    def _solve_traced(self,
+                      func1_str: Function,
+                      func2_str: Function,
+                      x_range: Tuple[float, float]
+                      ) -> SolveReport:
+        """solve_detailed inside an active trace; timings are filled in by the caller"""
+        with tracing.stage('sympify'):
+            f1 = self._sympify(func1_str)
+            f2 = self._sympify(func2_str)
+            func1_str, func2_str = self._source(func1_str), self._source(func2_str)
+
+        if self.disk_cache is not None:
+            with tracing.stage('disk_cache'):
+                key = self._disk_key(func1_str, func2_str, f1 - f2, x_range)
+                stored = self.disk_cache.get(key)
+                tracing.note(hit=stored is not None)
+            if stored is not None:
+                return SolveReport(*stored, {}, False)
+            report = self._solve_stages(func1_str, func2_str, f1, f2, x_range)
+            if not report.timed_out:  # A later run with more time may do better
+                self.disk_cache.put(key, report.roots, report.sources)
+            return report
+        return self._solve_stages(func1_str, func2_str, f1, f2, x_range)
 
-        equation = sp.simplify(f1 - f2)
-        solutions = self._symbolic_solve(equation, x_range)
+    def _solve_stages(self,
+                      func1_str: str,
+                      func2_str: str,
+                      f1: sp.Expr,
+                      f2: sp.Expr,
+                      x_range: Tuple[float, float]
+                      ) -> SolveReport:
+        """Polynomial fast path, then symbolic, then numeric fallback"""
+        with tracing.stage('polynomial'):
+            solutions = self._polynomial_solve(f1 - f2)
+        if solutions is not None:
+            with tracing.stage('clean'):
+                roots = self._clean_solutions(solutions, x_range)
+            return SolveReport(roots, ['polynomial'] * len(roots), {}, False)
+
+        with tracing.stage('symbolic'):
+            equation, solutions, timed_out = self._symbolic_stage(
+                func1_str, func2_str, f1, f2, x_range
+            )
+        source = 'symbolic'
         
         if not solutions:
-            solutions = self._numeric_solve(equation, x_range)
+            with tracing.stage('numeric'):
+                solutions = self._numeric_solve(equation, x_range)
+            source = 'numeric'
             
-        return self._clean_solutions(solutions, x_range)
+        with tracing.stage('clean'):
+            tracing.note(raw=len(solutions))
+            roots = self._clean_solutions(solutions, x_range)
+        return SolveReport(roots, [source] * len(roots), {}, timed_out)
+
+    def cancel(self):
+        """
+        Abort solves running on other threads
+        
+        The symbolic stage is interrupted at once when it runs in the
+        worker process (symbolic_timeout set); the numeric stage stops at
+        its next check, between sampling, refinement and tangency search
+        (and between chunks of iter_roots). Interrupted solves raise
+        concurrent.futures.CancelledError; solves started afterwards are
+        unaffected.
+        """
+        self._cancels += 1
+        self._worker.cancel()
+
+    @contextmanager
+    def _cancellable(self, token: Optional[int] = None):
+        """Make cancel() calls from now on (or after token) interrupt this thread"""
+        previous = getattr(self._scope, 'token', None)
+        # A nested solve belongs to the outer one
+        self._scope.token = previous if previous is not None else \
+            self._cancels if token is None else token
+        try:
+            yield
+        finally:
+            self._scope.token = previous
+
+    def _check_cancelled(self):
+        """Raise CancelledError if cancel() was called since this thread's solve started"""
+        token = getattr(self._scope, 'token', None)
+        if token is not None and token != self._cancels:
+            raise CancelledError()
+
+    def close(self):
+        """Stop the symbolic worker process, if one was started"""
+        self._worker.close()
+
+    def _polynomial_solve(self, equation: sp.Expr) -> Optional[List[float]]:
+        """
+        Fast path for polynomial and rational equations with numeric coefficients
+        
+        Returns:
+            Real roots from the companion-matrix eigenvalues of the
+            numerator's squarefree part, minus poles of the denominator;
+            None when the equation is not a rational function of x
+        """
+        import sympy as sp
+        if equation.is_polynomial(self.x):
+            numerator, denominator = equation, sp.S.One
+        elif equation.is_rational_function(self.x):
+            numerator, denominator = sp.fraction(sp.together(equation))
+        else:
+            return None
+        from sympy.polys.polyerrors import BasePolynomialError
+        try:
+            poly = sp.Poly(numerator, self.x)
+            if poly.domain.is_RR:
+                poly = poly.set_domain(sp.QQ)  # Exact gcd for float coefficients
+            # Eigenvalues of a k-fold root are only accurate to about
+            # eps^(1/k) and split into clusters; the squarefree part has
+            # the same roots, all simple
+            num_coeffs = [float(c) for c in sp.sqf_part(poly).all_coeffs()]
+            den_coeffs = [float(c) for c in sp.Poly(denominator, self.x).all_coeffs()]
+        except (BasePolynomialError, TypeError):
+            return None
+        roots = real_polynomial_roots(num_coeffs)
+        return drop_poles(roots, den_coeffs).tolist()
+
+    def _symbolic_stage(self,
+                        func1_str: str,
+                        func2_str: str,
+                        f1: sp.Expr,
+                        f2: sp.Expr,
+                        x_range: Tuple[float, float]
+                        ) -> Tuple[sp.Expr, List[float], bool]:
+        """Simplify and solve, within symbolic_timeout when one is set"""
+        if self.symbolic_timeout is None or not KillableWorker.available():
+            with tracing.stage('symbolic.simplify'):
+                equation = self._equation(func1_str, func2_str)
+            with tracing.stage('symbolic.solve'):
+                return equation, self._symbolic_solve(equation, x_range), False
+
+        key = f"({func1_str})-({func2_str})"
+        cached = self.cache.peek(key, 'sympy_expr')
+        job_args = (f1 - f2, False, x_range) if cached is None else (cached, True, x_range)
+        try:
+            equation, solutions = self._worker.call(
+                _symbolic_job, job_args, self.symbolic_timeout
+            )
+        except TimeoutError:
+            tracing.note(timed_out=True)
+            return f1 - f2, [], True
+        self.cache.get(key, 'sympy_expr', lambda: equation)
+        return equation, solutions, False
+
+    def solve_many(self,
+                   problems: Iterable[batch.Problem],
+                   max_workers: Optional[int] = None,
+                   chunksize: int = 16,
+                   timeout: Optional[float] = None
+                   ) -> Iterator[batch.BatchResult]:
+        """
+        Solve many (func1_str, func2_str, x_range) problems on a process pool
+        
+        Args:
+            problems: Iterable of problems, consumed lazily
+            max_workers: Worker processes (default: CPU count, 0 = inline)
+            chunksize: Problems handed to a worker at a time
+            timeout: Per-problem time limit in seconds
+            
+        Returns:
+            Iterator of BatchResult in completion order; see batch.solve_many
+        """
+        return batch.solve_many(self, problems, max_workers, chunksize, timeout)
+
+    def solve_sweep(self,
+                    func1_str: Function,
+                    func2_str: Function,
+                    parameter: str,
+                    values: Iterable[float],
+                    x_range: Tuple[float, float] = (-10, 10)
+                    ) -> sweep.SweepResult:
+        """
+        Solve f1(x) = f2(x) for every value of a parameter appearing in them
+
+        The equation is lambdified once over (x, parameter) and solved
+        numerically for all values together; see solver.sweep. Strings are
+        sympified with the parameter as a symbol; ASTs come from
+        Parser(parameters=(parameter,)).
+
+        Args:
+            func1_str, func2_str: Function strings (or parsed ASTs) in x and the parameter
+            parameter: Name of the parameter, e.g. 'a'
+            values: Parameter values to solve for
+            x_range: Search range for solutions (min, max)
+
+        Returns:
+            SweepResult with the sorted roots for each value, in input order
+
+        Raises:
+            ValueError: If parameter is not a valid name (x, a keyword or a function)
+        """
+        import sympy as sp
+        symbol = sp.Symbol(check_parameter(parameter, self.safe_functions))
+        namespace = {**self.safe_functions, parameter: symbol}
+        sides = []
+        for func in (func1_str, func2_str):
+            try:
+                sides.append(func.to_sympy(self.x, namespace) if isinstance(func, Node)
+                             else sp.sympify(func, locals=namespace))
+            except (sp.SympifyError, TypeError) as e:
+                raise ValueError(f"Invalid function string: {str(e)}") from None
+        f = kernels.compile_kernel(sides[0] - sides[1], (self.x, symbol), self.evaluator)
+
+        values = np.asarray(list(values), dtype=float).ravel()
+        # Same starting density as _numeric_solve, within the sample budget
+        points = min((x_range[1] - x_range[0]) * self.numeric_density // 8,
+                     self.max_samples // max(len(values), 1))
+        rows, roots = sweep.sweep_roots(f, values, x_range, max(points, 16),
+                                        self.dedup_atol, self.dedup_rtol)
+        roots = self._round_roots(roots)
+        bounds = np.searchsorted(rows, np.arange(len(values) + 1))
+        return sweep.SweepResult(values, [roots[lo:hi] for lo, hi in zip(bounds[:-1], bounds[1:])])
+
+    def intersect_all(self,
+                      funcs: List[Function],
+                      x_range: Tuple[float, float] = (-10, 10)
+                      ) -> List[intersect.Intersection]:
+        """
+        Every intersection of every pair among N functions of x
+
+        Each function and its derivative is lambdified once (through the
+        cache) and sampled once on a shared grid; crossings and touching
+        points of all pairs are then found and refined together, see
+        solver.intersect. The search is numeric only; cancel() stops it
+        between passes.
+
+        Args:
+            funcs: Function strings (or parsed ASTs)
+            x_range: Search range for intersections (min, max)
+
+        Returns:
+            Intersection(x, y, (i, j)) for each crossing, sorted by x
+        """
+        if len(funcs) < 2:
+            return []
+        exprs = [self._sympify(f) for f in funcs]
+        curves = intersect.CurveSet([self._lambdify(e) for e in exprs],
+                                    [self._derivative(e) for e in exprs])
+        # Same starting density as _numeric_solve, one grid for all curves
+        points = min((x_range[1] - x_range[0]) * self.numeric_density,
+                     self.max_samples // len(curves.funcs))
+        with self._cancellable():
+            i, j, roots = intersect.intersect_curves(
+                curves, x_range, max(points, 16), self.dedup_atol, self.dedup_rtol,
+                self.tangency_atol, self._check_cancelled
+            )
+        roots = self._round_roots(roots)
+        y = curves.evaluate(roots, i)
+        order = np.lexsort((j, i, roots))
+        return [intersect.Intersection(float(roots[k]), float(y[k]), (int(i[k]), int(j[k])))
+                for k in order]
+
+    def _disk_key(self,
+                  func1_str: str,
+                  func2_str: str,
+                  equation: sp.Expr,
+                  x_range: Tuple[float, float]) -> str:
+        """
+        Stable hash of f1 = f2, the range and the result-affecting settings
+
+        The equation is keyed by its parser.canonical form, so rearranged
+        or rescaled inputs share an entry. Sources the parser rejects fall
+        back to srepr of SymPy's automatically canonicalized f1 - f2
+        rather than a simplify()'d one: simplify can cost as much as the
+        solve the cache is meant to skip.
+        """
+        import sympy as sp
+        try:
+            form = canonical_equation(func1_str, func2_str)
+        except (ValueError, TypeError):
+            form = sp.srepr(equation)
+        payload = json.dumps([
+            form,
+            [float(x_range[0]), float(x_range[1])],
+            [getattr(self, name) for name in self.RESULT_SETTINGS],
+        ])
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _settings(self) -> dict:
+        """Current values of the attributes listed in SETTINGS"""
+        return {name: getattr(self, name) for name in self.SETTINGS}
+
+    @staticmethod
+    def _source(func: Function) -> str:
+        """Source text of a function string or AST"""
+        return func.to_source() if isinstance(func, Node) else func
+
+    def _sympify(self, func_str: Function) -> sp.Expr:
+        """Cached conversion of a function string or AST to a SymPy expression"""
+        import sympy as sp
+        if isinstance(func_str, Node):
+            node = func_str
+            factory = lambda: node.to_sympy(self.x, self.safe_functions)
+            func_str = node.to_source()
+        else:
+            factory = lambda: sp.sympify(func_str, locals=self.safe_functions)
+        try:
+            return self.cache.get(func_str, 'sympy_expr', factory)
+        except (sp.SympifyError, TypeError) as e:
+            raise ValueError(f"Invalid function string: {str(e)}") from None
+
+    def _equation(self, func1_str: str, func2_str: str) -> sp.Expr:
+        """Cached simplified form of f1(x) - f2(x)"""
+        import sympy as sp
+        return self.cache.get(
+            f"({func1_str})-({func2_str})", 'sympy_expr',
+            lambda: sp.simplify(self._sympify(func1_str) - self._sympify(func2_str))
+        )
+
+    def _kernel_key(self, key: str) -> str:
+        """Cache key of a compiled callable; the cache is shared by solvers with other evaluators"""
+        return key if self.evaluator == 'lambdify' else f"{self.evaluator}: {key}"
+
+    def _lambdify(self, equation: sp.Expr):
+        """Cached NumPy callable for an equation"""
+        return self.cache.get(
+            self._kernel_key(str(equation)), 'numpy_func',
+            lambda: kernels.compile_kernel(equation, (self.x,), self.evaluator)
+        )
+
+    def _derivative(self, equation: sp.Expr) -> Optional[Callable]:
+        """Cached NumPy callable for d/dx of an equation, None if SymPy cannot provide one"""
+        import sympy as sp
+        # Keyed by the equation: printing the derivative for a key can cost
+        # more than the numeric solve
+        try:
+            return self.cache.get(
+                self._kernel_key(f"d/dx {equation}"), 'numpy_func',
+                lambda: kernels.compile_kernel(sp.diff(equation, self.x), (self.x,), self.evaluator)
+            )
+        except Exception:  # Unsupported by diff or lambdify; refine without
+            return None
 
     def _symbolic_solve(self, 
                       equation: sp.Expr, 
                       x_range: Tuple[float, float]
                       ) -> List[float]:
         """Attempt symbolic solution with range filtering"""
+        import sympy as sp
         try:
             symbolic_sols = sp.solve(equation, self.x)
             return [
@@ -61,52 +502,162 @@ class EquationSolver:
         except (NotImplementedError, TypeError):
             return []
 
+    def iter_roots(self,
+                   func1_str: Function,
+                   func2_str: Function,
+                   x_range: Tuple[float, float] = (-10, 10)
+                   ) -> Iterator[float]:
+        """
+        Stream numeric intersection points in increasing x
+        
+        The range is scanned in chunks of chunk_samples starting points, so
+        peak memory does not depend on the width of x_range and the first
+        roots are available before the whole range has been scanned. Only
+        the numeric solver is used.
+        
+        Args:
+            func1_str: Valid function string (or parsed AST) for f1(x)
+            func2_str: Valid function string (or parsed AST) for f2(x)
+            x_range: Search range for solutions (min, max)
+            
+        Yields:
+            Cleaned roots, each once
+        """
+        equation = self._sympify(func1_str) - self._sympify(func2_str)
+        f = self._lambdify(equation)
+        fprime = self._derivative(equation)
+        coarse_width = 8 / self.numeric_density
+        chunk_width = self.chunk_samples * coarse_width
+        token = self._cancels
+        last = None
+        lo = x_range[0]
+        while lo < x_range[1]:
+            # Neighbouring chunks share their boundary sample, so no sign
+            # change is lost between them; a root on the boundary is
+            # dropped the second time round
+            hi = min(lo + chunk_width, x_range[1])
+            if hi <= lo:  # chunk_width below float resolution at lo
+                hi = x_range[1]
+            initial_points = round((hi - lo) / coarse_width) + 1
+            with self._cancellable(token):
+                self._check_cancelled()
+                chunk = self._bracket_roots(f, (lo, hi), initial_points,
+                                            8 * self.chunk_samples, fprime)
+            for root in self._clean_solutions(chunk, x_range):
+                # Same duplicate test as _clean_solutions, across chunks
+                if last is None or abs(root - last) > self.dedup_atol + self.dedup_rtol * abs(last):
+                    yield root
+                    last = root
+            lo = hi
+
     def _numeric_solve(self, 
                      equation: sp.Expr, 
                      x_range: Tuple[float, float]
                      ) -> List[float]:
         """Numerical solution with adaptive sampling"""
-        f = sp.lambdify(self.x, equation, modules=['numpy'])
-        total_points = int((x_range[1] - x_range[0]) * self.numeric_density)
-        x_vals = np.linspace(x_range[0], x_range[1], total_points)
-        
+        with tracing.stage('numeric.lambdify'):
+            f = self._lambdify(equation)
+            fprime = self._derivative(equation)
+        # Start at an eighth of numeric_density (and of the sample budget);
+        # refinement restores full density only where f needs it
+        initial_points = min(
+            (x_range[1] - x_range[0]) * self.numeric_density, self.max_samples
+        ) // 8
+        if fprime is not None:
+            fprime = tracing.counted(fprime)
+        return self._bracket_roots(tracing.counted(f), x_range, initial_points, self.max_samples,
+                                   fprime)
+
+    def _bracket_roots(self,
+                       f,
+                       x_range: Tuple[float, float],
+                       initial_points: int,
+                       max_points: int,
+                       fprime: Optional[Callable] = None
+                       ) -> List[float]:
+        """
+        Sample f adaptively over x_range and refine every sign change
+
+        With the derivative fprime, sign changes are refined by safeguarded
+        Newton, and the critical points of f are checked for roots where f
+        touches zero without crossing it (even multiplicity, tangency).
+        """
+        self._check_cancelled()
         try:
-            y_vals = f(x_vals)
+            with tracing.stage('numeric.sample'):
+                x_vals, y_vals = adaptive_sample(
+                    f, x_range, initial_points, max_points=max_points
+                )
+                tracing.note(samples=len(x_vals))
         except (ValueError, ZeroDivisionError):
             return []
 
-        # Find potential crossing points
+        # Find potential crossing points, skipping brackets that touch an
+        # undefined region (their sign change is an artifact of NaN)
         sign_changes = np.where(np.diff(np.signbit(y_vals)))[0]
-        solutions = []
-        
-        for idx in sign_changes:
-            try:
-                sol = optimize.fsolve(
-                    f, 
-                    x_vals[idx],
-                    xtol=1e-8,
-                    full_output=True
-                )[0][0]
-                if x_range[0] <= sol <= x_range[1]:
-                    solutions.append(sol)
-            except (RuntimeWarning, optimize.nonlin.NoConvergence):
-                continue
-                
-        return solutions
+        sign_changes = sign_changes[
+            ~np.isnan(y_vals[sign_changes]) & ~np.isnan(y_vals[sign_changes + 1])
+        ]
+        self._check_cancelled()
+        with tracing.stage('numeric.refine'):
+            tracing.note(brackets=len(sign_changes))
+            fa = y_vals[sign_changes]
+            fb = y_vals[sign_changes + 1]
+            roots, converged = refine_brackets(
+                f, x_vals[sign_changes], x_vals[sign_changes + 1], fa, fb, fprime=fprime
+            )
+
+            # A sign change across a pole converges onto the pole, where |f|
+            # grows instead of vanishing
+            with np.errstate(all='ignore'):
+                residual = np.abs(np.broadcast_to(np.asarray(f(roots), dtype=float), roots.shape))
+            keep = converged & (residual <= np.maximum(np.abs(fa), np.abs(fb)))
+        roots = roots[keep].tolist()
+        if fprime is not None:
+            self._check_cancelled()
+            with tracing.stage('numeric.tangency'):
+                touching = tangent_roots(f, fprime, x_vals, self.tangency_atol, y_vals)
+                tracing.note(roots=len(touching))
+            # Near a touching root f is rounding noise, so sign changes there
+            # refine poorly; the critical point is the accurate estimate
+            if len(touching) and len(roots):
+                roots = np.asarray(roots)
+                pos = np.searchsorted(touching, roots)
+                nearest = np.minimum(np.abs(roots - touching[np.maximum(pos - 1, 0)]),
+                                     np.abs(roots - touching[np.minimum(pos, len(touching) - 1)]))
+                roots = roots[nearest > self.dedup_atol + self.dedup_rtol * np.abs(roots)].tolist()
+            roots += touching.tolist()
+        return roots
 
     def _clean_solutions(self, 
                        raw_solutions: List[float], 
                        x_range: Tuple[float, float]
                        ) -> List[float]:
-        """Deduplicate and validate solutions"""
+        """
+        Deduplicate and validate solutions
+        
+        Values further than zero_atol from 0 are rounded to round_decimals
+        (None disables rounding). A root is a duplicate when it lies within
+        dedup_atol + dedup_rtol * |kept| of the last kept root; after
+        sorting, that is the only kept root it can be close to, so one
+        sweep suffices.
+        """
+        sols = self._round_roots(np.sort(np.asarray(raw_solutions, dtype=float).ravel()))
+        sols = sols[(sols >= x_range[0]) & (sols <= x_range[1])]
+
         unique_solutions = []
-        for sol in sorted(raw_solutions):
-            # Check precision and range
-            if not np.isclose(sol, 0, atol=1e-12):
-                sol = round(sol, 8)
-                
-            if (x_range[0] <= sol <= x_range[1] and 
-                not any(np.isclose(sol, s, atol=1e-6) for s in unique_solutions)):
+        last = None
+        atol, rtol = self.dedup_atol, self.dedup_rtol
+        for sol in sols.tolist():
+            if last is None or abs(sol - last) > atol + rtol * abs(last):
                 unique_solutions.append(sol)
-                
-        return unique_solutions
\ No newline at end of file
+                last = sol
+        return unique_solutions
+
+    def _round_roots(self, sols: np.ndarray) -> np.ndarray:
+        """Round to round_decimals, leaving values within zero_atol of 0 alone"""
+        if self.round_decimals is None:
+            return sols
+        return np.where(
+            np.abs(sols) <= self.zero_atol, sols, np.round(sols, self.round_decimals)
+        )
@@ -0,0 +1,154 @@
+"""
+Roots of f(x, p) = 0 for many values of a parameter p at once
+
+f is evaluated on one 2-D grid (parameter values x x samples), every
+sign change in every row becomes a bracket, and all brackets are refined
+together by refine_brackets. Continuation then looks for roots the grid
+missed (pairs closer than a grid cell, roots near a tangency): the roots
+found for one parameter value predict those of its neighbours, which are
+probed around the predictions. Probes that bracket a root not found yet
+are refined, again all at once, and this repeats from the rows that
+gained roots until none do.
+"""
+from typing import Callable, List, NamedTuple, Optional, Tuple
+import numpy as np
+from solver.refine import refine_brackets
+
+class SweepResult(NamedTuple):
+    parameters: np.ndarray    # Parameter values, in input order
+    roots: List[np.ndarray]   # Sorted roots for each parameter value
+
+    def points(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(parameter, root) as two flat arrays, one entry per root"""
+        counts = [len(r) for r in self.roots]
+        return np.repeat(self.parameters, counts), np.concatenate(self.roots or [np.empty(0)])
+
+def _evaluate(f: Callable, x: np.ndarray, p: np.ndarray) -> np.ndarray:
+    with np.errstate(all='ignore'):
+        y = np.asarray(f(x, p), dtype=float)
+    return np.broadcast_to(y, np.broadcast(x, p).shape).copy()
+
+def _refine(f: Callable,
+            params: np.ndarray,
+            rows: np.ndarray,
+            lo: np.ndarray,
+            hi: np.ndarray,
+            flo: np.ndarray,
+            fhi: np.ndarray
+            ) -> Tuple[np.ndarray, np.ndarray]:
+    """Refine brackets of any rows together; drop unconverged ones and poles"""
+    roots, converged = refine_brackets(f, lo, hi, flo, fhi, args=(params[rows],))
+    # A sign change across a pole converges onto the pole, where |f|
+    # grows instead of vanishing
+    residual = np.abs(_evaluate(f, roots, params[rows]))
+    keep = converged & (residual <= np.maximum(np.abs(flo), np.abs(fhi)))
+    return rows[keep], roots[keep]
+
+def merge_roots(rows: np.ndarray,
+                roots: np.ndarray,
+                atol: float,
+                rtol: float
+                ) -> Tuple[np.ndarray, np.ndarray]:
+    """Sort by (row, root) and drop roots within atol + rtol * |root| of their predecessor"""
+    order = np.lexsort((roots, rows))
+    rows, roots = rows[order], roots[order]
+    keep = np.ones(len(rows), dtype=bool)
+    keep[1:] = (rows[1:] != rows[:-1]) | (roots[1:] - roots[:-1] > atol + rtol * np.abs(roots[1:]))
+    return rows[keep], roots[keep]
+
+def unexplained(rows: np.ndarray,
+                 roots: np.ndarray,
+                 cand_rows: np.ndarray,
+                 lo: np.ndarray,
+                 hi: np.ndarray) -> np.ndarray:
+    """Mask of candidate brackets [lo, hi] holding no known root of their row"""
+    # Complex numbers sort by real then imaginary part: (row, x) order
+    known = np.sort(rows + 1j * roots)
+    first = np.searchsorted(known, cand_rows + 1j * lo, side='left')
+    last = np.searchsorted(known, cand_rows + 1j * hi, side='right')
+    return first == last
+
+def _probes(rows: np.ndarray,
+            roots: np.ndarray,
+            frontier: np.ndarray,
+            n_params: int,
+            dx: float,
+            x_range: Tuple[float, float]
+            ) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Probe points, sorted by (row, x), for the neighbours of frontier rows
+
+    The roots of a frontier row predict those of the rows next to it; each
+    prediction is probed along with one grid cell either side, and the
+    midpoint between consecutive roots catches a pair of roots that has
+    closed in to less than a cell apart.
+    """
+    mask = np.isin(rows, frontier)
+    rows, roots = rows[mask], roots[mask]
+    same = rows[1:] == rows[:-1]
+    source_rows = np.concatenate([rows, rows, rows, rows[1:][same]])
+    source_x = np.concatenate([roots - dx, roots, roots + dx,
+                               0.5 * (roots[1:] + roots[:-1])[same]])
+    probe_rows = np.concatenate([source_rows - 1, source_rows + 1])
+    probe_x = np.clip(np.concatenate([source_x, source_x]), x_range[0], x_range[1])
+    inside = (probe_rows >= 0) & (probe_rows < n_params)
+    probe_rows, probe_x = probe_rows[inside], probe_x[inside]
+    order = np.lexsort((probe_x, probe_rows))
+    return probe_rows[order], probe_x[order]
+
+def sweep_roots(f: Callable,
+                params: np.ndarray,
+                x_range: Tuple[float, float],
+                points: int,
+                atol: float = 1e-6,
+                rtol: float = 1e-5,
+                max_passes: Optional[int] = None
+                ) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    All roots in x_range of f(x, p) = 0 for each p in params
+
+    Args:
+        f: Vectorized f(x, p), broadcasting over both arguments
+        params: 1-D array of parameter values
+        x_range: Search range (min, max)
+        points: Grid samples per parameter value
+        atol, rtol: Roots closer than atol + rtol * |root| are merged
+        max_passes: Cap on continuation passes (default: one per parameter
+            value, as each pass extends a branch by one row)
+
+    Returns:
+        (rows, roots): index into params and root, sorted by (row, root)
+    """
+    params = np.asarray(params, dtype=float)
+    x = np.linspace(x_range[0], x_range[1], max(int(points), 2))
+    dx = x[1] - x[0]
+    y = _evaluate(f, x[np.newaxis, :], params[:, np.newaxis])
+
+    # Sign changes between neighbouring samples, skipping undefined ones
+    change = (np.signbit(y[:, 1:]) != np.signbit(y[:, :-1])) \
+        & ~np.isnan(y[:, 1:]) & ~np.isnan(y[:, :-1])
+    rows, cols = np.nonzero(change)
+    rows, roots = _refine(f, params, rows, x[cols], x[cols + 1],
+                          y[rows, cols], y[rows, cols + 1])
+    rows, roots = merge_roots(rows, roots, atol, rtol)
+
+    # Continuation from the rows that gained roots, until none do
+    frontier = np.unique(rows)
+    for _ in range(len(params) if max_passes is None else max_passes):
+        probe_rows, probe_x = _probes(rows, roots, frontier, len(params), dx, x_range)
+        fp = _evaluate(f, probe_x, params[probe_rows])
+        # Brackets between consecutive probes of one row
+        candidate = (probe_rows[1:] == probe_rows[:-1]) & (probe_x[1:] > probe_x[:-1]) \
+            & (np.signbit(fp[1:]) != np.signbit(fp[:-1])) & ~np.isnan(fp[1:]) & ~np.isnan(fp[:-1])
+        idx = np.flatnonzero(candidate)
+        idx = idx[unexplained(rows, roots, probe_rows[idx], probe_x[idx], probe_x[idx + 1])]
+        if not idx.size:
+            break
+        new_rows, new_roots = _refine(f, params, probe_rows[idx], probe_x[idx], probe_x[idx + 1],
+                                      fp[idx], fp[idx + 1])
+        if not new_rows.size:
+            break
+        rows, roots = merge_roots(np.concatenate([rows, new_rows]),
+                                  np.concatenate([roots, new_roots]), atol, rtol)
+        frontier = np.unique(new_rows)
+    return rows, roots
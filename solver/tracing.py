@@ -0,0 +1,301 @@
+"""
+Per-stage instrumentation for EquationSolver.solve
+
+solve_detailed always times its stages (that is where SolveReport.timings
+comes from). With solver.tracer set, each solve also becomes a
+structured, JSON-serializable record handed to the tracer's sinks:
+
+    {"f1": "x**2", "f2": "4", "x_range": [-10, 10], "seconds": 0.012,
+     "roots": 2, "timed_out": false, "error": null,
+     "stages": {"sympify": {"seconds": ..., "evaluations": 0, "points": 0},
+                "numeric.sample": {"seconds": ..., "evaluations": 9,
+                                   "points": 2500, "peak_kib": 120.5}, ...},
+     "profile": null}
+
+Stages nest by name: "numeric" is the whole numeric solve and
+"numeric.sample" / "numeric.refine" its parts. evaluations and points
+count calls of the lambdified equation and the x values passed to it.
+With memory=True every stage also gets its tracemalloc peak, and with
+profile_over set solves are run under cProfile and those slower than
+profile_over seconds carry their top functions.
+
+    solver.tracer = Tracer(JsonlSink("trace.jsonl"), memory=True, profile_over=1.0)
+    ...
+    summary = aggregate(read_jsonl("trace.jsonl"))
+
+or from the shell: python -m solver.tracing trace.jsonl
+
+Solver code reports through stage(), counted() and note(), which do
+nothing outside an active trace. The active trace lives in a ContextVar,
+so solves running on different threads do not mix. A symbolic stage run
+in the killable worker process shows up as one opaque stage.
+"""
+import cProfile
+import json
+import os
+import pstats
+import time
+import tracemalloc
+import warnings
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from threading import Lock
+from typing import Callable, Dict, IO, Iterable, Iterator, List, Optional, Union
+import numpy as np
+
+_active: ContextVar[Optional["Trace"]] = ContextVar("trace", default=None)
+
+class Trace:
+    """Stage statistics for one solve"""
+
+    def __init__(self, memory: bool = False):
+        self.memory = memory
+        self.stages = {}  # Stage name -> stats dict, in order first entered
+        self.profile = None  # cProfile.Profile, while profiling
+        self._stack = []  # [stats, tracemalloc base, peak so far] per open stage
+
+    def _stats(self, name: str) -> dict:
+        stats = self.stages.get(name)
+        if stats is None:
+            stats = self.stages[name] = {'seconds': 0.0, 'evaluations': 0, 'points': 0}
+            if self.memory:
+                stats['peak_kib'] = 0.0
+        return stats
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[dict]:
+        """Time a stage; re-entering a name adds to its totals"""
+        stats = self._stats(name)
+        memory = self.memory and tracemalloc.is_tracing()
+        if memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if self._stack:
+                # Fold in the enclosing stage's peak so far; reset_peak loses it
+                parent = self._stack[-1]
+                parent[2] = max(parent[2], peak - parent[1])
+            tracemalloc.reset_peak()
+        else:
+            current = 0
+        frame = [stats, current, 0]
+        self._stack.append(frame)
+        start = time.perf_counter()
+        try:
+            yield stats
+        finally:
+            stats['seconds'] += time.perf_counter() - start
+            self._stack.pop()
+            if memory:
+                peak = max(frame[2], tracemalloc.get_traced_memory()[1] - current)
+                stats['peak_kib'] = max(stats['peak_kib'], peak / 1024)
+                if self._stack:
+                    parent = self._stack[-1]
+                    parent[2] = max(parent[2], peak + current - parent[1])
+
+    def counted(self, f: Callable) -> Callable:
+        """Wrap f so calls and evaluated points are added to the open stages"""
+        def wrapper(x):
+            size = np.size(x)
+            for stats, _, _ in self._stack:
+                stats['evaluations'] += 1
+                stats['points'] += size
+            return f(x)
+        return wrapper
+
+    def note(self, **values):
+        """Attach values (counts, sizes, flags) to the innermost open stage"""
+        if self._stack:
+            self._stack[-1][0].update(values)
+
+    def timings(self) -> Dict[str, float]:
+        """Wall-clock seconds of the top-level stages"""
+        return {name: stats['seconds'] for name, stats in self.stages.items() if '.' not in name}
+
+    @contextmanager
+    def activate(self, profile: bool = False):
+        """Make this the trace that stage(), counted() and note() report to"""
+        token = _active.set(self)
+        started_tracing = self.memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        if profile:
+            self.profile = cProfile.Profile()
+            try:
+                self.profile.enable()
+            except ValueError:  # Another profiler is already running
+                self.profile = None
+        try:
+            yield self
+        finally:
+            if self.profile is not None:
+                self.profile.disable()
+            if started_tracing:
+                tracemalloc.stop()
+            _active.reset(token)
+
+    def profile_summary(self, top: int = 25) -> List[dict]:
+        """Functions with the most cumulative time, from the cProfile capture"""
+        if self.profile is None:
+            return []
+        rows = []
+        for (filename, line, name), (_, calls, tottime, cumtime, _) in \
+                pstats.Stats(self.profile).stats.items():
+            rows.append({'function': f"{os.path.basename(filename)}:{line}({name})",
+                         'calls': calls, 'tottime': tottime, 'cumtime': cumtime})
+        rows.sort(key=lambda row: row['cumtime'], reverse=True)
+        return rows[:top]
+
+def stage(name: str):
+    """Context manager timing a stage of the active trace; no-op without one"""
+    trace = _active.get()
+    return nullcontext() if trace is None else trace.stage(name)
+
+def counted(f: Callable) -> Callable:
+    """f, counting its evaluations when a trace is active"""
+    trace = _active.get()
+    return f if trace is None else trace.counted(f)
+
+def note(**values):
+    """Attach values to the innermost stage of the active trace, if any"""
+    trace = _active.get()
+    if trace is not None:
+        trace.note(**values)
+
+class Tracer:
+    """
+    Turns solves into records for a set of sinks
+
+    Args:
+        sinks: Callables receiving each record dict
+        memory: Also record tracemalloc peaks (slows allocation-heavy stages)
+        profile_over: Run solves under cProfile and keep the profile of
+            those slower than this many seconds; None disables profiling
+        profile_top: Functions kept per profile
+    """
+
+    def __init__(self,
+                 *sinks: Callable[[dict], None],
+                 memory: bool = False,
+                 profile_over: Optional[float] = None,
+                 profile_top: int = 25):
+        self.sinks = list(sinks)
+        self.memory = memory
+        self.profile_over = profile_over
+        self.profile_top = profile_top
+
+    def emit(self, trace: Trace, seconds: float, **fields):
+        """
+        Build the record for a finished solve and hand it to every sink
+
+        Never raises, so tracing cannot fail a solve: a sink that raises
+        (full disk, closed file) gets a RuntimeWarning and is skipped.
+        """
+        record = {**fields, 'seconds': seconds, 'stages': trace.stages, 'profile': None}
+        if self.profile_over is not None and seconds >= self.profile_over:
+            try:
+                record['profile'] = trace.profile_summary(self.profile_top)
+            except Exception as e:
+                warnings.warn(f"Trace profile dropped: {type(e).__name__}: {e}", RuntimeWarning)
+        for sink in self.sinks:
+            try:
+                sink(record)
+            except Exception as e:
+                warnings.warn(f"Trace sink {sink!r} failed: {type(e).__name__}: {e}",
+                              RuntimeWarning)
+
+class JsonlSink:
+    """
+    Appends records as JSON lines to a file
+
+    Pickles by path, so a tracer holding it can be handed to worker
+    processes; each process opens the file itself, with O_APPEND, and
+    writes each line with one os.write. Lines from different processes
+    therefore do not interleave, however long (e.g. with a profile).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = Lock()
+        self._fd = None
+        self._pid = None
+
+    def __repr__(self):
+        return f"JsonlSink({self.path!r})"
+
+    def __getstate__(self):
+        return {'path': self.path}
+
+    def __setstate__(self, state):
+        self.__init__(state['path'])
+
+    def __call__(self, record: dict):
+        line = (json.dumps(record) + "\n").encode()
+        with self._lock:
+            if self._fd is None or self._pid != os.getpid():
+                self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+                self._pid = os.getpid()
+            os.write(self._fd, line)
+
+    def close(self):
+        with self._lock:
+            if self._fd is not None and self._pid == os.getpid():
+                os.close(self._fd)
+            self._fd = None
+
+def read_jsonl(source: Union[str, IO[str]]) -> Iterator[dict]:
+    """Records from a JSONL file written by JsonlSink"""
+    lines = open(source) if isinstance(source, str) else source
+    try:
+        for line in lines:
+            if line.strip():
+                yield json.loads(line)
+    finally:
+        if isinstance(source, str):
+            lines.close()
+
+def aggregate(records: Iterable[dict]) -> Dict[str, Dict[str, float]]:
+    """
+    Per-stage distribution over many records
+
+    Returns:
+        {stage: {"count", "total", "mean", "p50", "p95", "p99", "max",
+        "evaluations", "points"}}, with the whole solve under "solve"
+    """
+    seconds, counts = {}, {}
+    for record in records:
+        seconds.setdefault('solve', []).append(record['seconds'])
+        for name, stats in record['stages'].items():
+            seconds.setdefault(name, []).append(stats['seconds'])
+            totals = counts.setdefault(name, {'evaluations': 0, 'points': 0})
+            totals['evaluations'] += stats.get('evaluations', 0)
+            totals['points'] += stats.get('points', 0)
+    summary = {}
+    for name, values in seconds.items():
+        values = np.asarray(values)
+        p50, p95, p99 = np.percentile(values, [50, 95, 99])
+        summary[name] = {'count': len(values), 'total': float(values.sum()),
+                         'mean': float(values.mean()), 'p50': float(p50),
+                         'p95': float(p95), 'p99': float(p99), 'max': float(values.max()),
+                         **counts.get(name, {})}
+    return summary
+
+def main(argv: Optional[List[str]] = None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Per-stage summary of JsonlSink trace files")
+    parser.add_argument("files", nargs="+")
+    args = parser.parse_args(argv)
+    records = [record for path in args.files for record in read_jsonl(path)]
+    print(f"{'stage':<20} {'count':>7} {'total s':>9} {'p50 ms':>9} {'p95 ms':>9} "
+          f"{'p99 ms':>9} {'max ms':>9} {'points':>11}")
+    for name, row in aggregate(records).items():
+        print(f"{name:<20} {row['count']:>7} {row['total']:>9.2f} {row['p50'] * 1e3:>9.2f} "
+              f"{row['p95'] * 1e3:>9.2f} {row['p99'] * 1e3:>9.2f} {row['max'] * 1e3:>9.2f} "
+              f"{row.get('points', 0):>11}")
+    slowest = max(records, key=lambda record: record['seconds'], default=None)
+    if slowest is not None and slowest.get('profile'):
+        print(f"\nSlowest solve ({slowest['seconds']:.2f} s): "
+              f"{slowest['f1']} = {slowest['f2']}")
+        for row in slowest['profile'][:10]:
+            print(f"  {row['cumtime']:>8.3f} s  {row['calls']:>7}  {row['function']}")
+
+if __name__ == "__main__":
+    main()
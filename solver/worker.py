@@ -0,0 +1,109 @@
+import multiprocessing as mp
+from concurrent.futures import CancelledError
+from threading import Lock
+from typing import Any, Callable, Optional
+
+def _serve(conn):
+    """Worker process loop: run (fn, args) jobs until told to stop"""
+    while True:
+        job = conn.recv()
+        if job is None:
+            break
+        fn, args = job
+        try:
+            conn.send((True, fn(*args)))
+        except Exception as e:
+            conn.send((False, e))
+
+class KillableWorker:
+    """Persistent worker process running one call at a time under a time limit"""
+    def __init__(self):
+        self._process = None
+        self._conn = None
+        self._lock = Lock()  # One call at a time
+        self._process_lock = Lock()  # Held while the process is started or stopped
+        self._cancelled = False
+
+    @staticmethod
+    def available() -> bool:
+        """Daemonic processes (e.g. batch workers) cannot start children"""
+        return not mp.current_process().daemon
+
+    def _start(self):
+        ctx = mp.get_context()
+        self._conn, child_conn = ctx.Pipe()
+        self._process = ctx.Process(target=_serve, args=(child_conn,), daemon=True)
+        self._process.start()
+        child_conn.close()
+
+    def call(self, fn: Callable, args: tuple, timeout: Optional[float]) -> Any:
+        """
+        Run fn(*args) in the worker process
+
+        Args:
+            fn: Module-level (picklable) callable
+            args: Picklable positional arguments
+            timeout: Seconds to wait before killing the worker
+
+        Returns:
+            fn's return value. Exceptions raised by fn are re-raised here;
+            TimeoutError is raised when the limit is hit and CancelledError
+            when cancel() interrupts the call; either way the worker is
+            restarted on the next call.
+        """
+        with self._lock:
+            with self._process_lock:
+                # A cancel() between calls leaves a terminated (if not yet dead) process
+                if self._process is not None and (self._cancelled or not self._process.is_alive()):
+                    self._stop()
+                if self._process is None:
+                    self._start()
+                self._cancelled = False
+                conn = self._conn
+            try:
+                conn.send((fn, args))
+                finished = conn.poll(timeout)
+                if finished:
+                    ok, value = conn.recv()
+            except (EOFError, OSError):  # Pipe closed: cancel() or a crash
+                self.kill()
+                if self._cancelled:
+                    raise CancelledError() from None
+                raise RuntimeError("Worker process died") from None
+            if not finished:
+                self.kill()
+                raise TimeoutError(f"Worker call exceeded {timeout} s")
+        if not ok:
+            raise value
+        return value
+
+    def cancel(self):
+        """Interrupt a call running on another thread"""
+        with self._process_lock:
+            if self._process is not None:
+                # Set before terminating, so the interrupted call reports
+                # the closed pipe as a cancellation
+                self._cancelled = True
+                self._process.terminate()
+
+    def kill(self):
+        """Terminate the worker immediately"""
+        with self._process_lock:
+            self._stop()
+
+    def _stop(self):
+        if self._process is not None:
+            self._process.terminate()
+            self._process.join()
+            self._conn.close()
+            self._process = self._conn = None
+
+    def close(self):
+        """Stop the worker gracefully"""
+        if self._process is not None:
+            try:
+                self._conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            self._process.join(timeout=1)
+            self.kill()
@@ -0,0 +1,58 @@
+import pytest
+from solver.solver import EquationSolver
+from solver.batch import problem_key
+
+@pytest.fixture
+def solver():
+    return EquationSolver()
+
+def test_results_for_every_problem(solver):
+    """Test each input index gets exactly one result"""
+    problems = [("x**2", "4", (-5, 5)), ("x", "1", (-5, 5)), ("x", "0", (1, 2))]
+    results = sorted(solver.solve_many(problems, max_workers=2, chunksize=2))
+    assert [r.index for r in results] == [0, 1, 2]
+    assert results[0].solutions == pytest.approx([-2.0, 2.0])
+    assert results[1].solutions == pytest.approx([1.0])
+    assert results[2].solutions == []
+    assert all(r.error is None for r in results)
+
+def test_errors_reported_per_problem(solver):
+    """Test a failing problem does not abort the batch"""
+    problems = [("invalid_function(x)", "0", (-1, 1)), ("x", "0", (-1, 1))]
+    results = sorted(solver.solve_many(problems, max_workers=1))
+    assert results[0].error.startswith("NameError")
+    assert results[1].solutions == pytest.approx([0.0])
+
+def test_deduplication(solver, monkeypatch):
+    """Test identical problems are solved once"""
+    calls = []
+    solve = solver.solve
+    monkeypatch.setattr(solver, "solve", lambda *p: calls.append(p) or solve(*p))
+    problems = [("x", "1", (-5, 5)), (" x ", "1", [-5, 5]), ("x", "1", (-5, 5))]
+    results = list(solver.solve_many(problems, max_workers=0))
+    assert len(results) == 3
+    assert len(calls) == 1
+    assert problem_key(results[0].problem) == problem_key(results[1].problem)
+
+def test_equivalent_problems_solved_once(solver, monkeypatch):
+    """Test algebraically identical problems share one solve"""
+    calls = []
+    solve = solver.solve
+    monkeypatch.setattr(solver, "solve", lambda *p: calls.append(p) or solve(*p))
+    problems = [("x**2", "4", (-5, 5)), ("(x-2)*(x+2)", "0", (-5, 5)), ("8", "2*x^2", (-5, 5))]
+    results = sorted(solver.solve_many(problems, max_workers=0))
+    assert len(calls) == 1
+    assert all(r.solutions == pytest.approx([-2.0, 2.0]) for r in results)
+
+def test_timeout_does_not_stall_batch(solver):
+    """Test a slow problem is killed while the others finish"""
+    problems = [("sin(x)**5+cos(x)**3-x", "1", (-10, 10))] + [
+        (f"x-{i}", "0", (-10, 10)) for i in range(5)
+    ]
+    results = sorted(solver.solve_many(problems, max_workers=2, chunksize=3, timeout=1))
+    assert results[0].error.startswith("TimeoutError")
+    assert [r.solutions for r in results[1:]] == [[float(i)] for i in range(5)]
+
+def test_settings_forwarded(solver):
+    solver.numeric_density = 10
+    assert solver._settings()["numeric_density"] == 10
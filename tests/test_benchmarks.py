@@ -0,0 +1,28 @@
+import pytest
+from benchmarks.suite import CORPUS, Case, bench_case, compare, measure
+
+def results(**metrics):
+    return {"results": {key: {"seconds": s, "peak_kib": m} for key, (s, m) in metrics.items()}}
+
+def test_compare_flags_only_real_regressions():
+    """Test slowdowns past tolerance fail while noise and improvements pass"""
+    baseline = results(a=(0.010, 100), b=(0.010, 100), c=(0.00001, 1), d=(0.010, 100))
+    current = results(a=(0.020, 100), b=(0.011, 90), c=(0.00005, 40), d=(0.005, 1000),
+                      new=(1.0, 1))
+    regressions = compare(current, baseline, time_tolerance=0.25, memory_tolerance=0.25)
+    assert len(regressions) == 2
+    assert regressions[0].startswith("a: seconds") and regressions[1].startswith("d: peak_kib")
+
+def test_measure_excludes_setup():
+    """Test setup time and memory are not charged to the measured stage"""
+    metrics = measure(lambda data: sum(data), lambda: list(range(200_000)), repeat=3)
+    assert metrics["runs"] == 3
+    assert metrics["peak_kib"] < 100
+
+def test_stages_measured_per_case():
+    """Test each solver stage gets time and memory; parse is skipped outside the grammar"""
+    stages = ["parse", "numeric", "clean"]
+    parsed = bench_case(CORPUS[0], stages, repeat=1, budget=1.0)
+    assert all(parsed[s]["seconds"] > 0 and parsed[s]["peak_kib"] >= 0 for s in stages)
+    unparsed = bench_case(Case("sin", "oscillatory", "sin(x)", "0", (-1, 1)), stages, 1, 1.0)
+    assert unparsed["parse"] is None and unparsed["numeric"] is not None
@@ -0,0 +1,71 @@
+import pytest
+from cache.cache import ExpressionCache, ResultCache
+from parser.parser import Parser
+from solver.solver import EquationSolver
+
+@pytest.fixture
+def cache():
+    return ExpressionCache(max_size=2)
+
+def test_miss_then_hit(cache):
+    """Test factory runs only on the first lookup"""
+    calls = []
+    factory = lambda: calls.append(1) or "value"
+    assert cache.get("x+1", "code", factory) == "value"
+    assert cache.get("x+1", "code", factory) == "value"
+    assert len(calls) == 1
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+def test_key_normalization(cache):
+    """Test whitespace variants share one entry"""
+    cache.get(" x + 1 ", "tokens", lambda: ("x", "+", "1"))
+    assert cache.get("x  +  1", "tokens", lambda: None) == ("x", "+", "1")
+    assert len(cache) == 1
+
+def test_lru_eviction(cache):
+    """Test least recently used entry is evicted first"""
+    cache.get("a", "code", lambda: 1)
+    cache.get("b", "code", lambda: 2)
+    cache.get("a", "code", lambda: 1)
+    cache.get("c", "code", lambda: 3)
+    assert "a" in cache and "c" in cache
+    assert "b" not in cache
+    assert cache.stats()["evictions"] == 1
+
+def test_failed_factory_not_cached(cache):
+    """Test exceptions propagate and nothing is stored"""
+    with pytest.raises(SyntaxError):
+        cache.get("x+", "code", lambda: compile("x+", "<f>", "eval"))
+    assert len(cache) == 0
+
+def test_unknown_field(cache):
+    with pytest.raises(KeyError):
+        cache.get("x", "bogus", lambda: 1)
+
+def test_shared_between_components():
+    """Test re-solving a seen equation skips symbolic work"""
+    cache = ExpressionCache()
+    parser = Parser(cache=cache)
+    solver = EquationSolver(cache=cache)
+    f1, _ = parser.parse("x^2")
+    parser.parse("x^2")
+    solver.solve(f1, "4", (-5, 5))
+    misses = cache.stats()["misses"]
+    solver.solve(f1, "4", (-5, 5))
+    assert cache.stats()["misses"] == misses
+    assert cache.stats()["hits"] >= 2
+
+def test_result_cache_ttl_and_lru():
+    """Test result entries expire after ttl and the oldest is evicted first"""
+    now = [0.0]
+    results = ResultCache(max_size=2, ttl=10, clock=lambda: now[0])
+    results.put("a", [1.0])
+    results.put("b", [2.0])
+    assert results.get("a") == [1.0]
+    results.put("c", [3.0])  # Evicts "b", the least recently used
+    assert results.get("b") is None
+    now[0] = 11
+    assert results.get("a") is None and results.get("c") is None
+    stats = results.stats()
+    assert stats["evictions"] == 1 and stats["expirations"] == 2 and stats["size"] == 0
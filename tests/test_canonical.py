@@ -0,0 +1,53 @@
+import time
+import pytest
+from parser import canonical
+from parser.canonical import canonical_equation, equation_hash
+from solver.batch import problem_key
+
+@pytest.mark.parametrize("f1, f2", [
+    ("(x-2)*(x+2)", "0"),
+    ("x*x", "4"),
+    ("4", "x^2"),
+    ("2*x^2", "8"),
+    ("x**2", "4"),
+    ("2 - 6 + x^2", "0"),
+])
+def test_equivalent_forms_share_key(f1, f2):
+    """Test reordered, expanded, rescaled and swapped inputs canonicalize alike"""
+    assert canonical_equation(f1, f2) == canonical_equation("x^2-4", "0") == "1*x^2 + -4 = 0"
+    assert equation_hash(f1, f2) == equation_hash("x^2-4", "0")
+
+def test_opaque_parts_normalized_inside():
+    """Test call arguments and divisors are canonicalized but kept opaque"""
+    assert canonical_equation("sqrt(2*x)+1", "x") == canonical_equation("x", "1+sqrt(x*2)")
+    assert canonical_equation("2/(2*x-2)", "2") == canonical_equation("1/(x-1)", "2")
+    # Cancelling would drop the hole at x = 0
+    assert canonical_equation("x/x", "1") != canonical_equation("1", "1")
+    assert canonical_equation("sqrt(x)^2", "x") != canonical_equation("x", "x")
+
+def test_different_equations_differ():
+    """Test inequivalent equations never collide"""
+    forms = {canonical_equation(f1, f2) for f1, f2 in [
+        ("x^2", "4"), ("x^2", "9"), ("x^3", "4"), ("x", "2"), ("log10(x)", "2"),
+        ("sqrt(x)", "2"), ("2^x", "4"), ("x^2", "4*x"),
+    ]}
+    assert len(forms) == 8
+
+def test_parse_errors_raise():
+    """Test unparsable input is reported rather than keyed"""
+    with pytest.raises(ValueError):
+        canonical_equation("x^", "1")
+
+def test_nested_powers_stay_small():
+    """Test nested powers canonicalize quickly into a short key"""
+    start = time.perf_counter()
+    key = canonical_equation("((x+1)^16)^14", "sqrt(sqrt(sqrt(x^16)^16)^16)")
+    assert time.perf_counter() - start < 1.0
+    assert len(key) < 200
+
+def test_work_cap_falls_back_to_text(monkeypatch):
+    """Test equations over the work budget raise, and batch keys fall back to their text"""
+    monkeypatch.setattr(canonical, "MAX_WORK", 100)
+    with pytest.raises(canonical.TooComplex):
+        canonical_equation("(x+1)^16", "0")
+    assert problem_key(("(x+1)^16", "0", (-1, 1))) == ("(x+1)^16", "0", (-1.0, 1.0))
@@ -0,0 +1,56 @@
+import io
+import json
+import os
+import subprocess
+import sys
+import pytest
+import cli
+
+def run_lines(text, **kwargs):
+    out = io.StringIO()
+    failures = cli.run(io.StringIO(text), out, **kwargs)
+    return failures, [json.loads(line) for line in out.getvalue().splitlines()]
+
+def test_text_and_jsonl_input():
+    """Test both input forms solve and stream one record per equation"""
+    failures, records = run_lines(
+        'x^2 = 4\n'
+        '# comment\n'
+        '\n'
+        '{"f1": "sqrt(x)", "f2": "2", "id": "a", "x_range": [0, 100]}\n'
+    )
+    assert failures == 0
+    assert [r["index"] for r in records] == [0, 1]
+    assert records[0]["roots"] == pytest.approx([-2, 2])
+    assert records[1]["id"] == "a" and records[1]["roots"] == pytest.approx([4])
+
+def test_errors_reported_per_line():
+    """Test bad lines produce error records without stopping the stream"""
+    failures, records = run_lines('x^ = 1\nnonsense\n{"f1": "x"}\nx = 1\n')
+    assert failures == 3
+    assert records[0]["errors"] == ["f1: Unexpected end of expression."]
+    assert records[1]["errors"] == ["Expected 'f1 = f2'."]
+    assert records[2]["errors"] == ["Invalid JSON request: missing 'f2'."]
+    assert records[3]["roots"] == [1.0] and not records[3]["errors"]
+
+@pytest.mark.parametrize("workers, symbolic_timeout", [(0, 5.0), (2, None)])
+def test_timeout_per_mode(monkeypatch, workers, symbolic_timeout):
+    """Test --timeout bounds the symbolic stage inline, the whole solve with workers"""
+    seen = {}
+
+    def solve_many(solver, problems, max_workers=None, timeout=None):
+        seen.update(symbolic=solver.symbolic_timeout, timeout=timeout)
+        return iter(())
+    monkeypatch.setattr(cli.EquationSolver, "solve_many", solve_many)
+    run_lines("x = 1\n", timeout=5.0, workers=workers)
+    assert seen == {"symbolic": symbolic_timeout, "timeout": 5.0}
+
+def test_no_gui_imports():
+    """Test the CLI never loads the GUI or plotting stack"""
+    code = ("import sys, cli; "
+            "print(sorted(m for m in sys.modules "
+            "if m.split('.')[0] in ('PySide2', 'matplotlib', 'gui', 'plotter')))")
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable, "-c", code], cwd=root,
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
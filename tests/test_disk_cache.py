@@ -0,0 +1,70 @@
+import multiprocessing as mp
+import pytest
+from cache.cache import ExpressionCache
+from cache.disk import DiskCache
+from solver.solver import EquationSolver
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "solutions.db")
+
+def test_survives_restart(path):
+    """Test entries written by one instance are read by a fresh one"""
+    first = DiskCache(path)
+    first.put("k", [1.0, 2.0], ["symbolic", "symbolic"])
+    first.close()
+    assert DiskCache(path).get("k") == ([1.0, 2.0], ["symbolic", "symbolic"])
+
+def test_size_bounded_lru(path):
+    """Test the least recently used rows are evicted past max_entries"""
+    store = DiskCache(path, max_entries=3)
+    for key in "abc":
+        store.put(key, [], [])
+    store.get("a")
+    store.put("d", [], [])
+    store.evict()
+    assert len(store) == 3
+    assert store.get("b") is None and store.get("a") is not None
+
+def _writer(args):
+    store, start = args
+    for i in range(start, start + 50):
+        store.put(f"key{i}", [float(i)], ["numeric"])
+    return True
+
+def test_concurrent_processes(path):
+    """Test several processes can write the same file at once"""
+    store = DiskCache(path)
+    with mp.get_context().Pool(4) as pool:
+        assert all(pool.map(_writer, [(store, 50 * i) for i in range(4)]))
+    assert len(store) == 200
+    assert store.get("key123") == ([123.0], ["numeric"])
+
+def test_solver_reuses_across_instances(path):
+    """Test a new solver answers from disk, keyed by range and settings"""
+    def solver():
+        s = EquationSolver(cache=ExpressionCache())
+        s.disk_cache = DiskCache(path)
+        return s
+    first = solver().solve_detailed("sqrt(x)+x", "3")
+    again = solver().solve_detailed("sqrt(x) + x", "3")
+    assert again.roots == first.roots and again.sources == first.sources
+    assert 'symbolic' not in again.timings and 'disk_cache' in again.timings
+
+    other = solver()
+    other.dedup_atol = 1e-3
+    other.solve("sqrt(x)+x", "3")
+    other.solve("sqrt(x)+x", "3", (0, 1))
+    assert other.disk_cache.stats()["misses"] == 2
+
+def test_timed_out_not_stored(path, monkeypatch):
+    """Test a numeric-only fallback after a symbolic timeout is not persisted"""
+    s = EquationSolver(cache=ExpressionCache())
+    s.disk_cache = DiskCache(path)
+    monkeypatch.setattr(s, "_symbolic_stage",
+                        lambda f1_str, f2_str, f1, f2, x_range: (f1 - f2, [], True))
+    assert s.solve_detailed("sqrt(x)+x", "3").timed_out
+    assert len(s.disk_cache) == 0
+    monkeypatch.undo()
+    assert not s.solve_detailed("sqrt(x)+x", "3").timed_out
+    assert len(s.disk_cache) == 1
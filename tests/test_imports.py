@@ -0,0 +1,27 @@
+import os
+import subprocess
+import sys
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY = ("sympy", "scipy", "matplotlib")
+
+def loaded_after(statement):
+    """Heavy top-level packages present after running statement in a fresh interpreter"""
+    code = (f"import sys; {statement}; "
+            f"print(' '.join(sorted({{m.split('.')[0] for m in sys.modules}} & set({HEAVY!r}))))")
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    return result.stdout.split()
+
+@pytest.mark.parametrize("module", ["solver.solver", "plotter.plotter", "cli", "service.server"])
+def test_import_is_lazy(module):
+    """Test importing a module defers its heavy dependencies"""
+    assert loaded_after(f"import {module}") == []
+
+def test_solver_construction_is_lazy():
+    """Test building a solver does not import SymPy until it solves"""
+    assert loaded_after("from solver.solver import EquationSolver; EquationSolver()") == []
+    assert loaded_after(
+        "from solver.solver import EquationSolver; EquationSolver().solve('x', '1')"
+    ) == ["sympy"]
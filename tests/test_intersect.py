@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+from parser.parser import Parser
+from solver.intersect import CurveSet, intersect_curves
+from solver.solver import EquationSolver
+
+@pytest.fixture
+def solver():
+    return EquationSolver()
+
+def test_matches_pairwise_solves(solver):
+    """Test every pair's intersections match solving that pair on its own"""
+    funcs = ["x^2", "4", "x", "x/(x^2+1)"]
+    nodes = [Parser().parse_ast(f)[0] for f in funcs]
+    found = solver.intersect_all(nodes, (-10, 10))
+    assert [p.x for p in found] == sorted(p.x for p in found)
+    for i in range(len(funcs)):
+        for j in range(i + 1, len(funcs)):
+            xs = [p.x for p in found if p.curves == (i, j)]
+            assert xs == pytest.approx(solver.solve(nodes[i], nodes[j]), abs=1e-7)
+    for p in found:
+        assert p.y == pytest.approx(solver._lambdify(solver._sympify(nodes[p.curves[0]]))(p.x))
+
+def test_evaluations_grow_linearly():
+    """Test each curve is called as often with 16 curves as with 4"""
+    calls = {}
+    for n in (4, 16):
+        counts = np.zeros(n, dtype=int)
+        def make(k):
+            def f(x):
+                counts[k] += 1
+                return np.sin(x + k) + 0.1 * k * x
+            return f
+        i, j, roots = intersect_curves(CurveSet([make(k) for k in range(n)]), (-10, 10), 2000)
+        assert len(np.unique(i * n + j)) > n  # Most pairs cross
+        assert np.sin(roots + i) + 0.1 * i * roots == pytest.approx(np.sin(roots + j) + 0.1 * j * roots)
+        calls[n] = counts.max()
+    assert calls[16] <= calls[4]
+
+def test_poles_and_domains(solver):
+    """Test sign changes across a pole or outside a domain are not intersections"""
+    found = solver.intersect_all(["1/(x-1)", "0", "sqrt(x)"], (-10, 10))
+    # 1/(x-1) changes sign at x = 1 without meeting 0; sqrt(x) is NaN below 0
+    assert [p.curves for p in found] == [(0, 2)]
+    assert found[0].x == pytest.approx(1.75487767)
+
+def test_fewer_than_two_curves(solver):
+    """Test a single function has no intersections"""
+    assert solver.intersect_all(["x"]) == []
+
+def test_touching_pairs_kept(solver):
+    """Test touching points found by solve() survive adding unrelated curves"""
+    assert solver.solve("x**2", "0") == [0.0]
+    found = solver.intersect_all(["x**2", "0", "100", "2*x-1"], (-20, 20))
+    assert [(p.x, p.curves) for p in found if p.curves in ((0, 1), (0, 3))] \
+        == [(0.0, (0, 1)), (1.0, (0, 3))]
+    assert [p.x for p in found if p.curves == (0, 2)] == pytest.approx([-10, 10])
+
+def test_near_miss_not_touching(solver):
+    """Test curves passing within tangency_atol without meeting do not intersect"""
+    found = solver.intersect_all(["sin(x)**2 + 1e-10", "0", "sin(x)**2"], (-4, 4))
+    assert [p.curves for p in found] == [(1, 2)] * 3
+    assert [p.x for p in found] == pytest.approx([-np.pi, 0, np.pi])
+
+def test_cancel(solver, monkeypatch):
+    """Test cancel() stops an all-pairs search between passes"""
+    from concurrent.futures import CancelledError
+    sample = CurveSet.sample
+    def cancelling(self, x, derivative=False):
+        solver.cancel()  # As if from another thread, while sampling
+        return sample(self, x, derivative)
+    monkeypatch.setattr(CurveSet, "sample", cancelling)
+    with pytest.raises(CancelledError):
+        solver.intersect_all(["x", "2*x", "sin(x)"])
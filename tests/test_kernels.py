@@ -0,0 +1,80 @@
+import pytest
+import numpy as np
+import sympy as sp
+from cache.cache import ExpressionCache
+from solver import kernels
+from solver.solver import EquationSolver
+
+x, a = sp.symbols('x a')
+
+EXPRESSIONS = [
+    "x**2*sin(x**2) + cos(x**2)/(1 + x**2)",
+    "1/(x - 1) - x",
+    "sqrt(x) + log(x, 10) - 2",
+    "2**x - x**3 - x**4 + 3",
+    "exp(-x)*sin(x) - x**-2 + Abs(x) - x**(3/2)",
+    "Piecewise((x, x > 0), (0, True)) + floor(x)",
+    "-x - sin(x)",
+    "x",
+    "3",
+]
+
+@pytest.mark.parametrize("backend", ["cse", "numexpr"])
+@pytest.mark.parametrize("text", EXPRESSIONS)
+def test_matches_lambdify(text, backend):
+    """Test kernels agree with lambdify, NaN for NaN, across chunk boundaries"""
+    expr = sp.sympify(text)
+    values = np.linspace(-10, 10, 3 * kernels.CHUNK + 7)
+    reference = sp.lambdify(x, expr, modules=['numpy'])
+    with np.errstate(all='ignore'):
+        expected = np.broadcast_to(reference(values), values.shape)
+        result = kernels.compile_kernel(expr, (x,), backend)(values)
+    assert result.shape == values.shape
+    assert np.allclose(result, expected, rtol=1e-12, atol=1e-12, equal_nan=True)
+
+def test_common_subexpressions_computed_once():
+    """Test a repeated subexpression becomes one operation writing into reused buffers"""
+    kernel = kernels.compile_kernel(sp.sympify("sin(x**2)*x**2 + cos(x**2)"), (x,), 'cse')
+    assert kernel.source.count("square(") == 1
+    assert kernel.count == 2 and "out=out" in kernel.source
+
+def test_scalars_and_broadcasting():
+    """Test scalar input gives a scalar and arguments broadcast like lambdify"""
+    expr = a * x**2 - sp.sin(a * x)
+    kernel = kernels.compile_kernel(expr, (x, a), 'cse')
+    reference = sp.lambdify((x, a), expr, modules=['numpy'])
+    assert np.isscalar(kernel(2.0, 0.5)) and kernel(2.0, 0.5) == pytest.approx(reference(2.0, 0.5))
+    xs, ps = np.linspace(-3, 3, 50_001)[np.newaxis, :], np.linspace(-1, 1, 7)[:, np.newaxis]
+    assert np.allclose(kernel(xs, ps), reference(xs, ps))
+
+def test_results_are_not_buffers():
+    """Test results survive later calls that reuse the buffer pool"""
+    kernel = kernels.compile_kernel(sp.sympify("sin(x)**2 + x"), (x,), 'cse')
+    first = kernel(np.arange(5.0))
+    kernel(np.arange(5.0, 10.0))
+    assert np.allclose(first, np.sin(np.arange(5.0))**2 + np.arange(5.0))
+
+def test_fallbacks_and_unknown_backend():
+    """Test complex constants fall back to lambdify and unknown backends are rejected"""
+    kernel = kernels.compile_kernel(x + sp.log(-1), (x,), 'cse')
+    assert not isinstance(kernel, kernels.UfuncKernel)
+    with pytest.raises(ValueError):
+        kernels.compile_kernel(x, (x,), 'fortran')
+
+def test_numexpr_kernel():
+    """Test the numexpr backend is used when numexpr is installed"""
+    pytest.importorskip("numexpr")
+    kernel = kernels.compile_kernel(sp.sympify("sin(x)**2 + x"), (x,), 'numexpr')
+    assert not isinstance(kernel, kernels.UfuncKernel)
+    assert np.allclose(kernel(np.arange(5.0)), np.sin(np.arange(5.0))**2 + np.arange(5.0))
+
+@pytest.mark.parametrize("backend", kernels.BACKENDS)
+def test_solver_evaluator(backend):
+    """Test every evaluator gives the same roots, sharing one cache without mixing callables"""
+    cache = ExpressionCache()
+    reference = EquationSolver(cache=cache)
+    solver = EquationSolver(cache=cache)
+    solver.evaluator = backend
+    for f1, f2 in [("x^3 - 2*x", "1"), ("sin(x)^2", "x/10"), ("(x-1)^2", "0")]:
+        assert solver.solve(f1, f2, (-10, 10)) == reference.solve(f1, f2, (-10, 10))
+    assert solver.solve_sweep("x^2", "a", "a", [1.0, 4.0], (-5, 5)).roots[1] == pytest.approx([-2, 2])
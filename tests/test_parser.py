@@ -1,4 +1,6 @@
 import pytest
+import numpy as np
+import sympy as sp
 from parser.parser import Parser
 
 @pytest.fixture
@@ -63,6 +65,11 @@ def test_unexpected_token(parser):
     assert len(errors) >= 1 #TODO: recheck this
     assert "Unexpected token: '+'." in errors
 
+@pytest.mark.parametrize("text", ["x^", "5 +", "sqrt(x) *", "x^2 -"])
+def test_trailing_operator(parser, text):
+    expr, errors = parser.parse(text)
+    assert errors == ["Unexpected end of expression."]
+
 def test_invalid_characters(parser):
     expr, errors = parser.parse("5 * x $ 2")
     assert len(errors) == 1
@@ -109,3 +116,39 @@ def test_minimal_expression(parser):
     expr, errors = parser.parse("x + 1")
     assert not errors
     assert expr == "x+1"
+
+# AST mode
+@pytest.mark.parametrize("text", [
+    "5*x^2 + sqrt(x)", "(x + 2) * (x - 3)", "log10(x + 5) / 2 - x", "2^3^2", "3.5*x+2.0",
+])
+def test_ast_round_trip(parser, text):
+    """Test the AST renders exactly the string parse produces"""
+    node, errors = parser.parse_ast(text)
+    assert not errors
+    assert node.to_source() == parser.parse(text)[0]
+
+def test_ast_to_sympy_matches_sympify(parser):
+    """Test AST conversion skips sympify but builds the same expression"""
+    x = sp.Symbol("x")
+    functions = {"sqrt": sp.sqrt, "log10": lambda a: sp.log(a, 10)}
+    for text in ["x^2 - 4*x/3 + 1", "sqrt(x+1)*log10(2*x)", "2^3^2 - x", "1/3 + 0.5*x"]:
+        node, _ = parser.parse_ast(text)
+        expected = sp.sympify(node.to_source(), locals=functions)
+        assert sp.simplify(node.to_sympy(x, functions) - expected) == 0
+
+def test_ast_numpy_evaluation(parser):
+    node, _ = parser.parse_ast("x^2 - 3*x/2 + sqrt(x)")
+    x = np.linspace(0, 5, 11)
+    assert np.allclose(node.evaluate(x, {"sqrt": np.sqrt}), x**2 - 3*x/2 + np.sqrt(x))
+
+def test_ast_long_chain_is_flat(parser):
+    """Test long sums do not nest one level per operator"""
+    node, errors = parser.parse_ast("+".join(["x^2"] * 5000))
+    assert not errors
+    assert len(node.operands) == 5000
+    assert node.to_sympy(sp.Symbol("x"), {}) == 5000 * sp.Symbol("x") ** 2
+
+def test_ast_fatal_error(parser):
+    node, errors = parser.parse_ast("(5 + x")
+    assert node is None
+    assert "Expected ')' but got 'None'." in errors
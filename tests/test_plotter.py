@@ -1,6 +1,7 @@
 import pytest
 import numpy as np
 from plotter.plotter import FunctionPlotter
+from cache.cache import ExpressionCache
 
 @pytest.fixture
 def plotter():
@@ -60,4 +61,88 @@ def test_constant_functions(plotter):
     plotter.plot("5", "5", solutions=[])
     lines = [line for line in plotter.ax.lines 
             if line.get_label() in {'Function 1', 'Function 2'}]
-    assert np.allclose(lines[0].get_ydata(), 5)
\ No newline at end of file
+    assert np.allclose(lines[0].get_ydata(), 5)
+
+def test_vectorized_domain_masking(plotter):
+    """Test NaN masking of domain errors without per-point evaluation"""
+    x = np.linspace(-10, 10, 100_000)
+    y = plotter._safe_eval("sqrt(x)+log10(x)", x)
+    assert y.shape == x.shape
+    assert np.isnan(y[x <= 0]).all()
+    assert np.isfinite(y[x > 0]).all()
+
+def test_division_by_zero_masked(plotter):
+    """Test poles evaluate to NaN instead of inf"""
+    y = plotter._safe_eval("1/(x-1)", np.array([0.0, 1.0, 2.0]))
+    assert np.isnan(y[1])
+    assert y[[0, 2]] == pytest.approx([-1.0, 1.0])
+
+def test_compiled_once(plotter):
+    """Test function strings are compiled once and reused"""
+    plotter.cache = ExpressionCache()
+    plotter.plot("x**2", "x", solutions=[0, 1])
+    plotter.plot("x**2", "x", solutions=[0, 1])
+    assert plotter.cache.stats()["misses"] == 2
+    assert len(plotter.cache) == 2
+
+def test_plot_from_ast(plotter):
+    """Test the plotter evaluates parser ASTs without compiling strings"""
+    from parser.parser import Parser
+    node, _ = Parser().parse_ast("sqrt(x)")
+    y = plotter._safe_eval(node, np.array([-1.0, 4.0]))
+    assert np.isnan(y[0]) and y[1] == 2.0
+
+def test_artists_persist_across_plots(plotter):
+    """Test replots update the same artists instead of rebuilding the axes"""
+    plotter.plot("x", "2*x", solutions=[0])
+    line1, line2, markers = plotter.line1, plotter.line2, plotter.markers
+    plotter.plot("x+1", "2*x", solutions=[1])
+    assert plotter.line1 is line1 and plotter.line2 is line2
+    assert plotter.markers is markers
+    assert len(plotter.ax.lines) == 2 and len(plotter.ax.texts) == 1
+    assert plotter.line1.get_ydata()[-1] == pytest.approx(11)
+    assert plotter.ax.texts[0].get_text() == "(1.00, 2.00)"
+
+def test_replot_blits_when_limits_unchanged(plotter):
+    """Test adding markers to unchanged curves skips the full canvas draw"""
+    plotter.plot("x", "2*x", solutions=[])
+    draws = []
+    plotter.canvas.mpl_connect('draw_event', draws.append)
+    plotter.plot("x", "2*x", solutions=[0])
+    assert not draws
+    plotter.plot("x", "5*x", solutions=[0])  # New y-limits
+    assert len(draws) == 1
+
+def test_zoom_out_resamples_view(plotter):
+    """Test widening the view extends the curves past the initial range"""
+    plotter.plot("x^2", "x", solutions=[])
+    plotter.ax.set_xlim(-1000, 1000)
+    x = plotter.line1.get_xdata()
+    assert x[0] == -1000 and x[-1] == 1000
+    assert len(x) <= 4 * (plotter._pixel_width() + 2) * 2
+
+def test_pole_not_joined(plotter):
+    """Test the line breaks at 1/(x-1) instead of drawing a vertical jump"""
+    plotter.plot("1/(x-1)", "0", solutions=[])
+    x, y = plotter.line1.get_xdata(), plotter.line1.get_ydata()
+    gaps = x[np.isnan(y)]
+    assert len(gaps) and np.all(np.abs(gaps - 1) < 0.01)  # Within a pixel
+
+def test_more_than_two_curves(plotter):
+    """Test extra functions get their own lines, removed again for fewer"""
+    plotter.plot_curves(["x", "2*x", "x**2", "3"], points=[(0, 0), (1, 1)])
+    assert len(plotter.lines) == 4 and plotter.lines[:2] == [plotter.line1, plotter.line2]
+    labels = [t.get_text() for t in plotter.ax.get_legend().get_texts()]
+    assert labels == ['Function 1', 'Function 2', 'Function 3', 'Function 4']
+    assert plotter.lines[3].get_ydata()[0] == pytest.approx(3)
+    assert len(plotter.annotations) == 2
+    plotter.plot("x", "2*x")
+    assert len(plotter.lines) == 2 and len(plotter.ax.get_legend().get_texts()) == 2
+
+def test_sample_with_view_snapshot(plotter, monkeypatch):
+    """Test sampling with a view() snapshot reads neither the axes nor x_range"""
+    view = plotter.view()
+    plotter.x_range = (-1000, 1000)  # As if panned on the UI thread meanwhile
+    monkeypatch.setattr(plotter, "_pixel_width", lambda: pytest.fail("axes read"))
+    curve, = plotter.sample("x^2", view=view)
+    assert curve.x[0] == view[0][0] and curve.x[-1] == view[0][1]
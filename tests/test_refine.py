@@ -0,0 +1,82 @@
+import pytest
+import numpy as np
+from solver.refine import refine_brackets, tangent_roots
+
+def test_many_brackets_at_once():
+    """Test every root of an oscillating function in one call"""
+    x = np.linspace(-10, 10, 20000)
+    y = np.sin(50 * x)
+    idx = np.where(np.diff(np.signbit(y)))[0]
+    roots, converged = refine_brackets(lambda t: np.sin(50 * t), x[idx], x[idx + 1])
+    assert converged.all()
+    assert np.allclose(np.sin(50 * roots), 0, atol=1e-9)
+    assert np.allclose(roots, np.round(roots * 50 / np.pi) * np.pi / 50, atol=1e-10)
+
+def test_roots_stay_in_bracket():
+    """Test refinement never leaves the bracket it was given"""
+    a = np.array([-3.0, 0.5, 2.0])
+    b = np.array([-1.0, 2.0, 8.0])
+    f = lambda t: np.tan(t)
+    roots, converged = refine_brackets(f, a, b)
+    assert ((roots >= a) & (roots <= b))[converged].all()
+
+def test_exact_endpoint_root():
+    roots, converged = refine_brackets(lambda t: t - 1, [1.0], [2.0])
+    assert converged.all()
+    assert roots[0] == 1.0
+
+def test_undefined_bracket_not_converged():
+    """Test brackets running into NaN are dropped, not reported"""
+    roots, converged = refine_brackets(
+        lambda t: np.full_like(t, np.nan), [-2.0], [1.0], [-1.0], [1.0]
+    )
+    assert not converged[0]
+    assert np.isnan(roots[0])
+
+def test_few_evaluations():
+    """Test superlinear convergence on a smooth function"""
+    calls = []
+    def f(t):
+        calls.append(1)
+        return t ** 3 - 2 * t - 5
+    roots, _ = refine_brackets(f, [2.0], [3.0])
+    assert roots[0] == pytest.approx(2.0945514815, abs=1e-10)
+    assert len(calls) < 20
+
+def test_newton_with_derivative():
+    """Test an analytic derivative cuts evaluations of f, and poles fall back"""
+    calls = {None: [], 'newton': []}
+    for mode in calls:
+        def f(t):
+            calls[mode].append(1)
+            return t ** 3 - 2 * t - 5
+        fprime = (lambda t: 3 * t ** 2 - 2) if mode else None
+        roots, _ = refine_brackets(f, [2.0], [3.0], fprime=fprime)
+        assert roots[0] == pytest.approx(2.0945514815, abs=1e-10)
+    assert len(calls['newton']) < len(calls[None]) - 5
+
+    derivative_calls = []
+    def fprime(t):
+        derivative_calls.append(1)
+        return -1 / t ** 2
+    roots, converged = refine_brackets(lambda t: 1 / t, [-0.3], [0.5], fprime=fprime)
+    assert abs(roots[0]) < 1e-9 and len(derivative_calls) <= 2
+
+def test_tangent_roots():
+    """Test roots of even multiplicity are found from f' and near misses are not"""
+    x = np.linspace(-10, 10, 2001)
+    roots = tangent_roots(lambda t: (t - 1) ** 2 * (t + 2) ** 4, lambda t: 2 * (t - 1) * (t + 2) ** 4
+                          + 4 * (t - 1) ** 2 * (t + 2) ** 3, x, 1e-9)
+    assert roots == pytest.approx([-2, 1])
+    assert not len(tangent_roots(lambda t: t ** 2 + 1e-6, lambda t: 2 * t, x, 1e-9))
+
+@pytest.mark.parametrize("f, fprime", [
+    (lambda t: np.sin(t) ** 2 + 1e-10, lambda t: np.sin(2 * t)),
+    (lambda t: np.cos(t) ** 2 + 1e-12, lambda t: -np.sin(2 * t)),
+    (lambda t: (t ** 2 - 1) ** 2 + 5e-10, lambda t: 4 * t * (t ** 2 - 1)),
+])
+def test_tangent_near_misses(f, fprime):
+    """Test minima below atol but above rounding error are not roots"""
+    x = np.linspace(-4, 4, 801)
+    assert not len(tangent_roots(f, fprime, x, 1e-9))
+    assert not len(tangent_roots(f, fprime, x, 1e-9, f(x)))
@@ -0,0 +1,55 @@
+import pytest
+import numpy as np
+import sympy as sp
+from solver.sampling import adaptive_sample
+from solver.solver import EquationSolver
+
+def test_budget_independent_of_range():
+    """Test a huge range stays within the sample ceiling"""
+    x, y = adaptive_sample(np.sin, (-1e9, 1e9), initial_points=10**5, max_points=2 * 10**5)
+    assert len(x) <= 2 * 10**5
+    assert np.all(np.diff(x) > 0)
+
+def test_refines_only_where_needed():
+    """Test a straight line is refined only around its root"""
+    x, _ = adaptive_sample(lambda t: 2 * t + 1, (-10, 10), initial_points=101)
+    added = np.setdiff1d(x, np.linspace(-10, 10, 101))
+    assert 0 < len(added) <= 8
+    assert np.all(np.abs(added + 0.5) < 0.2)
+
+def test_close_root_pair_resolved():
+    """Test a pair of roots closer than the coarse spacing is bracketed"""
+    f = lambda t: (t - 1) ** 2 - 1e-8
+    x, y = adaptive_sample(f, (-10, 10), initial_points=2001)
+    assert np.count_nonzero(np.diff(np.signbit(y))) == 2
+
+def test_domain_edge_refined():
+    """Test sampling closes in on where f becomes undefined"""
+    with np.errstate(invalid="ignore"):
+        x, y = adaptive_sample(np.sqrt, (-1, 1), initial_points=11)
+    assert np.min(x[np.isfinite(y)]) < 1e-10
+
+def test_wide_range_numeric_solve():
+    """Test the numeric solver no longer allocates per unit of range"""
+    solver = EquationSolver()
+    solver.max_samples = 200_000
+    roots = solver._numeric_solve(sp.sympify("sin(x/1000)"), (-1e6, 1e6))
+    assert len(roots) == 637
+    assert np.allclose(np.sin(np.array(roots) / 1000), 0, atol=1e-9)
+
+def test_cap_spread_and_reported(monkeypatch):
+    """Test a capped wide oscillating range is refined evenly and the cap is reported"""
+    from solver.tracing import Tracer
+    initial = np.linspace(-100, 100, 2001)
+    x, _ = adaptive_sample(lambda t: np.sin(50 * t), (-100, 100), 2001, max_points=20_000)
+    assert len(x) == 20_000
+    per_quarter, _ = np.histogram(np.setdiff1d(x, initial), bins=4, range=(-100, 100))
+    assert per_quarter.min() > 0.8 * per_quarter.max()
+
+    records = []
+    solver = EquationSolver()
+    solver.tracer = Tracer(records.append)
+    solver.max_samples = 20_000
+    monkeypatch.setattr(solver, "_symbolic_solve", lambda equation, x_range: [])
+    solver.solve("sin(50*x)", "x/1000", (-100, 100))
+    assert records[0]["stages"]["numeric.sample"]["truncated"] > 0
@@ -0,0 +1,87 @@
+import asyncio
+import pytest
+from service.client import ServiceClient
+from service.server import SolveService
+
+def run_with_service(scenario, **options):
+    """Run scenario(service, client_factory) against a live server on a free port"""
+    async def main():
+        service = SolveService(workers=2, **options)
+        server = await asyncio.start_server(service.handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        clients = []
+        def client():
+            clients.append(ServiceClient("127.0.0.1", port))
+            return clients[-1]
+        try:
+            return await scenario(service, client)
+        finally:
+            for c in clients:
+                await c.close()
+            server.close()
+            await server.wait_closed()
+            service.close()
+    return asyncio.run(main())
+
+def test_parse_solve_sample():
+    """Test each endpoint over one keep-alive connection"""
+    async def scenario(service, client):
+        c = client()
+        assert await c.request("POST", "/parse", {"expression": "x^2"}) == \
+            (200, {"source": "x**2", "errors": []})
+        status, body = await c.request("POST", "/solve", {"f1": "x^2", "f2": "4"})
+        assert status == 200 and body == {"roots": [-2.0, 2.0], "cached": False}
+        status, body = await c.request("POST", "/solve", {"f1": "x ^ 2", "f2": "4"})
+        assert body["cached"] is True
+        status, body = await c.request("POST", "/sample",
+                                       {"f": "sqrt(x)", "x_range": [-1, 4], "points": 6})
+        assert body["y"] == [None, 0.0, 1.0, pytest.approx(2 ** 0.5), pytest.approx(3 ** 0.5), 2.0]
+        return (await c.request("GET", "/stats"))[1]
+    stats = run_with_service(scenario)
+    assert stats["jobs"] == 1 and stats["cache"]["hits"] == 1
+
+def test_errors():
+    """Test bad input maps to 4xx without closing the connection"""
+    async def scenario(service, client):
+        c = client()
+        statuses = [
+            (await c.request("POST", "/solve", {"f1": "sin(x)", "f2": "1"}))[0],
+            (await c.request("POST", "/solve", {"f1": "x", "f2": "1", "x_range": [1, 0]}))[0],
+            (await c.request("GET", "/solve"))[0],
+            (await c.request("POST", "/nope", {}))[0],
+        ]
+        assert (await c.request("POST", "/parse", {"expression": "x"}))[0] == 200
+        return statuses
+    assert run_with_service(scenario) == [422, 400, 405, 404]
+
+def test_sample_arithmetic_errors():
+    """Test constants that raise in Python floats sample as undefined, not 500"""
+    async def scenario(service, client):
+        c = client()
+        return [await c.request("POST", "/sample", {"f": f, "x_range": [0, 1], "points": 3})
+                for f in ("1/0", "2^2^2^2^2")]
+    for status, body in run_with_service(scenario):
+        assert status == 200 and body["y"] == [None, None, None]
+
+def test_identical_requests_coalesced():
+    """Test concurrent equivalent solves share a single pool job"""
+    async def scenario(service, client):
+        requests = [{"f1": "sqrt(x) + x", "f2": "3"}, {"f1": "x+sqrt(x)-3", "f2": "0"}]
+        results = await asyncio.gather(*[client().request("POST", "/solve", requests[i % 2])
+                                         for i in range(8)])
+        return results, service.stats()
+    results, stats = run_with_service(scenario)
+    assert all(status == 200 for status, _ in results)
+    assert len({tuple(body["roots"]) for _, body in results}) == 1
+    assert stats["jobs"] == 1 and stats["coalesced"] == 7
+
+def test_backpressure():
+    """Test new work is refused with 429 once the pending limit is reached"""
+    async def scenario(service, client):
+        first = asyncio.ensure_future(client().request("POST", "/solve", {"f1": "sqrt(x)", "f2": "1"}))
+        while not service.in_flight:
+            await asyncio.sleep(0.01)
+        rejected = await client().request("POST", "/solve", {"f1": "sqrt(x)", "f2": "2"})
+        return rejected, await first
+    (status, body), (first_status, _) = run_with_service(scenario, max_pending=1)
+    assert status == 429 and first_status == 200
@@ -1,6 +1,7 @@
 import pytest
 import math
 import numpy as np
+import sympy as sp
 from solver.solver import EquationSolver
 
 @pytest.fixture
@@ -106,4 +107,175 @@ def test_extreme_density_requirements(solver):
     """Test adaptive sampling with sharp features"""
     solver.numeric_density = 5000  # Points per unit
     solutions = solver.solve("tan(x)", "1e6*(x % 0.000001)", (-1, 1))
-    assert len(solutions) > 100
\ No newline at end of file
+    assert len(solutions) > 100
+
+# Time budget tests
+def test_detailed_report(solver):
+    """Test stage timings and root sources are reported"""
+    report = solver.solve_detailed("sqrt(x)", "2", (-5, 5))
+    assert report.roots == pytest.approx([4.0])
+    assert report.sources == ["symbolic"]
+    assert {"sympify", "symbolic", "clean"} <= set(report.timings)
+    assert not report.timed_out
+
+def test_symbolic_timeout_falls_back(solver):
+    """Test an overrunning symbolic stage is killed and solved numerically"""
+    solver.symbolic_timeout = 0.5
+    report = solver.solve_detailed("sin(x)**5+cos(x)**3-x", "1", (-10, 10))
+    assert report.timed_out
+    assert report.timings["symbolic"] < 5
+    assert report.sources == ["numeric"] * len(report.roots)
+    assert report.roots == pytest.approx([-1.8457712, -0.74382203, 0.0], abs=1e-6)
+
+def test_symbolic_budget_within_limit(solver):
+    """Test symbolic results from the worker process"""
+    solver.symbolic_timeout = 30
+    report = solver.solve_detailed("sqrt(x)", "3", (-10, 10))
+    assert not report.timed_out
+    assert report.roots == pytest.approx([9.0])
+    assert report.sources == ["symbolic"]
+
+# Streaming tests
+def test_iter_roots_matches_solve(solver):
+    """Test streamed roots equal the batch numeric result"""
+    solver.chunk_samples = 64
+    streamed = list(solver.iter_roots("sin(x)", "x/2", (-5, 5)))
+    assert streamed == pytest.approx([-1.895494, 0.0, 1.895494], abs=1e-6)
+
+def test_iter_roots_chunk_boundary(solver):
+    """Test roots on and across chunk boundaries are reported once"""
+    solver.numeric_density = 8
+    solver.chunk_samples = 4  # Chunk width 4: boundaries at -6, -2, 2, 6
+    streamed = list(solver.iter_roots("(x+2)*(x-3)", "0", (-10, 10)))
+    assert streamed == pytest.approx([-2.0, 3.0])
+
+def test_iter_roots_dedup_settings(solver):
+    """Test streamed roots across chunks merge by the same settings as solve()"""
+    solver.numeric_density = 8
+    solver.chunk_samples = 4  # Chunk width 4: boundary at 2, between the roots
+    solver.dedup_atol = 0.5
+    expected = solver.solve("(x-1.9)*(x-2.1)", "0", (-10, 10))
+    assert expected == pytest.approx([1.9])
+    assert list(solver.iter_roots("(x-1.9)*(x-2.1)", "0", (-10, 10))) == expected
+
+def test_iter_roots_is_lazy(solver):
+    """Test the first root arrives without scanning the whole range"""
+    roots = solver.iter_roots("sin(x)", "0", (0.5, 1e12))
+    assert next(roots) == pytest.approx(math.pi)
+    assert next(roots) == pytest.approx(2 * math.pi)
+
+# Polynomial fast path tests
+def test_polynomial_fast_path(solver):
+    """Test polynomials skip the symbolic stage"""
+    report = solver.solve_detailed("x**3", "6*x**2 - 11*x + 6", (-10, 10))
+    assert report.roots == pytest.approx([1.0, 2.0, 3.0])
+    assert report.sources == ["polynomial"] * 3
+    assert "symbolic" not in report.timings
+
+def test_rational_pole_filtering(solver):
+    """Test roots cancelled by a pole are dropped"""
+    report = solver.solve_detailed("(x**2 - 1)/(x - 1)", "0", (-5, 5))
+    assert report.roots == pytest.approx([-1.0])
+    assert report.sources == ["polynomial"]
+
+def test_polynomial_double_root(solver):
+    """Test a repeated root is reported once"""
+    assert solver.solve("(x-2)**2", "0", (-5, 5)) == pytest.approx([2.0])
+
+@pytest.mark.parametrize("f1, expected", [
+    ("(x**2-2)**2", [-1.41421356, 1.41421356]),
+    ("(x-1)**4", [1.0]),
+    ("(x-3)**5", [3.0]),
+    ("(x-1)**3", [1.0]),
+    ("0.5*(x-1)**3*(x+2)**2", [-2.0, 1.0]),
+    ("(x-1)**2/(x+1)", [1.0]),
+])
+def test_polynomial_repeated_roots(solver, f1, expected):
+    """Test multiple roots are exact, once each, on the fast path"""
+    report = solver.solve_detailed(f1, "0", (-5, 5))
+    assert report.roots == expected
+    assert report.sources == ["polynomial"] * len(expected)
+
+def test_numeric_tangency_roots(solver):
+    """Test roots where f touches zero without a sign change are found numerically"""
+    roots = list(solver.iter_roots("sin(5*x)", "1", (-10, 10)))
+    expected = (math.pi / 2 + 2 * math.pi * np.arange(-8, 8)) / 5
+    assert roots == pytest.approx(expected, abs=1e-8)
+    assert solver._numeric_solve(sp.sympify("exp(x) - x - 1"), (-5, 5)) == pytest.approx([0], abs=1e-9)
+    # Near misses and poles are critical points, not roots
+    assert list(solver.iter_roots("(x-1)**2 + 1e-6", "0", (-10, 10))) == []
+    assert list(solver.iter_roots("sin(x)**2 + 1e-10", "0", (-4, 4))) == []
+    assert solver.solve("cos(x)**2 + 1e-12", "0", (-4, 4)) == []
+    assert list(solver.iter_roots("1/x**2", "0", (-10, 10))) == []
+
+def test_non_polynomial_not_fast_pathed(solver):
+    assert solver._polynomial_solve(sp.sympify("x**2 - sqrt(x)")) is None
+
+# Deduplication tests
+def test_dedup_many_roots_fast(solver):
+    """Test cleaning scales linearly with the number of roots"""
+    import time
+    raw = np.repeat(np.arange(-50_000, 50_000) * 0.01, 3) + 1e-9
+    start = time.perf_counter()
+    cleaned = solver._clean_solutions(raw, (-1000, 1000))
+    assert time.perf_counter() - start < 1.0
+    assert len(cleaned) == 100_000
+
+def test_dedup_tolerance_configurable(solver):
+    """Test tolerance and rounding policy are settings"""
+    raw = [1.0, 1.001, 1.002]
+    assert len(solver._clean_solutions(raw, (0, 2))) == 3
+    solver.dedup_atol = 1e-2
+    assert solver._clean_solutions(raw, (0, 2)) == pytest.approx([1.0])
+    solver.round_decimals = None
+    assert solver._clean_solutions([0.123456789123], (0, 1)) == [0.123456789123]
+
+def test_solve_from_ast(solver):
+    """Test the solver consumes parser ASTs directly"""
+    from parser.parser import Parser
+    node, _ = Parser().parse_ast("sqrt(x) + x^2")
+    assert solver.solve(node, "2", (-5, 5)) == pytest.approx([1.0])
+
+def test_cancel_from_another_thread(solver):
+    """Test cancel() interrupts a running symbolic stage"""
+    import threading
+    from concurrent.futures import CancelledError
+    solver.symbolic_timeout = 60
+    timer = threading.Timer(0.5, solver.cancel)
+    timer.start()
+    with pytest.raises(CancelledError):
+        solver.solve("sin(x)**5+cos(x)**3-x", "1", (-10, 10))
+    timer.join()
+    assert solver.solve("sqrt(x)", "2", (-5, 5)) == pytest.approx([4.0])
+
+def test_cancel_idle_worker(solver):
+    """Test a cancel() between solves does not break the next symbolic stage"""
+    solver.symbolic_timeout = 60
+    assert solver.solve("sin(x)", "1/2", (0, 1)) == pytest.approx([0.52359878])
+    solver.cancel()
+    assert solver.solve("sin(x)", "1/2", (0, 1)) == pytest.approx([0.52359878])
+    solver.close()
+
+def test_cancel_numeric_stage(solver, monkeypatch):
+    """Test cancel() stops the numeric stage and iter_roots between chunks"""
+    from concurrent.futures import CancelledError
+    lambdify = solver._lambdify
+    def cancelling(equation):
+        f = lambdify(equation)
+        def g(x):
+            solver.cancel()  # As if from another thread, mid-sampling
+            return f(x)
+        return g
+    monkeypatch.setattr(solver, "_lambdify", cancelling)
+    with pytest.raises(CancelledError):
+        solver.solve("sin(x)", "x/5", (-10, 10))
+
+    monkeypatch.setattr(solver, "_lambdify", lambdify)
+    solver.chunk_samples = 100
+    roots = solver.iter_roots("sin(x)", "0", (-10, 10))
+    first = next(roots)
+    solver.cancel()
+    with pytest.raises(CancelledError):
+        list(roots)
+    assert first == pytest.approx(-3 * np.pi)
+    assert solver.solve("sin(x)", "0", (-1, 1)) == pytest.approx([0.0])
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+from parser.parser import Parser
+from solver.solver import EquationSolver
+from solver.sweep import sweep_roots
+
+@pytest.fixture
+def solver():
+    return EquationSolver()
+
+def test_matches_exact_roots(solver):
+    """Test every parameter value gets the roots of its own equation"""
+    values = np.linspace(-2, 2, 401)
+    result = solver.solve_sweep("x**3 - x", "a", "a", values, (-3, 3))
+    assert len(result.roots) == len(values)
+    for a, roots in zip(values, result.roots):
+        exact = np.roots([1, 0, -1, -a])
+        exact = np.sort(exact[np.abs(exact.imag) < 1e-9].real)
+        assert roots == pytest.approx(exact, abs=1e-7)
+    params, flat = result.points()
+    assert len(params) == len(flat) == sum(len(r) for r in result.roots)
+
+def test_continuation_finds_close_pairs():
+    """Test roots closer than a grid cell are recovered from neighbouring values"""
+    f = lambda x, a: (x - 1.03) ** 2 - a ** 2
+    values = np.linspace(0, 1, 201)
+    counts = {}
+    for passes in (0, None):
+        rows, roots = sweep_roots(f, values, (-3, 3), 61, max_passes=passes)
+        counts[passes] = np.bincount(rows, minlength=len(values))
+        assert roots == pytest.approx(1.03 + np.where(roots < 1.03, -1, 1) * values[rows])
+    assert (counts[0] == 2).sum() < 195
+    assert (counts[None] == 2).sum() == 200  # All but the double root at a = 0
+
+def test_parameter_in_parser(solver):
+    """Test a declared parameter parses, and its ASTs solve as a family"""
+    assert Parser().parse("x+a")[1]
+    parser = Parser(parameters=("a",))
+    source, errors = parser.parse("sqrt(x)+a")
+    assert not errors and source == "sqrt(x)+a"
+    node, _ = parser.parse_ast("sqrt(x)+a")
+    result = solver.solve_sweep(node, "3", "a", [1, 2, 4], (0, 10))
+    assert [list(r) for r in result.roots] == [[4.0], [1.0], []]
+    with pytest.raises(ValueError):
+        Parser(parameters=("sqrt",))
+
+@pytest.mark.parametrize("name", ["x", "sqrt", "sin", "lambda", "2a", "a b"])
+def test_invalid_parameter_names(solver, name):
+    """Test sweeps reject the parameter names the parser rejects, as ValueError"""
+    with pytest.raises(ValueError, match="Invalid parameter name"):
+        solver.solve_sweep("x^2", "1", name, [1.0], (-2, 2))
+
+def test_parameter_ast_outside_sweep(solver):
+    """Test a parameter AST given to solve() reports the unbound parameter"""
+    node, _ = Parser(parameters=("a",)).parse_ast("x+a")
+    with pytest.raises(ValueError, match="Parameter 'a'"):
+        solver.solve(node, "0")
+
+def test_poles_not_reported(solver):
+    """Test sign changes across a pole that moves with the parameter are dropped"""
+    result = solver.solve_sweep("1/(x-a)", "0", "a", np.linspace(-1, 1, 50))
+    assert all(len(r) == 0 for r in result.roots)
@@ -0,0 +1,97 @@
+import pickle
+import pytest
+from cache.cache import ExpressionCache
+from solver.solver import EquationSolver
+from solver import tracing
+from solver.tracing import JsonlSink, Tracer, aggregate, read_jsonl
+
+@pytest.fixture
+def solver(monkeypatch):
+    solver = EquationSolver(cache=ExpressionCache())
+    # Force the numeric path so every stage runs
+    monkeypatch.setattr(solver, "_symbolic_solve", lambda equation, x_range: [])
+    return solver
+
+def test_stages_recorded(solver):
+    """Test each solve yields a record with nested stages and evaluation counts"""
+    records = []
+    solver.tracer = Tracer(records.append)
+    report = solver.solve_detailed("sqrt(x)", "2", (0, 10))
+    assert set(report.timings) == {"sympify", "polynomial", "symbolic", "numeric", "clean"}
+    record, = records
+    stages = record["stages"]
+    assert {"symbolic.simplify", "numeric.lambdify", "numeric.sample", "numeric.refine",
+            "numeric.tangency"} <= set(stages)
+    assert stages["numeric.sample"]["evaluations"] > 0
+    assert stages["numeric.sample"]["points"] == stages["numeric.sample"]["samples"]
+    assert stages["numeric"]["points"] == (stages["numeric.sample"]["points"]
+                                           + stages["numeric.refine"]["points"]
+                                           + stages["numeric.tangency"]["points"])
+    assert stages["numeric.refine"]["brackets"] == 1
+    assert record["roots"] == 1 and record["error"] is None and record["profile"] is None
+    assert record["seconds"] >= sum(report.timings.values())
+
+def test_memory_and_profile(solver):
+    """Test tracemalloc peaks nest and only slow solves keep a profile"""
+    records = []
+    solver.tracer = Tracer(records.append, memory=True, profile_over=0.0, profile_top=5)
+    solver.solve("sqrt(x)", "2", (0, 10))
+    stages = records[0]["stages"]
+    assert stages["numeric"]["peak_kib"] >= stages["numeric.sample"]["peak_kib"] > 0
+    assert len(records[0]["profile"]) == 5
+    assert any("_solve_traced" in row["function"] for row in records[0]["profile"])
+
+    solver.tracer.profile_over = 1e6
+    solver.solve("sqrt(x)", "3", (0, 10))
+    assert records[1]["profile"] is None
+
+def test_failures_recorded(solver):
+    """Test a solve that raises is still reported, with the error"""
+    records = []
+    solver.tracer = Tracer(records.append)
+    with pytest.raises(ValueError):
+        solver.solve("x +* 2", "1")
+    assert records[0]["error"].startswith("ValueError") and records[0]["roots"] is None
+
+def test_inactive_hooks_are_free():
+    """Test the stage helpers do nothing outside a trace"""
+    f = lambda x: x
+    assert tracing.counted(f) is f
+    with tracing.stage("anything") as stats:
+        tracing.note(ignored=True)
+    assert stats is None
+
+def test_jsonl_round_trip(solver, tmp_path):
+    """Test records written by a (pickled) sink aggregate per stage"""
+    path = str(tmp_path / "trace.jsonl")
+    solver.tracer = pickle.loads(pickle.dumps(Tracer(JsonlSink(path))))
+    for target in ("1", "2", "3"):
+        solver.solve("sqrt(x)", target, (0, 10))
+    solver.tracer.sinks[0].close()
+    summary = aggregate(read_jsonl(path))
+    assert summary["solve"]["count"] == summary["numeric.sample"]["count"] == 3
+    assert summary["numeric.sample"]["p50"] <= summary["numeric.sample"]["max"]
+    assert summary["numeric"]["points"] > 0
+
+def test_failing_sink_never_fails_a_solve(solver):
+    """Test a raising sink warns, and neither hides the solve's error nor adds one"""
+    def broken(record):
+        raise OSError("disk full")
+    records = []
+    solver.tracer = Tracer(broken, records.append)
+    with pytest.warns(RuntimeWarning, match="disk full"):
+        assert solver.solve("sqrt(x)", "2", (0, 10)) == pytest.approx([4.0])
+    with pytest.warns(RuntimeWarning), pytest.raises(ValueError, match="Invalid"):
+        solver.solve("x +* 2", "1")
+    assert [r["error"] is None for r in records] == [True, False]
+
+def test_jsonl_lines_written_whole(tmp_path):
+    """Test each record is one write on an O_APPEND descriptor, even past buffer sizes"""
+    path = str(tmp_path / "trace.jsonl")
+    sinks = [JsonlSink(path), JsonlSink(path)]
+    big = {"profile": ["f" * 100_000]}
+    for k in range(6):
+        sinks[k % 2]({**big, "k": k})
+    for sink in sinks:
+        sink.close()
+    assert [r["k"] for r in read_jsonl(path)] == list(range(6))
@@ -0,0 +1,67 @@
+import pytest
+import numpy as np
+from plotter.viewport import CurveSamples, break_discontinuities, decimate
+
+@pytest.fixture
+def counted():
+    """np.sin that records every x it is evaluated at"""
+    seen = []
+    def f(x):
+        seen.append(np.array(x, copy=True))
+        return np.sin(x)
+    f.seen = seen
+    return f
+
+def test_pan_evaluates_only_exposed_interval(counted):
+    """Test panning right samples just the newly visible strip"""
+    samples = CurveSamples()
+    samples.update(counted, (-10, 10), 0.02)
+    counted.seen.clear()
+    assert samples.update(counted, (-8, 12), 0.02)
+    evaluated = np.concatenate(counted.seen)
+    assert evaluated.min() >= 10 and evaluated.max() <= 12
+    assert samples.x[0] <= -8 and samples.x[-1] == 12
+    assert np.all(np.diff(samples.x) > 0)
+    assert not samples.update(counted, (-9, 11), 0.02)  # Already covered
+
+def test_zoom_in_resamples_finer(counted):
+    """Test zooming in replaces coarse samples with view-sized ones"""
+    samples = CurveSamples()
+    samples.update(counted, (-10, 10), 0.02)
+    samples.update(counted, (0, 0.2), 0.0002)
+    assert samples.x[0] == 0 and samples.x[-1] == 0.2
+    assert np.max(np.diff(samples.x)) <= 0.0002 + 1e-12
+
+def test_decimate_bounds_points_and_keeps_extremes():
+    """Test a million samples reduce to a few per pixel with min/max intact"""
+    x = np.linspace(0, 1, 1_000_000)
+    y = np.sin(2000 * x)
+    y[500_000] = 5.0  # One-sample spike
+    dx, dy = decimate(x, y, (0, 1), 500)
+    assert len(dx) <= 4 * 502
+    assert np.nanmax(dy) == 5.0 and np.nanmin(dy) == pytest.approx(-1, abs=1e-6)
+    assert dx[0] == 0 and dx[-1] == 1
+    assert np.all(np.diff(dx) >= 0)
+
+def test_decimate_keeps_gaps():
+    """Test undefined stretches stay unjoined after decimation"""
+    x = np.linspace(-1, 1, 100_000)
+    with np.errstate(invalid='ignore'):
+        y = np.sqrt(np.abs(x) - 0.5)
+    dx, dy = decimate(x, y, (-1, 1), 100)
+    assert np.count_nonzero(np.isnan(dy)) == 1
+    gap = dx[np.isnan(dy)][0]
+    assert -0.51 <= gap <= 0.51
+
+def test_breaks_at_pole_only():
+    """Test a pole is broken while a steep continuous curve stays joined"""
+    f = lambda t: 1 / (t - 1)
+    x = np.linspace(-10, 10, 1000)
+    with np.errstate(divide='ignore'):
+        bx, by = break_discontinuities(f, x, f(x), jump=10)
+    assert np.count_nonzero(np.isnan(by)) == 1
+    assert bx[np.isnan(by)][0] == pytest.approx(1, abs=0.02)
+
+    steep = lambda t: 1e6 * t
+    sx, sy = break_discontinuities(steep, x, steep(x), jump=10)
+    assert not np.isnan(sy).any()